@@ -0,0 +1,113 @@
+"""
+Scaling of multi-ticker signals: one extract_all_signals call per ticker
+(what N sequential /signals requests do) vs extract_batch_signals.
+
+    python benchmarks/bench_batch_signals.py [--tickers 1,10,100] [--source NVDA]
+
+Synthetic tickers BENCH000... reuse --source's transcripts with a
+per-ticker marker appended to every utterance, so each ticker's text is
+distinct and nothing is served from the sentiment cache (a temporary one is
+used). Their analysis/term-index files are removed afterwards.
+"""
+import argparse
+import contextlib
+import glob
+import itertools
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import analysis.signal_extractor as signal_extractor
+from analysis.cross_section import extract_batch_signals
+from analysis.sentiment_cache import SentimentCache
+from transcript.transcript_loader import load_json_transcripts
+
+
+@contextlib.contextmanager
+def quiet():
+    # the pipeline prints per-section results
+    sys.stdout.flush()
+    saved = os.dup(1)
+    with open(os.devnull, "w") as devnull:
+        os.dup2(devnull.fileno(), 1)
+        try:
+            yield
+        finally:
+            sys.stdout.flush()
+            os.dup2(saved, 1)
+            os.close(saved)
+
+
+def synthetic(source, count, tag):
+    universe = {}
+    for i in range(count):
+        ticker = f"BENCH{i:03d}"
+        marker = f" [{tag}{ticker}]"
+        universe[ticker] = {
+            q: {
+                "date": tr.get("date"),
+                **{key: [dict(e, text=e["text"] + marker) for e in tr.get(key, [])] for key in ("preparedRemarks", "qanda")},
+            }
+            for q, tr in source.items()
+        }
+    return universe
+
+
+def suite_benchmarks(ctx):
+    """
+    extract_batch_signals for 4 tickers derived from the suite's dataset,
+    each sample on a cold sentiment cache (see suite.py).
+    """
+    universe = synthetic(load_json_transcripts(ctx.ticker), 4, "b")
+    revisions = itertools.count()
+
+    def cold_sentiment_cache():
+        signal_extractor.CACHE_REVISION = f"bench-batch-{next(revisions)}"
+        return ()
+
+    def run():
+        with quiet():
+            result = extract_batch_signals(list(universe), universe, None, False)
+        assert not result["errors"], result["errors"]
+
+    return {"batch_signals_4": (run, cold_sentiment_cache)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tickers", default="1,10,100")
+    parser.add_argument("--source", default="NVDA")
+    args = parser.parse_args()
+
+    source = load_json_transcripts(args.source)
+    tmp = tempfile.mkdtemp()
+    signal_extractor.sentiment_cache = SentimentCache(os.path.join(tmp, "sentiment_cache.sqlite"))
+    with quiet():
+        signal_extractor.get_sentiment_engine()   # load the model outside the timings
+    print(f"{'tickers':>8} {'sequential s':>13} {'batch s':>9} {'speedup':>8} {'batch tickers/s':>16}")
+    try:
+        for count in (int(n) for n in args.tickers.split(",")):
+            seq_universe = synthetic(source, count, "s")
+            start = time.perf_counter()
+            with quiet():
+                for ticker, transcripts in seq_universe.items():
+                    signal_extractor.extract_all_signals(ticker, transcripts, None, False)
+            sequential = time.perf_counter() - start
+
+            batch_universe = synthetic(source, count, "b")
+            start = time.perf_counter()
+            with quiet():
+                result = extract_batch_signals(list(batch_universe), batch_universe, None, False)
+            batch = time.perf_counter() - start
+            assert not result["errors"], result["errors"]
+            print(f"{count:>8} {sequential:13.2f} {batch:9.2f} {sequential / batch:7.2f}x {count / batch:16.1f}")
+    finally:
+        for path in glob.glob(os.path.join(signal_extractor.DATA_DIR, "*BENCH[0-9][0-9][0-9]*")):
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Turn embedding cost, store reuse and semantic query latency over
+synthetic transcripts.
+
+    python benchmarks/bench_embeddings.py [--transcripts 80] [--quarters 8] [--runs 20] [--engine model|stub]
+
+Writes --transcripts synthetic transcripts to a temporary EARNINGS_DATA_DIR,
+then:
+  - cold: indexes every turn with an empty embedding store (turns/s)
+  - warm: indexes them again with a fresh PassageIndex over the same store,
+    which must not embed anything (fails otherwise)
+  - /similar and /themes latency, --runs times each
+
+`--engine stub` swaps the model for random unit vectors (seeded by text),
+so the index can be measured at sizes where CPU inference would dominate.
+"""
+import argparse
+import hashlib
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+QUERIES = [
+    "demand for accelerated computing from cloud providers",
+    "gross margin pressure and supply constraints",
+    "sovereign AI investments by national governments",
+]
+
+
+class StubEmbeddingEngine:
+    """
+    Deterministic random unit vectors with the model's interface.
+    """
+
+    dim = 384
+
+    def embed(self, texts):
+        import numpy as np
+
+        vectors = np.empty((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+            vectors[i] = np.random.default_rng(seed).standard_normal(self.dim)
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def timed(fn, runs):
+    latencies = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - t0) * 1000)
+    latencies.sort()
+    return statistics.median(latencies), latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+
+
+def suite_benchmarks(ctx):
+    """
+    /similar and /themes over the suite's dataset, embedded untimed; with
+    --sentiment stub the model is swapped for StubEmbeddingEngine (see suite.py).
+    """
+    from analysis.embedding_index import PassageIndex
+    from analysis.model_registry import registry
+
+    if ctx.sentiment == "stub":
+        registry.set("embedding_engine", StubEmbeddingEngine())
+    index = PassageIndex(ctx.data_dir)
+    index.sync()
+    return {
+        "embeddings_similar": (lambda: index.similar(QUERIES[0], limit=10), None),
+        "embeddings_themes": (lambda: index.themes(ctx.ticker), None),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transcripts", type=int, default=80)
+    parser.add_argument("--quarters", type=int, default=8)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--engine", choices=("model", "stub"), default="model")
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp(prefix="earnings-embeddings-")
+    os.environ["EARNINGS_DATA_DIR"] = data_dir
+    try:
+        from synthetic import write_dataset
+        from analysis import embedding_index
+        from analysis.embedding_index import PassageIndex, get_embedding_store
+        from analysis.model_registry import registry
+
+        embedding_store = get_embedding_store()
+        tickers = max(1, args.transcripts // args.quarters)
+        for i in range(tickers):
+            write_dataset(data_dir, f"T{i:04d}", args.quarters, seed=i)
+        if args.engine == "stub":
+            registry.set("embedding_engine", StubEmbeddingEngine())
+        else:
+            registry.get("embedding_engine")
+
+        start = time.perf_counter()
+        index = PassageIndex(data_dir)
+        index.sync()
+        cold = time.perf_counter() - start
+        passages = index.get_stats()["passages"]
+        written = embedding_store.get_stats()["writes"]
+        print(f"{embedding_index.EMBEDDING_MODEL if args.engine == 'model' else 'stub engine'}: "
+              f"{tickers * args.quarters} transcripts, {passages} turns embedded in {cold:.1f}s "
+              f"({passages / cold:.0f} turns/s), store {embedding_store.get_stats()['bytes'] / 2**20:.1f} MB")
+
+        start = time.perf_counter()
+        warm_index = PassageIndex(data_dir)
+        warm_index.sync()
+        warm_index.similar(QUERIES[0])
+        warm = time.perf_counter() - start
+        recomputed = embedding_store.get_stats()["writes"] - written
+        print(f"warm re-index from the store: {warm * 1000:.0f} ms, {recomputed} turns re-embedded")
+
+        print(f"{'query':64s} {'p50 ms':>8} {'p95 ms':>8}")
+        for text in QUERIES:
+            p50, p95 = timed(lambda: warm_index.similar(text, limit=10), args.runs)
+            print(f"{'similar: ' + text:64s} {p50:8.2f} {p95:8.2f}")
+        p50, p95 = timed(lambda: warm_index.themes("T0000"), args.runs)
+        print(f"{'themes: T0000':64s} {p50:8.2f} {p95:8.2f}")
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+    if recomputed:
+        sys.exit(f"{recomputed} stored turns were embedded again")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Latency, throughput, memory and label parity of the sentiment inference
+backends (fp32, int8, onnx) on stored transcripts.
+
+    python benchmarks/bench_inference_backends.py [--ticker NVDA] [--backends fp32,int8,onnx]
+                                                  [--model <name-or-path>] [--latency-samples 50]
+
+Each backend runs in its own process so load time and RSS are not shared.
+Parity is the share of texts whose label matches fp32's; a backend that
+cannot load (e.g. onnxruntime not installed) is reported and skipped.
+"""
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+DEFAULT_MODEL = "mrm8488/distilroberta-finetuned-financial-news-sentiment-analysis"
+
+
+def stored_texts(ticker):
+    from transcript.transcript_loader import load_json_transcripts
+
+    texts = []
+    for transcript in load_json_transcripts(ticker).values():
+        for key in ("preparedRemarks", "qanda"):
+            texts.extend(e["text"] for e in transcript.get(key, []) if e.get("speaker", "").lower() != "operator")
+    return list(dict.fromkeys(texts))
+
+
+def rss_bytes():
+    import psutil
+    return psutil.Process(os.getpid()).memory_info().rss
+
+
+def run_backend(backend, model_name, ticker, latency_samples):
+    """
+    Loads one backend, times it and prints a JSON report on stdout.
+    """
+    from transformers import pipeline
+    from analysis.inference_backends import load_sentiment_model
+    from analysis.sentiment_engine import SentimentEngine
+
+    texts = stored_texts(ticker)
+    rss_start = rss_bytes()
+    start = time.perf_counter()
+
+    def load_fp32():
+        analyzer = pipeline("sentiment-analysis", model=model_name, tokenizer=model_name, device=-1)
+        return analyzer.model, analyzer.tokenizer
+
+    model, tokenizer = load_sentiment_model(model_name, "main", load_fp32, backend)
+    engine = SentimentEngine(model, tokenizer)
+    load_seconds = time.perf_counter() - start
+    rss_loaded = rss_bytes()
+
+    latencies = []
+    for text in texts[:latency_samples]:
+        t0 = time.perf_counter()
+        engine.score_texts([text])
+        latencies.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    results = engine.score_texts(texts)
+    batch_seconds = time.perf_counter() - t0
+    print(json.dumps({
+        "backend": backend,
+        "texts": len(texts),
+        "load_seconds": load_seconds,
+        "latency_p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "latency_p95_ms": (sorted(latencies)[int(len(latencies) * 0.95) - 1] * 1000) if latencies else 0.0,
+        "texts_per_sec": len(texts) / batch_seconds if batch_seconds else 0.0,
+        "tokens_per_sec": engine.stats["tokens"] / (sum(latencies) + batch_seconds),
+        "rss_model_mb": (rss_loaded - rss_start) / 2**20,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "labels": [r["label"] for r in results],
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ticker", default="NVDA")
+    parser.add_argument("--backends", default="fp32,int8,onnx")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--latency-samples", type=int, default=50)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_backend(args.child, args.model, args.ticker, args.latency_samples)
+        return
+
+    backends = [b.strip() for b in args.backends.split(",") if b.strip()]
+    if "fp32" not in backends:
+        backends.insert(0, "fp32")   # parity reference
+    reports = {}
+    for backend in backends:
+        proc = subprocess.run(
+            [sys.executable, __file__, "--child", backend, "--model", args.model,
+             "--ticker", args.ticker, "--latency-samples", str(args.latency_samples)],
+            capture_output=True, text=True,
+        )
+        lines = [l for l in proc.stdout.splitlines() if l.startswith("{")]
+        if proc.returncode != 0 or not lines:
+            error = (proc.stderr.strip().splitlines() or ["no output"])[-1]
+            print(f"{backend}: unavailable ({error})")
+            continue
+        reports[backend] = json.loads(lines[-1])
+
+    if "fp32" not in reports:
+        sys.exit("fp32 backend failed; nothing to compare against")
+    reference = reports["fp32"]["labels"]
+    print(f"{reports['fp32']['texts']} texts from {args.ticker}")
+    print(f"{'backend':>8} {'load s':>7} {'p50 ms':>7} {'p95 ms':>7} {'texts/s':>8} {'tokens/s':>9} "
+          f"{'model MB':>9} {'peak MB':>8} {'parity':>7}")
+    for backend, r in reports.items():
+        parity = sum(a == b for a, b in zip(r["labels"], reference)) / max(len(reference), 1)
+        print(f"{backend:>8} {r['load_seconds']:7.2f} {r['latency_p50_ms']:7.1f} {r['latency_p95_ms']:7.1f} "
+              f"{r['texts_per_sec']:8.1f} {r['tokens_per_sec']:9.0f} {r['rss_model_mb']:9.0f} "
+              f"{r['peak_rss_mb']:8.0f} {parity:7.1%}")
+
+
+if __name__ == "__main__":
+    main()
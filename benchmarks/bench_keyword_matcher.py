@@ -0,0 +1,97 @@
+"""
+Nested substring scan vs compiled KeywordMatcher for strategic-area counting.
+
+    python benchmarks/bench_keyword_matcher.py [--ticker NVDA] [--keywords 1000]
+
+Uses the full executive text of each stored transcript. Runs the built-in
+taxonomy and a synthetic one padded to --keywords entries with words and
+phrases drawn from the transcripts, checks that both methods return
+identical counts, and reports the time per transcript.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from transcript.transcript_loader import load_json_transcripts
+from analysis.strategic_focus import NVIDIA_STRATEGIC_AREAS, preprocess_text, extract_ngrams
+from analysis.keyword_matcher import KeywordMatcher
+
+
+def nested_counts(tokens, keywords):
+    all_ngrams = tokens + extract_ngrams(tokens, 2) + extract_ngrams(tokens, 3)
+    return {k: sum(1 for ngram in all_ngrams if k in ngram) for k in keywords}
+
+
+def synthetic_keywords(token_lists, size, seed=0):
+    rng = random.Random(seed)
+    keywords = [k for ks in NVIDIA_STRATEGIC_AREAS.values() for k in ks]
+    vocab = sorted({t for tokens in token_lists for t in tokens})
+    while len(set(keywords)) < size:
+        n = rng.choice((1, 1, 2, 3))
+        keywords.append(" ".join(rng.choice(vocab) for _ in range(n)))
+    return list(dict.fromkeys(keywords))[:size]
+
+
+def bench(name, token_lists, keywords):
+    start = time.perf_counter()
+    expected = [nested_counts(tokens, keywords) for tokens in token_lists]
+    nested_secs = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matcher = KeywordMatcher(keywords)
+    build_secs = time.perf_counter() - start
+    start = time.perf_counter()
+    got = [matcher.count_ngram_hits(tokens) for tokens in token_lists]
+    matcher_secs = time.perf_counter() - start
+
+    per = len(token_lists)
+    print(f"{name}: {len(keywords)} keywords, {per} transcripts, identical counts: {expected == got}")
+    print(f"  nested scan       {nested_secs / per * 1000:9.1f} ms/transcript")
+    print(f"  KeywordMatcher    {matcher_secs / per * 1000:9.1f} ms/transcript  (+{build_secs * 1000:.1f} ms one-off build)")
+    print(f"  speedup           x{nested_secs / matcher_secs:.1f}")
+
+
+def executive_tokens(ticker):
+    token_lists = []
+    for transcript in load_json_transcripts(ticker).values():
+        entries = transcript.get("preparedRemarks", []) + transcript.get("qanda", [])
+        text = " ".join(e["text"] for e in entries if e.get("speaker", "").lower() != "operator")
+        token_lists.append(preprocess_text(text))
+    return token_lists
+
+
+def suite_benchmarks(ctx):
+    """
+    KeywordMatcher counts over every quarter of the suite's dataset, for
+    the built-in taxonomy and a 1000-keyword one (see suite.py).
+    """
+    token_lists = executive_tokens(ctx.ticker)
+    builtin = KeywordMatcher(k for ks in NVIDIA_STRATEGIC_AREAS.values() for k in ks)
+    large = KeywordMatcher(synthetic_keywords(token_lists, 1000))
+    return {
+        "keyword_matcher_builtin": (lambda: [builtin.count_ngram_hits(t) for t in token_lists], None),
+        "keyword_matcher_1000": (lambda: [large.count_ngram_hits(t) for t in token_lists], None),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ticker", default="NVDA")
+    parser.add_argument("--keywords", type=int, default=1000)
+    args = parser.parse_args()
+
+    token_lists = executive_tokens(args.ticker)
+    if not token_lists:
+        sys.exit(f"No transcripts for {args.ticker}")
+
+    builtin = list(dict.fromkeys(k for ks in NVIDIA_STRATEGIC_AREAS.values() for k in ks))
+    bench("built-in taxonomy", token_lists, builtin)
+    bench("synthetic taxonomy", token_lists, synthetic_keywords(token_lists, args.keywords))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+/signals_llm against a local mock OpenAI-compatible server: the previous
+serial path (two blocking calls per quarter, whole sections in one prompt)
+vs the async layer (all quarters and section chunks concurrently).
+
+    python benchmarks/bench_llm_signals.py [--ticker NVDA] [--latency 0.5] [--context 4000]
+                                           [--error-rate 0.1] [--quarters 8]
+
+The mock answers after --latency seconds with a label derived from the
+prompt, returns 429 for a --error-rate fraction of requests, and rejects
+prompts over --context estimated tokens with 400, as a real endpoint would.
+The mock can also be run standalone for manual testing:
+
+    python benchmarks/bench_llm_signals.py --serve --port 8089
+    TOGETHER_BASE_URL=http://127.0.0.1:8089/v1 uvicorn ...
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import random
+import socket
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from aiohttp import web
+
+
+def make_app(latency, context, error_rate, counters):
+    from analysis.llm_client import estimate_tokens
+
+    rng = random.Random(0)
+
+    async def completions(request):
+        body = await request.json()
+        prompt = body["messages"][0]["content"]
+        counters["requests"] += 1
+        counters["in_flight"] += 1
+        counters["max_in_flight"] = max(counters["max_in_flight"], counters["in_flight"])
+        try:
+            await asyncio.sleep(latency)
+            if rng.random() < error_rate:
+                counters["429"] += 1
+                return web.json_response({"error": "rate limited"}, status=429, headers={"Retry-After": "0"})
+            if estimate_tokens(prompt) > context:
+                counters["400"] += 1
+                return web.json_response({"error": "context length exceeded"}, status=400)
+            label = ("Positive", "Neutral", "Negative")[hashlib.md5(prompt.encode()).digest()[0] % 3]
+            return web.json_response({"choices": [{"message": {"role": "assistant", "content": label}}]})
+        finally:
+            counters["in_flight"] -= 1
+
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", completions)
+    return app
+
+
+def start_server(app, port):
+    loop = asyncio.new_event_loop()
+    runner = web.AppRunner(app)
+    loop.run_until_complete(runner.setup())
+    loop.run_until_complete(web.TCPSite(runner, "127.0.0.1", port).start())
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def suite_benchmarks(ctx):
+    """
+    The async /signals_llm path over the suite's dataset against the mock
+    with no latency, errors or rate limit, bypassing the LLM cache, so it
+    times prompt building, chunking and the client (see suite.py).
+    """
+    from analysis import llm_client
+    from analysis.llm_signal_extractor import extract_all_together_signals
+    from transcript.transcript_loader import load_json_transcripts
+    from utils.rate_limit import TokenBucket
+
+    port = free_port()
+    counters = {"requests": 0, "in_flight": 0, "max_in_flight": 0, "429": 0, "400": 0}
+    start_server(make_app(0, 10 ** 9, 0, counters), port)
+    llm_client.BASE_URL = f"http://127.0.0.1:{port}/v1"
+    llm_client.rate_limiter = TokenBucket(10 ** 9, 10 ** 9)
+    transcripts = load_json_transcripts(ctx.ticker)
+    return {"llm_signals": (lambda: llm_client.run_sync(extract_all_together_signals, transcripts, True), None)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ticker", default="NVDA")
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--context", type=int, default=4000)
+    parser.add_argument("--error-rate", type=float, default=0.1)
+    parser.add_argument("--quarters", type=int, default=8, help="stored quarters are repeated up to this many")
+    parser.add_argument("--serve", action="store_true", help="only run the mock server")
+    parser.add_argument("--port", type=int, default=0)
+    args = parser.parse_args()
+
+    counters = {"requests": 0, "in_flight": 0, "max_in_flight": 0, "429": 0, "400": 0}
+    port = args.port or free_port()
+    # llm_client reads its settings at import time
+    os.environ["TOGETHER_BASE_URL"] = f"http://127.0.0.1:{port}/v1"
+    os.environ.setdefault("LLM_RATE_PER_SEC", "1000")
+    os.environ.setdefault("LLM_RATE_BURST", "1000")
+    os.environ.setdefault("LLM_BACKOFF_BASE", "0.05")
+    os.environ.setdefault("LLM_MAX_PROMPT_TOKENS", str(args.context - 200))
+    app = make_app(args.latency, args.context, args.error_rate, counters)
+    if args.serve:
+        web.run_app(app, host="127.0.0.1", port=port)
+        return
+    start_server(app, port)
+
+    import requests
+    from analysis.llm_client import run_sync
+    from analysis.llm_signal_extractor import extract_all_together_signals, _prompt, _parse_label
+    from transcript.transcript_loader import load_json_transcripts
+
+    stored = list(load_json_transcripts(args.ticker).values())
+    transcripts = {f"Q{i}": stored[i % len(stored)] for i in range(args.quarters)}
+
+    # previous behaviour: one blocking request per section, whole section in the prompt
+    def serial():
+        out, failures = {}, 0
+        for quarter, tr in transcripts.items():
+            out[quarter] = {}
+            for key, section in (("management_sentiment", "preparedRemarks"), ("qa_sentiment", "qanda")):
+                text = "\n".join(e["text"] for e in tr.get(section, []) if e.get("speaker", "").lower() != "operator")
+                resp = requests.post(f"{os.environ['TOGETHER_BASE_URL']}/chat/completions",
+                                     json={"messages": [{"role": "user", "content": _prompt(text)}]})
+                if resp.status_code != 200:
+                    failures += 1
+                    out[quarter][key] = f"HTTP {resp.status_code}"
+                    continue
+                out[quarter][key] = _parse_label(resp.json()["choices"][0]["message"]["content"])
+        return out, failures
+
+    for name, fn in (("serial", serial), ("async", lambda: (run_sync(extract_all_together_signals, transcripts), 0))):
+        for k in counters:
+            counters[k] = 0
+        start = time.perf_counter()
+        result, failures = fn()
+        secs = time.perf_counter() - start
+        print(f"{name:>6}: {secs:6.2f}s  requests={counters['requests']} max_in_flight={counters['max_in_flight']} "
+              f"429s={counters['429']} context_errors={counters['400']} failed_sections={failures}")
+        print(f"        {result}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Search index build time, size and query latency over thousands of
+synthetic transcripts.
+
+    python benchmarks/bench_search.py [--transcripts 2000] [--quarters 8] [--runs 20] [--budget 50]
+
+Writes --transcripts synthetic transcripts (--transcripts / --quarters
+tickers of --quarters quarters each) to a temporary folder, indexes them
+the way fetch_and_save_transcript does, one file at a time, then runs a
+fixed set of term, phrase and filtered queries --runs times each. Exits
+non-zero if any query's p95 exceeds the budget (ms).
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import write_dataset
+from transcript.search_index import SearchIndex
+
+QUERIES = [
+    ({"query": "blackwell"}, "single term"),
+    ({"query": '"export control"'}, "phrase"),
+    ({"query": '"sovereign ai"'}, "phrase with short word"),
+    ({"query": '"supply chain" inventory'}, "phrase and term"),
+    ({"query": "the"}, "very common term"),
+    ({"query": '"data center" gpu', "tickers": ["T0007", "T0042"]}, "two tickers"),
+    ({"query": '"generative ai"', "start": "2024Q3", "end": "2025Q2"}, "quarter range"),
+    ({"query": "zzzz"}, "no match"),
+]
+
+
+def suite_benchmarks(ctx):
+    """
+    Query latency over an index of 10 seeded tickers x the suite's quarters,
+    built untimed in a subfolder of the suite's data folder (see suite.py).
+    """
+    data_dir = tempfile.mkdtemp(prefix="search-", dir=ctx.data_dir)
+    index = SearchIndex(data_dir)
+    for i in range(10):
+        for path in write_dataset(data_dir, f"T{i:04d}", ctx.quarters, seed=i):
+            index.index_file(path)
+    cases = {
+        "search_term": {"query": "blackwell"},
+        "search_phrase": {"query": '"export control"'},
+        "search_phrase_and_term": {"query": '"supply chain" inventory'},
+        "search_common_term": {"query": "the"},
+        "search_quarter_range": {"query": '"generative ai"', "start": "2024Q3", "end": "2025Q2"},
+    }
+    return {name: (lambda params=params: index.search(limit=20, **params), None) for name, params in cases.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--transcripts", type=int, default=2000)
+    parser.add_argument("--quarters", type=int, default=8)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--budget", type=float, default=50.0, help="p95 ms allowed per query")
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp(prefix="earnings-search-")
+    try:
+        start = time.perf_counter()
+        tickers = max(1, args.transcripts // args.quarters)
+        paths = []
+        for i in range(tickers):
+            paths += write_dataset(data_dir, f"T{i:04d}", args.quarters, seed=i)
+        generated = time.perf_counter() - start
+        source_mb = sum(os.path.getsize(p) for p in paths) / 2**20
+
+        index = SearchIndex(data_dir)
+        start = time.perf_counter()
+        for path in paths:
+            index.index_file(path)
+        build = time.perf_counter() - start
+        stats = index.get_stats()
+        print(f"{len(paths)} transcripts ({source_mb:.0f} MB) generated in {generated:.1f}s, "
+              f"indexed in {build:.1f}s ({build / len(paths) * 1000:.1f} ms each)")
+        print(f"index: {stats['terms']} terms, {stats['postings']} postings, "
+              f"{stats['occurrences']} occurrences, {stats['bytes'] / 2**20:.0f} MB")
+
+        over = []
+        print(f"{'query':36s} {'kind':24s} {'hits':>7} {'p50 ms':>8} {'p95 ms':>8}")
+        for params, kind in QUERIES:
+            latencies = []
+            for _ in range(args.runs):
+                t0 = time.perf_counter()
+                result = index.search(limit=args.limit, **params)
+                latencies.append((time.perf_counter() - t0) * 1000)
+            latencies.sort()
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            if p95 > args.budget:
+                over.append(params["query"])
+            print(f"{params['query']:36s} {kind:24s} {result['total_hits']:7d} "
+                  f"{statistics.median(latencies):8.2f} {p95:8.2f}")
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+    if over:
+        sys.exit(f"p95 over {args.budget:.0f} ms budget: {', '.join(over)}")
+
+
+if __name__ == "__main__":
+    main()
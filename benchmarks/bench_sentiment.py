@@ -0,0 +1,87 @@
+"""
+Throughput of the per-section pipeline path vs the batched SentimentEngine.
+
+    python benchmarks/bench_sentiment.py [--ticker NVDA] [--model <name-or-path>]
+
+Runs on CPU over the stored transcripts and reports entries/sec and
+tokens/sec for both paths, plus how often their labels agree.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from transcript.transcript_loader import load_json_transcripts
+
+DEFAULT_MODEL = "mrm8488/distilroberta-finetuned-financial-news-sentiment-analysis"
+
+
+def section_texts(transcripts):
+    sections = []
+    for transcript in transcripts.values():
+        for key in ("preparedRemarks", "qanda"):
+            texts = [e["text"] for e in transcript.get(key, []) if e.get("speaker", "").lower() != "operator"]
+            if texts:
+                sections.append(texts)
+    return sections
+
+
+def suite_benchmarks(ctx):
+    """
+    With --sentiment model, the configured SentimentEngine over every
+    executive and analyst turn of the suite's dataset, uncached (see suite.py).
+    """
+    if ctx.sentiment != "model":
+        return {}
+    from analysis.signal_extractor import get_sentiment_engine
+
+    texts = [t for section in section_texts(load_json_transcripts(ctx.ticker)) for t in section]
+    engine = get_sentiment_engine()
+    return {"sentiment_engine": (lambda: engine.score_texts(texts), None)}
+
+
+def main():
+    import torch
+    from transformers import pipeline
+    from analysis.sentiment_engine import SentimentEngine
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ticker", default="NVDA")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--threads", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    transcripts = load_json_transcripts(args.ticker)
+    if not transcripts:
+        sys.exit(f"No transcripts for {args.ticker}")
+    sections = section_texts(transcripts)
+    texts = [t for section in sections for t in section]
+
+    analyzer = pipeline("sentiment-analysis", model=args.model, tokenizer=args.model, device=-1)
+    engine = SentimentEngine(analyzer.model, analyzer.tokenizer)
+    tokens = sum(len(ids) for ids in analyzer.tokenizer(texts, add_special_tokens=False)["input_ids"])
+    print(f"{len(texts)} entries, {tokens} tokens, {len(sections)} sections, torch threads={torch.get_num_threads()}")
+
+    start = time.perf_counter()
+    baseline = []
+    for section in sections:
+        baseline.extend(analyzer(section, truncation=True))
+    baseline_secs = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = engine.score_texts(texts)
+    engine_secs = time.perf_counter() - start
+
+    agree = sum(a["label"] == b["label"] for a, b in zip(baseline, batched)) / len(texts)
+    for name, secs in (("pipeline (per section)", baseline_secs), ("SentimentEngine", engine_secs)):
+        print(f"{name:24s} {secs:8.2f}s  {len(texts) / secs:8.1f} entries/s  {tokens / secs:10.1f} tokens/s")
+    print(f"speedup x{baseline_secs / engine_secs:.2f}, label agreement {agree:.1%}")
+    print(f"engine stats: {engine.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Cold-start time of the API for the non-ML endpoints.
+
+    python benchmarks/bench_startup.py [--runs 5] [--budget 1.0]
+
+Each run starts a fresh interpreter, imports `api.main`, and serves `/` and
+`/getTranscripts/{ticker}` in-process. Exits non-zero if the median cold
+start exceeds the budget (seconds). Models must not be loaded by then.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+CHILD = r"""
+import json, sys, time
+start = time.perf_counter()
+import api.main as main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+client = TestClient(main.app)
+client.get("/")
+first = time.perf_counter()
+status = client.get("/getTranscripts/" + sys.argv[1]).status_code
+served = time.perf_counter()
+print(json.dumps({
+    "import_s": imported - start,
+    "first_request_s": first - start,
+    "get_transcripts_s": served - first,
+    "get_transcripts_status": status,
+    "heavy_modules": sorted(m for m in ("torch", "transformers", "together", "nltk") if m in sys.modules),
+    "models": main.registry.get_stats(),
+}))
+"""
+
+
+def child_env():
+    env = dict(os.environ, PYTHONPATH=SRC + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    env.pop("WARMUP_MODELS", None)
+    return env
+
+
+def cold_start(ticker, env):
+    out = subprocess.run([sys.executable, "-c", CHILD, ticker], env=env,
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def suite_benchmarks(ctx):
+    """
+    A fresh interpreter importing the API and serving / and
+    /getTranscripts on the suite's dataset (see suite.py).
+    """
+    env = child_env()
+    return {"startup_cold_start": (lambda: cold_start(ctx.ticker, env), None)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=1.0)
+    parser.add_argument("--ticker", default="NVDA")
+    args = parser.parse_args()
+
+    env = child_env()
+    results = [cold_start(args.ticker, env) for _ in range(args.runs)]
+
+    first = statistics.median(r["first_request_s"] for r in results)
+    print(f"import api.main      median {statistics.median(r['import_s'] for r in results):.3f}s")
+    print(f"first request (/)    median {first:.3f}s")
+    print(f"/getTranscripts      median {statistics.median(r['get_transcripts_s'] for r in results):.3f}s")
+    print(f"heavy modules imported: {results[-1]['heavy_modules'] or 'none'}")
+    loaded = [name for name, s in results[-1]["models"].items() if s["loaded"]]
+    print(f"models loaded: {loaded or 'none'}")
+    if first > args.budget or loaded:
+        sys.exit(f"cold start {first:.3f}s exceeds budget {args.budget:.3f}s or models were loaded eagerly")
+
+
+if __name__ == "__main__":
+    main()
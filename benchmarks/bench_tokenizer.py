@@ -0,0 +1,119 @@
+"""
+Strategic-focus preprocessing: the previous NLTK path vs the interned-id
+Tokenizer, over a year of transcripts.
+
+    python benchmarks/bench_tokenizer.py [--ticker NVDA] [--quarters 4] [--repeat 5]
+
+Both paths tokenize the executive text of each quarter and count its
+bigrams and trigrams. The previous path is lowercase + punctuation regex +
+word_tokenize + a per-call stopword set, with n-grams joined into strings
+and counted by FreqDist. The new path is a single regex scan to interned
+token ids with n-grams counted as id tuples; only distinct n-grams become
+strings. Checks that tokens, distinct phrases and the 30 most common
+phrases (what strategic-focus extraction keeps) are identical,
+then reports throughput (input words/s) and memory: peak traced memory
+during one pass, and the blocks still allocated while its results are
+alive (about one per string, tuple or container the path keeps).
+"""
+import argparse
+import gc
+import os
+import re
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from transcript.transcript_loader import load_json_transcripts
+from analysis.model_registry import registry
+from analysis.signal_extractor import focus_entries, sort_quarters
+from analysis.strategic_focus import FINANCIAL_STOPWORDS
+from analysis.tokenizer import count_ngrams
+
+
+def legacy_terms(text):
+    nlp = registry.get("nltk")
+    text = re.sub(r'[^\w\s]', ' ', text.lower())
+    stop_words = set(nlp.stopwords.words('english')).union(FINANCIAL_STOPWORDS)
+    tokens = [t for t in nlp.word_tokenize(text) if t not in stop_words and len(t) > 2]
+    ngrams = [' '.join(tokens[i:i + n]) for n in (2, 3) for i in range(len(tokens) - n + 1)]
+    return tokens, nlp.FreqDist(ngrams).most_common(30), set(ngrams)
+
+
+def fast_terms(text):
+    tokenizer = registry.get("tokenizer")
+    ids = tokenizer.token_ids(text)
+    counts = count_ngrams(ids, (2, 3))
+    top = [(tokenizer.phrase(g), c) for g, c in counts.most_common(30)]
+    return tokenizer.tokens(ids), top, {tokenizer.phrase(g) for g in counts}
+
+
+def run(fn, texts, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        results = [fn(t) for t in texts]
+    seconds = (time.perf_counter() - start) / repeat
+    del results
+    gc.collect()
+
+    tracemalloc.start()
+    before = sys.getallocatedblocks()
+    results = [fn(t) for t in texts]
+    retained = sys.getallocatedblocks() - before
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return results, seconds, retained, peak
+
+
+def executive_texts(ticker, quarters):
+    transcripts = load_json_transcripts(ticker)
+    quarters = sort_quarters(transcripts)[-quarters:]
+    texts = [" ".join(e["text"] for e in focus_entries(transcripts[q])
+                      if e.get("speaker", "").lower() != "operator") for q in quarters]
+    return quarters, texts
+
+
+def suite_benchmarks(ctx):
+    """
+    Tokenizer terms (ids, n-gram counts, top phrases) for the last four
+    quarters of the suite's dataset (see suite.py).
+    """
+    _, texts = executive_texts(ctx.ticker, 4)
+    for text in texts:
+        fast_terms(text)   # vocabulary learned outside the timings
+    return {"tokenizer_terms": (lambda: [fast_terms(t) for t in texts], None)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ticker", default="NVDA")
+    parser.add_argument("--quarters", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    quarters, texts = executive_texts(args.ticker, args.quarters)
+    if not quarters:
+        sys.exit(f"No transcripts for {args.ticker}")
+    # load NLTK data and learn the vocabulary outside the timings
+    legacy_terms(texts[0])
+    for text in texts:
+        fast_terms(text)
+
+    legacy, legacy_secs, legacy_blocks, legacy_peak = run(legacy_terms, texts, args.repeat)
+    fast, fast_secs, fast_blocks, fast_peak = run(fast_terms, texts, args.repeat)
+
+    identical = legacy == fast
+    tokens = sum(len(t) for t, _, _ in fast)
+    words = sum(len(re.findall(r"\w+", t)) for t in texts)
+    print(f"{args.ticker} {quarters[0]}..{quarters[-1]}: {len(texts)} transcripts, {words} words, "
+          f"{tokens} kept tokens, identical output: {identical}")
+    print(f"{'path':>9} {'ms/pass':>9} {'words/s':>11} {'peak KB':>9} {'blocks kept':>12}")
+    for name, secs, blocks, peak in (("nltk", legacy_secs, legacy_blocks, legacy_peak),
+                                     ("tokenizer", fast_secs, fast_blocks, fast_peak)):
+        print(f"{name:>9} {secs * 1000:9.1f} {words / secs:11.0f} {peak / 1024:9.0f} {blocks:12d}")
+    print(f"speedup x{legacy_secs / fast_secs:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Memory and throughput of the streaming transcript parser vs the previous
+json.loads + re.findall + json.dumps implementation.
+
+    python benchmarks/bench_transcript_parser.py [--sizes 1,10,50]
+
+Builds API‑Ninjas-style payloads of the given sizes (MB) from the stored
+transcripts, then parses each one with both implementations. The old path
+holds the whole response text, as `resp.text` does. The streaming path
+reads the payload from disk in 64 KB chunks, as `iter_content` does.
+Reports MB/s and tracemalloc peak; the streaming peak should stay flat.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from transcript.transcript_loader import load_json_transcripts
+from transcript.transcript_stream import write_processed_transcript, decode_chunks
+
+CHUNK = 64 * 1024
+
+
+def legacy_process_transcript(text):
+    data = json.loads(text)
+    date = data.get("date", "")
+    transcript = data["transcript"]
+    entries = []
+    for line in transcript.split("\n"):
+        for speaker, body in re.findall(r'([^:\n]+):\s*(.+)', line):
+            entries.append({"speaker": speaker.strip(), "text": body.strip()})
+    prepared, qanda, in_qa = [], [], False
+    for entry in entries:
+        txt = entry["text"].lower()
+        if not in_qa and entry["speaker"] == "Operator" and "[operator instructions]" in txt and "your first question" in txt:
+            in_qa = True
+        (qanda if in_qa else prepared).append(entry)
+    return json.dumps({"date": date, "preparedRemarks": prepared, "qanda": qanda}, ensure_ascii=False)
+
+
+def build_payload(path, megabytes, ticker="NVDA"):
+    lines = []
+    for transcript in load_json_transcripts(ticker).values():
+        for entry in transcript.get("preparedRemarks", []) + transcript.get("qanda", []):
+            lines.append(f"{entry['speaker']}: {entry['text']}")
+    block = "\n".join(lines)
+    repeat = max(1, int(megabytes * 1024 * 1024 / len(block.encode("utf-8"))))
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"date": "2025-01-01", "transcript": "\n".join([block] * repeat)}, f, ensure_ascii=False)
+    return os.path.getsize(path)
+
+
+def read_chunks(path):
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(CHUNK)
+            if not chunk:
+                return
+            yield chunk
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def suite_benchmarks(ctx):
+    """
+    Streaming parse of a 1 MB payload built from the suite's dataset,
+    read and written through a temporary folder (see suite.py).
+    """
+    workdir = tempfile.mkdtemp(dir=ctx.data_dir)
+    payload_path = os.path.join(workdir, "payload.json")
+    out_path = os.path.join(workdir, "out.txt")
+    build_payload(payload_path, 1, ctx.ticker)
+
+    def run_streaming():
+        with open(out_path, "w", encoding="utf-8") as f:
+            write_processed_transcript(decode_chunks(read_chunks(payload_path)), f)
+
+    return {"stream_parse_1mb": (run_streaming, None)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="1,10,50")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    payload_path = os.path.join(workdir, "payload.json")
+    out_path = os.path.join(workdir, "out.txt")
+
+    def run_legacy():
+        with open(payload_path, "r", encoding="utf-8") as f:
+            text = f.read()
+        with open(out_path, "w", encoding="utf-8") as f:
+            f.write(legacy_process_transcript(text))
+
+    def run_streaming():
+        with open(out_path, "w", encoding="utf-8") as f:
+            write_processed_transcript(decode_chunks(read_chunks(payload_path)), f)
+
+    print(f"{'payload':>10s} {'impl':>10s} {'MB/s':>8s} {'peak MB':>9s}")
+    for size in (float(s) for s in args.sizes.split(",")):
+        nbytes = build_payload(payload_path, size)
+        mb = nbytes / 1024 / 1024
+        for name, fn in (("legacy", run_legacy), ("streaming", run_streaming)):
+            elapsed, peak = measure(fn)
+            print(f"{mb:9.1f}M {name:>10s} {mb / elapsed:8.1f} {peak / 1024 / 1024:9.2f}")
+    os.remove(payload_path)
+    os.remove(out_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Load latency: glob + json.load of the processed files vs the columnar
+TranscriptStore.
+
+    python benchmarks/bench_transcript_store.py [--ticker NVDA] [--copies 10] [--repeat 50]
+
+Copies the stored transcripts of --ticker into a temporary data folder
+(--copies times, as extra quarters), migrates them, checks both backends
+return identical data and reports per-call latency for a full load and for
+one quarter / one section / one speaker.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import transcript.transcript_loader as loader
+from transcript.transcript_store import migrate
+
+
+def timed(repeat, fn):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def columnar(fn):
+    def run():
+        previous, loader.TRANSCRIPT_BACKEND = loader.TRANSCRIPT_BACKEND, "columnar"
+        try:
+            return fn()
+        finally:
+            loader.TRANSCRIPT_BACKEND = previous
+    return run
+
+
+def suite_benchmarks(ctx):
+    """
+    Columnar-store loads of the suite's dataset (all quarters, one quarter,
+    one section, one speaker); the dataset is migrated untimed (see suite.py).
+    """
+    migrate(loader.DATA_DIR)
+    quarter = max(loader.load_json_transcripts(ctx.ticker))
+    speaker = loader.load_json_transcripts(ctx.ticker, [quarter])[quarter]["qanda"][-1]["speaker"]
+    cases = {
+        "columnar_full": (None, None, None),
+        "columnar_quarter": ([quarter], None, None),
+        "columnar_section": (None, "qanda", None),
+        "columnar_speaker": (None, None, speaker),
+    }
+    return {name: (columnar(lambda case=case: loader.load_json_transcripts(ctx.ticker, *case)), None)
+            for name, case in cases.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ticker", default="NVDA")
+    parser.add_argument("--copies", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    sources = sorted(p for p in os.listdir(loader.DATA_DIR)
+                     if p.startswith(f"{args.ticker}_") and p.endswith(".txt"))
+    if not sources:
+        sys.exit(f"no transcripts for {args.ticker} in {loader.DATA_DIR}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for copy in range(args.copies):
+            for i, name in enumerate(sources):
+                quarter = f"{2000 + copy * len(sources) + i}Q1"
+                shutil.copy(os.path.join(loader.DATA_DIR, name), os.path.join(tmp, f"{args.ticker}_{quarter}.txt"))
+        loader.DATA_DIR = tmp
+        start = time.perf_counter()
+        migrate(tmp)
+        print(f"migrated {args.copies * len(sources)} quarters in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        quarter = sorted(os.listdir(tmp))[0].split("_")[-1][:-4]
+        speaker = loader.load_json_transcripts(args.ticker, [quarter])[quarter]["qanda"][-1]["speaker"]
+        cases = [
+            ("full load", (None, None, None)),
+            ("one quarter", ([quarter], None, None)),
+            ("one section", (None, "qanda", None)),
+            ("one speaker", (None, None, speaker)),
+        ]
+        print(f"{'case':>12} {'files ms':>10} {'columnar ms':>12} {'speedup':>8}  identical")
+        for name, case in cases:
+            loader.TRANSCRIPT_BACKEND = "files"
+            expected = loader.load_json_transcripts(args.ticker, *case)
+            files_ms = timed(args.repeat, lambda: loader.load_json_transcripts(args.ticker, *case))
+            loader.TRANSCRIPT_BACKEND = "columnar"
+            got = loader.load_json_transcripts(args.ticker, *case)
+            columnar_ms = timed(args.repeat, lambda: loader.load_json_transcripts(args.ticker, *case))
+            print(f"{name:>12} {files_ms:10.2f} {columnar_ms:12.2f} {files_ms / columnar_ms:7.1f}x  {expected == got}")
+
+
+if __name__ == "__main__":
+    main()
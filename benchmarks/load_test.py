@@ -0,0 +1,112 @@
+"""
+Mixed-load test: concurrent /signals requests alongside /getTranscripts polling.
+
+    python benchmarks/load_test.py [--url http://127.0.0.1:8000] [--ticker NVDA]
+                                   [--signals-clients 4] [--poll-clients 8] [--duration 30]
+
+Without --url a uvicorn server is started on a free port. Prints latency
+percentiles and status codes per endpoint, first with no inference
+running and then under load; cheap endpoints should stay fast.
+"""
+import argparse
+import collections
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+import requests
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+
+def start_server():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    env = dict(os.environ, PYTHONPATH=SRC + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            requests.get(url + "/", timeout=1)
+            return proc, url
+        except requests.ConnectionError:
+            time.sleep(0.1)
+    proc.kill()
+    sys.exit("server did not start")
+
+
+def hammer(url, stop, samples, key):
+    session = requests.Session()
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            status = session.get(url, timeout=600).status_code
+        except requests.RequestException:
+            status = "error"
+        samples[key].append((time.perf_counter() - start, status))
+
+
+def report(title, samples):
+    print(title)
+    for key, values in samples.items():
+        if not values:
+            continue
+        latencies = sorted(v[0] * 1000 for v in values)
+        statuses = collections.Counter(v[1] for v in values)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        print(f"  {key:16s} n={len(values):5d}  p50={statistics.median(latencies):8.1f}ms  "
+              f"p95={p95:8.1f}ms  max={latencies[-1]:8.1f}ms  status={dict(statuses)}")
+
+
+def run(url, ticker, signals_clients, poll_clients, duration):
+    samples = collections.defaultdict(list)
+    stop = threading.Event()
+    threads = [
+        threading.Thread(target=hammer, args=(f"{url}/signals/{ticker}", stop, samples, "/signals"))
+        for _ in range(signals_clients)
+    ] + [
+        threading.Thread(target=hammer, args=(f"{url}/getTranscripts/{ticker}", stop, samples, "/getTranscripts"))
+        for _ in range(poll_clients)
+    ] + [
+        threading.Thread(target=hammer, args=(f"{url}/", stop, samples, "/"))
+    ]
+    for t in threads:
+        t.start()
+    time.sleep(duration)
+    stop.set()
+    for t in threads:
+        t.join()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url")
+    parser.add_argument("--ticker", default="NVDA")
+    parser.add_argument("--signals-clients", type=int, default=4)
+    parser.add_argument("--poll-clients", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=30)
+    args = parser.parse_args()
+
+    proc = None
+    url = args.url
+    if not url:
+        proc, url = start_server()
+    try:
+        report("idle (no inference):", run(url, args.ticker, 0, args.poll_clients, min(args.duration, 5)))
+        report("under /signals load:", run(url, args.ticker, args.signals_clients, args.poll_clients, args.duration))
+    finally:
+        if proc:
+            proc.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,387 @@
+"""
+Benchmark suite on seeded synthetic transcripts, with machine-readable
+results and a regression check against a stored baseline.
+
+    python benchmarks/suite.py [--quarters 8] [--seed 0] [--sentiment stub|model]
+                               [--min-time 0.5] [--repeat 7] [--no-api] [--only NAME,...]
+                               [--output results.json] [--baseline benchmarks/baseline.json]
+                               [--save-baseline] [--tolerance 0.25]
+
+Everything runs against a temporary EARNINGS_DATA_DIR filled by
+`synthetic.write_dataset`, so src/data is never read or written.
+Microbenchmarks: process_transcript, load_json_transcripts (cold and
+parsed-cache hit), preprocess_text, extract_strategic_focuses,
+section_sentiment (cold and sentiment-cache hit) and compute_qoq_tone.
+End to end, a uvicorn server on the same data serves /getTranscripts,
+/signals (incremental and ?full=true) and the /signals stream (time to first
+event) over HTTP.
+
+The per-feature scripts (benchmarks/bench_*.py) contribute their cases
+through `suite_benchmarks(ctx)`, timing the current implementation on the
+same dataset: keyword matcher, tokenizer, streaming parser, columnar store,
+search, embeddings, batch signals, the LLM client against its mock, the
+sentiment engine (--sentiment model only) and cold start (skipped with
+--no-api). A script's untimed setup only runs when one of its cases is
+selected with --only.
+
+`--sentiment stub` (default) swaps the sentiment engine for a hash-based
+stub via `registry.set`, so runs measure the pipeline and need no model.
+`--sentiment model` uses the configured model (SENTIMENT_BACKEND etc.),
+e.g. a small local checkpoint.
+
+Each benchmark reports median, p95 and min milliseconds over at least
+--repeat samples and --min-time seconds. With --baseline, a benchmark
+whose median is more than --tolerance slower than the baseline's (and
+slower by at least 0.05 ms) is flagged, and the exit status is 1. Baselines
+are only comparable on the same machine and configuration, so the
+configuration is stored with them and a mismatch is reported.
+--save-baseline writes the current results to the --baseline path.
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import types
+import zlib
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, SRC)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+TICKER = "SYN"
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+# medians closer than this are never flagged, whatever the ratio
+NOISE_FLOOR_MS = 0.05
+MAX_SAMPLES = 100000
+# (script, prefix of its case names, starts the API in fresh interpreters)
+FEATURE_BENCHMARKS = (
+    ("bench_keyword_matcher", "keyword_matcher", False),
+    ("bench_tokenizer", "tokenizer", False),
+    ("bench_transcript_parser", "stream_parse", False),
+    ("bench_transcript_store", "columnar", False),
+    ("bench_search", "search", False),
+    ("bench_embeddings", "embeddings", False),
+    ("bench_batch_signals", "batch_signals", False),
+    ("bench_llm_signals", "llm_signals", False),
+    ("bench_sentiment", "sentiment_engine", False),
+    ("bench_startup", "startup", True),
+)
+
+
+class StubSentimentEngine:
+    """
+    Stands in for SentimentEngine: a label and score derived from a hash
+    of the text, with no model behind it.
+    """
+
+    LABELS = ("positive", "neutral", "negative")
+
+    def __init__(self):
+        self.stats = {"texts": 0, "tokens": 0}
+
+    def score_texts(self, texts):
+        self.stats["texts"] += len(texts)
+        results = []
+        for text in texts:
+            h = zlib.crc32(text.encode("utf-8"))
+            results.append({"label": self.LABELS[h % 3], "score": 0.5 + (h >> 8) % 500 / 1000})
+        return results
+
+
+def use_stub_sentiment():
+    from analysis.model_registry import registry
+    registry.set("sentiment_engine", StubSentimentEngine())
+
+
+def measure(fn, setup=None, repeat=7, min_time=0.5):
+    """
+    Timings in ms of `fn(*setup())` (setup untimed), sampled until at
+    least `repeat` samples and `min_time` seconds of them are collected.
+    """
+    samples = []
+    spent = 0.0
+    while (len(samples) < repeat or spent < min_time) and len(samples) < MAX_SAMPLES:
+        args = setup() if setup else ()
+        start = time.perf_counter()
+        fn(*args)
+        elapsed = time.perf_counter() - start
+        spent += elapsed
+        samples.append(elapsed * 1000)
+    return summarize(samples)
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    return {
+        "median_ms": statistics.median(ordered),
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "min_ms": ordered[0],
+        "samples": len(ordered),
+    }
+
+
+def micro_benchmarks(payloads):
+    """
+    {name: (fn, setup)} for the pipeline stages, on the last synthetic quarter.
+    """
+    from analysis import signal_extractor
+    from analysis.signal_extractor import (
+        compute_qoq_tone, extract_all_signals, focus_entries, section_sentiment, sort_quarters,
+    )
+    from analysis.strategic_focus import extract_strategic_focuses, preprocess_text
+    from transcript.transcript_client import process_transcript
+    from transcript.transcript_loader import load_json_transcripts, loaded_cache
+
+    transcripts = load_json_transcripts(TICKER)
+    last = sort_quarters(transcripts)[-1]
+    transcript = transcripts[last]
+    entries = focus_entries(transcript)
+    text = " ".join(e["text"] for e in entries if e.get("speaker", "").lower() != "operator")
+    qanda = transcript["qanda"]
+    signals = extract_all_signals(TICKER, transcripts, incremental=False)["signals"]
+
+    revisions = itertools.count()
+
+    def cold_sentiment_cache():
+        # a revision nothing was cached under makes every lookup a miss
+        signal_extractor.CACHE_REVISION = f"bench-{next(revisions)}"
+        return ()
+
+    def clear_loaded():
+        loaded_cache.discard_where(lambda key: True)
+        return ()
+
+    # (fn, untimed per-sample setup); each cached variant runs right after
+    # its cold one, so it hits what the cold samples stored
+    return {
+        "process_transcript": (lambda: process_transcript(payloads[last]), None),
+        "load_json_transcripts": (lambda: load_json_transcripts(TICKER), clear_loaded),
+        "load_json_transcripts_cached": (lambda: load_json_transcripts(TICKER), None),
+        "preprocess_text": (lambda: preprocess_text(text), None),
+        "extract_strategic_focuses": (lambda: extract_strategic_focuses(entries, top_n=5), None),
+        "section_sentiment": (lambda: section_sentiment(qanda), cold_sentiment_cache),
+        "section_sentiment_cached": (lambda: section_sentiment(qanda), None),
+        "compute_qoq_tone": (lambda: compute_qoq_tone(signals), None),
+    }
+
+
+def feature_benchmarks(args, data_dir, only):
+    """
+    {name: (fn, setup)} contributed by the per-feature scripts that have a
+    selected case.
+    """
+    import importlib
+
+    ctx = types.SimpleNamespace(data_dir=data_dir, ticker=TICKER, quarters=args.quarters, seed=args.seed,
+                                sentiment=args.sentiment)
+    cases = {}
+    for module, prefix, starts_api in FEATURE_BENCHMARKS:
+        if starts_api and args.no_api:
+            continue
+        if only is None or any(name.startswith(prefix) for name in only):
+            cases.update(importlib.import_module(module).suite_benchmarks(ctx))
+    return cases
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def serve(port, sentiment):
+    """
+    Child process: the API on `port`, with the stub engine if asked.
+    """
+    import uvicorn
+    from api.main import app
+
+    if sentiment == "stub":
+        use_stub_sentiment()
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def api_benchmarks(data_dir, sentiment, repeat, min_time):
+    import requests
+
+    port = free_port()
+    env = dict(os.environ, EARNINGS_DATA_DIR=data_dir,
+               PYTHONPATH=SRC + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    env.pop("WARMUP_MODELS", None)
+    proc = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--serve", str(port),
+                             "--sentiment", sentiment], env=env)
+    url = f"http://127.0.0.1:{port}"
+    try:
+        for _ in range(300):
+            try:
+                requests.get(url + "/", timeout=1)
+                break
+            except requests.ConnectionError:
+                time.sleep(0.1)
+        else:
+            raise RuntimeError("API server did not start")
+        session = requests.Session()
+
+        def get(path):
+            response = session.get(url + path, timeout=600)
+            response.raise_for_status()
+
+        first_event = []
+
+        def stream_first_event():
+            start = time.perf_counter()
+            with session.get(f"{url}/signals/{TICKER}/stream?full=true", stream=True, timeout=600) as response:
+                response.raise_for_status()
+                lines = response.iter_lines()
+                next(lines)
+                first_event.append((time.perf_counter() - start) * 1000)
+                for _ in lines:
+                    pass
+
+        get(f"/signals/{TICKER}")   # load models and build the stored analysis
+        results = {
+            "api_get_transcripts": measure(lambda: get(f"/getTranscripts/{TICKER}"), None, repeat, min_time),
+            "api_signals": measure(lambda: get(f"/signals/{TICKER}"), None, repeat, min_time),
+            "api_signals_full": measure(lambda: get(f"/signals/{TICKER}?full=true"), None, repeat, min_time),
+            "api_signals_stream": measure(stream_first_event, None, repeat, min_time),
+        }
+        results["api_signals_stream_first_event"] = summarize(first_event)
+        return results
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def compare(results, baseline, tolerance):
+    """
+    Lines describing each benchmark against the baseline, and the names
+    of the regressed ones.
+    """
+    lines, regressions = [], []
+    for name, current in results.items():
+        before = baseline.get("results", {}).get(name)
+        if before is None:
+            lines.append(f"{name:34s} {current['median_ms']:10.3f} ms   (not in baseline)")
+            continue
+        ratio = current["median_ms"] / before["median_ms"] if before["median_ms"] else float("inf")
+        regressed = (ratio > 1 + tolerance and current["median_ms"] - before["median_ms"] > NOISE_FLOOR_MS)
+        if regressed:
+            regressions.append(name)
+        lines.append(f"{name:34s} {current['median_ms']:10.3f} ms  vs {before['median_ms']:10.3f} ms  "
+                     f"x{ratio:5.2f}{'  REGRESSION' if regressed else ''}")
+    return lines, regressions
+
+
+def run(args, data_dir, only):
+    from synthetic import generate, write_dataset
+
+    shape = {"executives": args.executives, "analysts": args.analysts,
+             "qa_turns": args.qa_turns, "turn_words": args.turn_words}
+    write_dataset(data_dir, TICKER, args.quarters, args.seed, **shape)
+    payloads = generate(args.quarters, args.seed, **shape)
+    if args.sentiment == "stub":
+        use_stub_sentiment()
+
+    results = {}
+    for cases in (lambda: micro_benchmarks(payloads), lambda: feature_benchmarks(args, data_dir, only)):
+        for name, (fn, setup) in cases().items():
+            if only is None or name in only:
+                results[name] = measure(fn, setup, args.repeat, args.min_time)
+                print(f"{name:34s} {results[name]['median_ms']:10.3f} ms", file=sys.stderr)
+    if not args.no_api and (only is None or any(n.startswith("api_") for n in only)):
+        for name, summary in api_benchmarks(data_dir, args.sentiment, args.repeat, args.min_time).items():
+            if only is None or name in only:
+                results[name] = summary
+                print(f"{name:34s} {summary['median_ms']:10.3f} ms", file=sys.stderr)
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quarters", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--executives", type=int, default=3)
+    parser.add_argument("--analysts", type=int, default=6)
+    parser.add_argument("--qa-turns", type=int, default=40)
+    parser.add_argument("--turn-words", type=int, default=80)
+    parser.add_argument("--sentiment", choices=("stub", "model"), default="stub")
+    parser.add_argument("--repeat", type=int, default=7, help="minimum samples per benchmark")
+    parser.add_argument("--min-time", type=float, default=0.5, help="minimum seconds per benchmark")
+    parser.add_argument("--no-api", action="store_true", help="skip the end-to-end API benchmarks")
+    parser.add_argument("--only", help="comma-separated benchmark names")
+    parser.add_argument("--output", help="write results JSON here (default: stdout)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="write results to --baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed median slowdown, e.g. 0.25 = 25%%")
+    parser.add_argument("--serve", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.sentiment)
+        return
+
+    config = {
+        "ticker": TICKER, "quarters": args.quarters, "seed": args.seed, "executives": args.executives,
+        "analysts": args.analysts, "qa_turns": args.qa_turns, "turn_words": args.turn_words,
+        "sentiment": args.sentiment,
+    }
+    only = {n.strip() for n in args.only.split(",")} if args.only else None
+    data_dir = tempfile.mkdtemp(prefix="earnings-bench-")
+    # must be set before any src module computes its DATA_DIR
+    os.environ["EARNINGS_DATA_DIR"] = data_dir
+
+    try:
+        results = run(args, data_dir, only)
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    report = {
+        "config": config,
+        "environment": {"python": platform.python_version(), "platform": platform.platform(),
+                        "machine": platform.machine(), "cpus": os.cpu_count(), "commit": git_commit()},
+        "results": results,
+    }
+    body = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(body + "\n")
+    else:
+        print(body)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            f.write(body + "\n")
+        print(f"baseline saved to {args.baseline}", file=sys.stderr)
+        return
+    if not os.path.exists(args.baseline):
+        return
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("config") != config:
+        print(f"warning: baseline configuration differs: {baseline.get('config')}", file=sys.stderr)
+    lines, regressions = compare(results, baseline, args.tolerance)
+    print("\n".join(lines), file=sys.stderr)
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.tolerance:.0%}: {', '.join(regressions)}",
+              file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Seeded synthetic earnings-call transcripts.
+
+    python benchmarks/synthetic.py --out DIR [--ticker SYN] [--quarters 8] [--seed 0]
+                                   [--executives 3] [--analysts 6] [--prepared-turns 12]
+                                   [--qa-turns 40] [--turn-words 80] [--turn-sigma 0.6]
+
+Each quarter is built as an API-Ninjas payload {"date", "transcript"} and
+run through `process_transcript`, so the files written
+(DIR/{ticker}_{YYYY}Q{n}.txt) have the same {date, preparedRemarks, qanda}
+schema as fetched ones. Turn lengths are log-normal around --turn-words
+words. Each quarter weights the strategic-area keywords differently, so
+strategic focuses and QoQ tone change between quarters. The same seed and
+arguments always give byte-identical files.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+from typing import Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from analysis.strategic_focus import NVIDIA_STRATEGIC_AREAS
+from transcript.transcript_client import process_transcript
+
+FIRST_NAMES = ["Alex", "Jordan", "Sam", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery", "Quinn",
+               "Drew", "Harper", "Rowan", "Emerson", "Parker", "Reese"]
+LAST_NAMES = ["Chen", "Patel", "Garcia", "Kim", "Novak", "Okafor", "Silva", "Larsen", "Haddad", "Ito",
+              "Moreau", "Kowalski", "Nguyen", "Brennan", "Duarte", "Fischer"]
+FILLER = (
+    "we our customers team continue see demand across market products new platform strong momentum "
+    "expect second half supply capacity partners build scale systems investment opportunity years "
+    "long term adoption workloads performance efficiency customers really broad based sequential "
+    "visibility pipeline ramp shipments backlog pricing mix gross margin operating expenses cash flow "
+    "return capital priorities execution roadmap architecture launch availability industry leadership "
+    "important significant incredible excited proud committed focused positioned believe think know "
+    "obviously clearly certainly continue progress quarter year fiscal revenue growth percent billion"
+).split()
+POSITIVE = "record strong exceptional accelerating robust outstanding exceeded beat healthy".split()
+NEGATIVE = "decline headwinds weaker constrained challenging softness uncertainty delays shortfall".split()
+
+
+def quarters_ending(last: str, count: int) -> List[str]:
+    """
+    `count` consecutive "YYYYQn" keys ending with `last`, oldest first.
+    """
+    year, q = (int(p) for p in last.split("Q"))
+    index = year * 4 + q - 1
+    return [f"{i // 4}Q{i % 4 + 1}" for i in range(index - count + 1, index + 1)]
+
+
+def _names(rng: random.Random, count: int) -> List[str]:
+    pairs = [(f, l) for f in FIRST_NAMES for l in LAST_NAMES]
+    return [f"{f} {l}" for f, l in rng.sample(pairs, count)]
+
+
+def _sentence(rng: random.Random, words: int, topics: List[str], tone: float) -> str:
+    out = []
+    while len(out) < words:
+        roll = rng.random()
+        if roll < 0.12:
+            out.extend(rng.choice(topics).split())
+        elif roll < 0.16:
+            out.append(rng.choice(POSITIVE if rng.random() < tone else NEGATIVE))
+        else:
+            out.append(rng.choice(FILLER))
+    text = " ".join(out[:words])
+    return text[0].upper() + text[1:] + "."
+
+
+def _turn(rng: random.Random, topics: List[str], tone: float, median_words: int, sigma: float) -> str:
+    words = max(5, int(rng.lognormvariate(0, sigma) * median_words))
+    sentences = []
+    while words > 0:
+        length = min(words, rng.randint(8, 22))
+        sentences.append(_sentence(rng, length, topics, tone))
+        words -= length
+    return " ".join(sentences)
+
+
+def make_payload(rng: random.Random, date: str, executives: List[str], analysts: List[str],
+                 prepared_turns: int = 12, qa_turns: int = 40,
+                 turn_words: int = 80, turn_sigma: float = 0.6) -> str:
+    """
+    One quarter's raw API-Ninjas payload: Operator opening, prepared
+    remarks by `executives`, the Operator line that opens Q&A, then
+    analyst questions each answered by an executive.
+    """
+    areas = list(NVIDIA_STRATEGIC_AREAS.values())
+    weights = [rng.random() ** 3 for _ in areas]
+    topics = [kw for kws, w in zip(areas, weights) for kw in kws if w > 0.2] or areas[0]
+    tone = rng.uniform(0.4, 0.9)
+
+    lines = [f"Operator: Good afternoon and welcome to the earnings conference call. "
+             f"{executives[0]}, you may begin."]
+    for i in range(prepared_turns):
+        lines.append(f"{executives[i % len(executives)]}: {_turn(rng, topics, tone, turn_words, turn_sigma)}")
+    lines.append(f"Operator: [Operator Instructions] Your first question comes from {analysts[0]}.")
+    for i in range(qa_turns):
+        if i % 2 == 0:
+            analyst = analysts[(i // 2) % len(analysts)]
+            lines.append(f"{analyst}: {_turn(rng, topics, tone, max(5, turn_words // 3), turn_sigma)}")
+        else:
+            lines.append(f"{rng.choice(executives)}: {_turn(rng, topics, tone, turn_words, turn_sigma)}")
+    lines.append("Operator: This concludes today's conference call. You may now disconnect.")
+    return json.dumps({"date": date, "transcript": "\n".join(lines)})
+
+
+def generate(quarters: int = 8, seed: int = 0, last: str = "2025Q2", executives: int = 3,
+             analysts: int = 6, **shape) -> Dict[str, str]:
+    """
+    {quarter: raw payload} for `quarters` quarters ending with `last`.
+    `shape` is passed to make_payload (prepared_turns, qa_turns,
+    turn_words, turn_sigma). Speakers stay the same across quarters.
+    """
+    rng = random.Random(seed)
+    names = _names(rng, executives + analysts)
+    payloads = {}
+    for quarter in quarters_ending(last, quarters):
+        year, q = quarter.split("Q")
+        date = f"{year}-{int(q) * 3 - 1:02d}-20"
+        payloads[quarter] = make_payload(rng, date, names[:executives], names[executives:], **shape)
+    return payloads
+
+
+def write_dataset(data_dir: str, ticker: str = "SYN", quarters: int = 8, seed: int = 0, **kwargs) -> List[str]:
+    """
+    Writes processed transcripts for `ticker` into `data_dir` as
+    fetch_and_save_transcript would. Returns the paths written.
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    paths = []
+    for quarter, payload in generate(quarters, seed, **kwargs).items():
+        path = os.path.join(data_dir, f"{ticker}_{quarter}.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(process_transcript(payload))
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", required=True, help="data folder to write into")
+    parser.add_argument("--ticker", default="SYN")
+    parser.add_argument("--quarters", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--executives", type=int, default=3)
+    parser.add_argument("--analysts", type=int, default=6)
+    parser.add_argument("--prepared-turns", type=int, default=12)
+    parser.add_argument("--qa-turns", type=int, default=40)
+    parser.add_argument("--turn-words", type=int, default=80, help="median words per turn")
+    parser.add_argument("--turn-sigma", type=float, default=0.6, help="log-normal spread of turn length")
+    args = parser.parse_args()
+
+    paths = write_dataset(args.out, args.ticker, args.quarters, args.seed,
+                          executives=args.executives, analysts=args.analysts,
+                          prepared_turns=args.prepared_turns, qa_turns=args.qa_turns,
+                          turn_words=args.turn_words, turn_sigma=args.turn_sigma)
+    size = sum(os.path.getsize(p) for p in paths)
+    print(f"wrote {len(paths)} transcripts ({size / 1024:.0f} KB) to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Multi-ticker signals: one combined sentiment pass over every ticker's
+transcripts, per-ticker strategic-focus extraction, and a cross-sectional
+table comparing the tickers.
+"""
+import statistics
+from typing import Dict, Any, List, Iterable
+
+from transcript.transcript_loader import load_json_transcripts
+from .signal_extractor import extract_all_signals, score_transcripts, _section_texts, sort_quarters
+
+def _zscores(values: Dict[str, float]) -> Dict[str, float]:
+    if len(values) < 2:
+        return {k: 0.0 for k in values}
+    mean = statistics.fmean(values.values())
+    stdev = statistics.pstdev(values.values())
+    return {k: (v - mean) / stdev if stdev else 0.0 for k, v in values.items()}
+
+
+def _edge_key(edge: str):
+    # "2024Q4_to_2025Q1" sorts by its later quarter
+    year, qnum = edge.split("_to_")[-1].split("Q")
+    return (int(year), int(qnum))
+
+
+def cross_section_table(results: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Compares per-ticker `extract_all_signals` results:
+      {
+        "sentiment_zscores": {quarter: {ticker: {"management": z, "qa": z}}},
+        "qoq_tone_rank":     {edge: [{"ticker", "management_tone_shift",
+                                      "qa_tone_shift", "rank"}, ...]},
+        "latest_qoq_rank":   [... each ticker's most recent edge, ranked ...]
+      }
+    Z-scores are of positive_avg across the tickers reporting that quarter.
+    Tone shifts are ranked by management + Q&A shift, 1 = most improved.
+    """
+    quarters = sort_quarters({q for r in results.values() for q in r["signals"]})
+    zscores: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for quarter in quarters:
+        reporting = {t: r["signals"][quarter] for t, r in results.items() if quarter in r["signals"]}
+        mgmt = _zscores({t: s["management_sentiment"]["positive_avg"] for t, s in reporting.items()})
+        qa = _zscores({t: s["qa_sentiment"]["positive_avg"] for t, s in reporting.items()})
+        zscores[quarter] = {t: {"management": mgmt[t], "qa": qa[t]} for t in reporting}
+
+    def ranked(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        rows = sorted(rows, key=lambda r: r["management_tone_shift"] + r["qa_tone_shift"], reverse=True)
+        return [dict(row, rank=i + 1) for i, row in enumerate(rows)]
+
+    edges: Dict[str, List[Dict[str, Any]]] = {}
+    latest: List[Dict[str, Any]] = []
+    for ticker, result in results.items():
+        qoq = result["qoq_tone_change"]
+        for edge, shift in qoq.items():
+            edges.setdefault(edge, []).append({"ticker": ticker, **shift})
+        if qoq:
+            edge = max(qoq, key=_edge_key)
+            latest.append({"ticker": ticker, "edge": edge, **qoq[edge]})
+    return {
+        "sentiment_zscores": zscores,
+        "qoq_tone_rank": {edge: ranked(rows) for edge, rows in edges.items()},
+        "latest_qoq_rank": ranked(latest),
+    }
+
+
+def extract_batch_signals(tickers: Iterable[str],
+                          transcripts: Dict[str, Dict[str, Any]] = None,
+                          areas: Dict[str, Dict[str, List[str]]] = None,
+                          incremental: bool = None) -> Dict[str, Any]:
+    """
+    Signals for several tickers at once:
+      {
+        "signals":       {ticker: extract_all_signals(...) result},
+        "cross_section": cross_section_table(...),
+        "errors":        {ticker: message}   # e.g. no transcripts
+      }
+    `transcripts` ({ticker: {quarter: transcript}}) defaults to the stored
+    ones; `areas` maps tickers to taxonomy overrides (default
+    taxonomy.get_taxonomy), whose results are not saved. Sentiment for all
+    tickers runs as one batched inference pass; term analysis and focus
+    extraction then run per ticker on the already scored texts.
+    """
+    tickers = list(dict.fromkeys(t.upper() for t in tickers))
+    transcripts = transcripts or {}
+    areas = {t.upper(): a for t, a in (areas or {}).items()}
+    loaded: Dict[str, Dict[str, Any]] = {}
+    errors: Dict[str, str] = {}
+    for ticker in tickers:
+        data = transcripts.get(ticker)
+        if data is None:
+            data = load_json_transcripts(ticker)
+        if data:
+            loaded[ticker] = data
+        else:
+            errors[ticker] = "No transcripts found"
+
+    # One inference pass over the texts of every ticker
+    scored_all = score_transcripts({(t, q): tr for t, data in loaded.items() for q, tr in data.items()})
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for ticker, data in loaded.items():
+        texts = {text for tr in data.values()
+                 for key in ("preparedRemarks", "qanda") for text in _section_texts(tr.get(key, []))}
+        try:
+            results[ticker] = extract_all_signals(ticker, data, None, incremental, areas.get(ticker),
+                                                  {text: scored_all[text] for text in texts})
+        except Exception as e:
+            errors[ticker] = str(e)
+
+    return {
+        "signals": results,
+        "cross_section": cross_section_table(results),
+        "errors": errors,
+    }
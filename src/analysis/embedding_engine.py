@@ -0,0 +1,67 @@
+from typing import List
+
+import torch
+
+from utils.metrics import span
+from .sentiment_engine import SentimentEngine
+
+
+class EmbeddingEngine(SentimentEngine):
+    """
+    Batched sentence-embedding runner for an encoder (AutoModel) checkpoint.
+    Texts are windowed and length-bucketed exactly as SentimentEngine does;
+    each window is mean-pooled over its tokens, window vectors are averaged
+    (weighted by window length) into one vector per text, and the result
+    is L2-normalized so dot products are cosine similarities.
+    """
+
+    def __init__(self, model, tokenizer, **kwargs):
+        super().__init__(model, tokenizer, **kwargs)
+        self.dim = model.config.hidden_size
+
+    def embed(self, texts: List[str]):
+        """
+        Returns a float32 array of shape (len(texts), dim), in input order.
+        """
+        import numpy as np
+
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        with span("embedding_tokenize", items=len(texts)):
+            encoded = self.tokenizer(list(texts), add_special_tokens=False, truncation=False, verbose=False)["input_ids"]
+
+        windows: List[List[int]] = []
+        owners: List[int] = []
+        for text_index, ids in enumerate(encoded):
+            for window in self._windows(ids):
+                windows.append(self.prefix + window + self.suffix)
+                owners.append(text_index)
+
+        order = sorted(((i, len(w)) for i, w in enumerate(windows)), key=lambda x: x[1])
+        pooled = torch.zeros((len(windows), self.dim))
+        pad_id = self.tokenizer.pad_token_id or 0
+        with span("embedding_inference", items=len(windows)), torch.inference_mode():
+            for batch in self._batches(order):
+                longest = max(len(windows[i]) for i in batch)
+                input_ids = torch.full((len(batch), longest), pad_id, dtype=torch.long)
+                attention_mask = torch.zeros((len(batch), longest), dtype=torch.long)
+                for row, i in enumerate(batch):
+                    ids = windows[i]
+                    input_ids[row, :len(ids)] = torch.tensor(ids, dtype=torch.long)
+                    attention_mask[row, :len(ids)] = 1
+                hidden = self.model(input_ids=input_ids, attention_mask=attention_mask).last_hidden_state.float()
+                mask = attention_mask.unsqueeze(-1).float()
+                pooled[batch] = (hidden * mask).sum(1) / mask.sum(1).clamp(min=1)
+                self.stats["batches"] += 1
+                self.stats["padded_tokens"] += longest * len(batch)
+
+        # aggregate windows back to texts, weighting each window by its length
+        lengths = torch.tensor([len(w) for w in windows], dtype=torch.float32)
+        totals = torch.zeros((len(texts), self.dim))
+        totals.index_add_(0, torch.tensor(owners), pooled * lengths.unsqueeze(1))
+        totals = torch.nn.functional.normalize(totals, dim=1)
+
+        self.stats["texts"] += len(texts)
+        self.stats["windows"] += len(windows)
+        self.stats["tokens"] += int(lengths.sum())
+        return totals.numpy().astype(np.float32, copy=False)
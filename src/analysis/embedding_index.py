@@ -0,0 +1,379 @@
+"""
+Semantic theme tracking over every stored transcript: each speaker turn
+is embedded once with a small local sentence-embedding model, cached in
+an EmbeddingStore keyed by text hash, and searched with a brute-force
+NumPy index (one matrix product per query).
+
+  - themes(ticker): per quarter, the strategic areas the turns are closest
+    to (cosine similarity to one prototype vector per taxonomy area), so
+    paraphrases count even without a literal keyword hit
+  - similar(text): the stored turns most similar to `text` across tickers
+    and quarters
+
+Only turns whose text was never embedded under the current model revision
+go through the model; moving, re-fetching or re-reading a transcript
+reuses the stored rows. Requests only index turns already in the store;
+transcripts are embedded in bulk by this module's CLI:
+
+    cd src && python -m analysis.embedding_index
+"""
+import os
+import logging
+import argparse
+import threading
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+
+from utils.metrics import span
+from transcript.transcript_loader import _read_transcript
+from transcript.transcript_store import SECTIONS, _FILENAME
+from transcript.search_index import _bound
+from .embedding_store import EmbeddingStore
+from .model_registry import registry, resolve_revision, register_revision
+from .sentiment_cache import text_hash
+from .taxonomy import get_taxonomy, taxonomy_fingerprint
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.path.abspath(os.getenv("EARNINGS_DATA_DIR", os.path.join(os.path.dirname(__file__), "..", "data")))
+# 1. Sentence-embedding model (mean-pooled encoder), built lazily by the model registry
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+# branch, tag or commit; stored embeddings are keyed by the commit it resolves to
+EMBEDDING_REVISION = os.getenv("EMBEDDING_MODEL_REVISION", "main")
+# the MiniLM family is trained on 256-token inputs; longer turns are windowed
+EMBEDDING_MAX_TOKENS = int(os.getenv("EMBEDDING_MAX_TOKENS", "256"))
+# float16 halves the store; similarities change by well under 1e-3
+EMBEDDING_DTYPE = os.getenv("EMBEDDING_DTYPE", "float16")
+# texts embedded per model call; each batch is persisted before the next
+EMBEDDING_BATCH = int(os.getenv("EMBEDDING_BATCH", "256"))
+# turns shorter than this ("Thank you.", operator hand-offs) are not indexed
+MIN_WORDS = int(os.getenv("EMBEDDING_MIN_WORDS", "8"))
+# a turn counts toward its closest area only at or above this similarity
+THEME_MIN_SIMILARITY = float(os.getenv("THEME_MIN_SIMILARITY", "0.25"))
+# characters of turn text returned with each passage
+PASSAGE_CHARS = int(os.getenv("EMBEDDING_PASSAGE_CHARS", "300"))
+
+
+def _load_embedding_engine():
+    from transformers import AutoModel, AutoTokenizer
+    from .embedding_engine import EmbeddingEngine
+
+    revision = resolve_revision(EMBEDDING_MODEL, EMBEDDING_REVISION)
+    tokenizer = AutoTokenizer.from_pretrained(EMBEDDING_MODEL, revision=revision)
+    model = AutoModel.from_pretrained(EMBEDDING_MODEL, revision=revision).eval()
+    return EmbeddingEngine(model, tokenizer, max_length=EMBEDDING_MAX_TOKENS)
+
+registry.register("embedding_engine", _load_embedding_engine)
+register_revision(EMBEDDING_MODEL, EMBEDDING_REVISION)
+
+def get_embedding_engine():
+    return registry.get("embedding_engine")
+
+_store: Optional[EmbeddingStore] = None
+_store_lock = threading.Lock()
+
+
+def get_embedding_store() -> EmbeddingStore:
+    """
+    The EmbeddingStore for EMBEDDING_MODEL at the commit EMBEDDING_REVISION
+    resolves to, opened on first use (and reopened under the commit once a
+    revision that could not be resolved at first does).
+    """
+    global _store
+    revision = resolve_revision(EMBEDDING_MODEL, EMBEDDING_REVISION)
+    if _store is None or _store.revision != revision:
+        with _store_lock:
+            if _store is None or _store.revision != revision:
+                _store = EmbeddingStore(os.path.join(DATA_DIR, "embeddings"), EMBEDDING_MODEL,
+                                        revision, EMBEDDING_DTYPE)
+    return _store
+
+
+def embedding_rows(texts: List[str], store: EmbeddingStore = None) -> List[int]:
+    """
+    Store rows for `texts`, embedding only the texts not stored yet.
+    """
+    store = store or get_embedding_store()
+    hashes = [text_hash(t) for t in texts]
+    with span("embedding_cache", items=len(texts)):
+        rows = store.lookup(hashes)
+    missing = list({h: t for h, t in zip(hashes, texts) if h not in rows}.items())
+    for start in range(0, len(missing), EMBEDDING_BATCH):
+        batch = missing[start:start + EMBEDDING_BATCH]
+        vectors = get_embedding_engine().embed([t for _, t in batch])
+        with span("embedding_cache", items=len(batch)):
+            rows.update(store.add([h for h, _ in batch], vectors))
+    return [rows[h] for h in hashes]
+
+
+def _snippet(text: str) -> str:
+    return text if len(text) <= PASSAGE_CHARS else text[:PASSAGE_CHARS].rstrip() + "…"
+
+
+class PassageIndex:
+    """
+    The indexed turns of every transcript file in `directory`, with their
+    embeddings gathered into one float32 matrix. `sync` picks up new,
+    changed and deleted files by size and mtime; the matrix is rebuilt
+    from the store (no model calls) only after a change.
+    """
+
+    def __init__(self, directory: str, store: EmbeddingStore = None):
+        self.directory = directory
+        self.store = store or get_embedding_store()
+        # path -> ((size, mtime), ticker, quarter, date, [(section, turn, speaker, words, row)])
+        self._files: Dict[str, Tuple] = {}
+        # path -> ((size, mtime), store size) of files left out for turns not embedded yet
+        self._pending: Dict[str, Tuple] = {}
+        self._columns: Optional[Dict[str, Any]] = None
+        self._prototypes: Dict[str, Tuple[List[str], Any]] = {}
+        self._lock = threading.Lock()
+
+    def _passages(self, transcript: Dict[str, Any], embed: bool) -> Optional[List[Tuple]]:
+        turns, texts = [], []
+        for section, key in enumerate(SECTIONS):
+            for turn, entry in enumerate(transcript.get(key) or []):
+                text = entry.get("text", "")
+                words = len(text.split())
+                if words >= MIN_WORDS:
+                    turns.append((section, turn, entry.get("speaker", ""), words))
+                    texts.append(text)
+        if embed:
+            rows = embedding_rows(texts, self.store)
+        else:
+            hashes = [text_hash(t) for t in texts]
+            found = self.store.lookup(hashes)
+            if len(found) < len(set(hashes)):
+                return None
+            rows = [found[h] for h in hashes]
+        return [(*t, row) for t, row in zip(turns, rows)]
+
+    def sync(self, embed: bool = True) -> int:
+        """
+        Indexes new or changed transcript files and drops deleted ones.
+        With `embed` false, files with turns not in the store yet are left
+        out (and only looked at again once they or the store change)
+        instead of running the model. Returns files (re)indexed.
+        """
+        with self._lock:
+            on_disk = {}
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    match = _FILENAME.match(entry.name)
+                    if match:
+                        st = entry.stat()
+                        on_disk[entry.path] = ((st.st_size, st.st_mtime_ns), match["ticker"], match["quarter"])
+            changed = [p for p, (stamp, _, _) in on_disk.items() if self._files.get(p, (None,))[0] != stamp]
+            gone = set(self._files) - set(on_disk)
+            for path in gone:
+                del self._files[path]
+            for path in set(self._pending) - set(on_disk):
+                del self._pending[path]
+            if gone:
+                self._columns = None
+
+        # embedding runs outside the lock, so queries keep being served
+        indexed, pending = {}, {}
+        for path in changed:
+            stamp, ticker, quarter = on_disk[path]
+            check = (stamp, len(self.store))
+            if not embed and self._pending.get(path) == check:
+                continue
+            # a file deleted mid-sync is skipped; one that does not parse
+            # waits, like a pending one, until it or the store changes
+            try:
+                transcript = _read_transcript(path)
+            except FileNotFoundError:
+                continue
+            except ValueError as e:
+                logger.warning("skipping %s in passage index sync: %s", path, e)
+                pending[path] = check
+                continue
+            passages = self._passages(transcript, embed)
+            if passages is None:
+                pending[path] = check
+            else:
+                indexed[path] = (stamp, ticker, quarter, transcript.get("date"), passages)
+
+        with self._lock:
+            self._files.update(indexed)
+            self._pending.update(pending)
+            for path in indexed:
+                self._pending.pop(path, None)
+            if indexed:
+                self._columns = None
+        return len(indexed)
+
+    def _get_columns(self) -> Dict[str, Any]:
+        import numpy as np
+
+        with self._lock:
+            if self._columns is None:
+                rows, meta = [], []
+                for path, (_, ticker, quarter, date, passages) in sorted(self._files.items()):
+                    for section, turn, speaker, words, row in passages:
+                        rows.append(row)
+                        meta.append((path, ticker, quarter, date or "", section, turn, speaker, words))
+                columns = dict(zip(("path", "ticker", "quarter", "date", "section", "turn", "speaker", "words"),
+                                   (np.array(c, dtype=object) for c in zip(*meta)))) if meta else {}
+                for name in ("ticker", "quarter", "date"):
+                    if name in columns:
+                        columns[name] = columns[name].astype(str)
+                columns["matrix"] = self.store.vectors(rows)
+                self._columns = columns
+            return self._columns
+
+    def _passage(self, columns: Dict[str, Any], i: int, similarity: float) -> Dict[str, Any]:
+        section = SECTIONS[columns["section"][i]]
+        turn = int(columns["turn"][i])
+        try:
+            text = _read_transcript(columns["path"][i])[section][turn]["text"]
+        except (FileNotFoundError, ValueError, IndexError, KeyError):
+            text = ""
+        return {"ticker": str(columns["ticker"][i]), "quarter": str(columns["quarter"][i]),
+                "date": str(columns["date"][i]) or None, "section": section, "turn": turn,
+                "speaker": columns["speaker"][i], "similarity": round(float(similarity), 4),
+                "text": _snippet(text)}
+
+    def similar(self, text: str, tickers: Iterable[str] = None, start: str = None, end: str = None,
+                limit: int = 10) -> Dict[str, Any]:
+        """
+        The `limit` stored turns most similar to `text` (cosine similarity,
+        highest first), optionally restricted to `tickers` and to quarters
+        or call dates from `start` to `end` (inclusive).
+        """
+        import numpy as np
+
+        if not text.strip():
+            raise ValueError("text to compare against is empty")
+        bounds = [_bound(start, "start"), _bound(end, "end")]
+        columns = self._get_columns()
+        result = {"query": text, "model": self.store.model, "passages": []}
+        if "ticker" not in columns:
+            return result
+        with span("embedding_search", items=len(columns["matrix"])):
+            mask = np.ones(len(columns["matrix"]), dtype=bool)
+            if tickers:
+                mask &= np.isin(columns["ticker"], [t.upper() for t in tickers])
+            for (column, value), keep in zip(bounds, (np.greater_equal, np.less_equal)):
+                if column:
+                    mask &= keep(columns[column], value) & (columns[column] != "")
+            candidates = np.flatnonzero(mask)
+            query = get_embedding_engine().embed([text])[0]
+            matrix = columns["matrix"] if len(candidates) == len(mask) else columns["matrix"][candidates]
+            scores = matrix @ query
+            k = min(limit, len(candidates))
+            top = np.argpartition(-scores, k - 1)[:k] if k else np.zeros(0, dtype=np.int64)
+            top = top[np.argsort(-scores[top], kind="stable")]
+        result["passages"] = [self._passage(columns, candidates[i], scores[i]) for i in top]
+        return result
+
+    def _area_prototypes(self, areas: Dict[str, List[str]]):
+        # one unit vector per area: the mean of its name's and keywords' embeddings
+        import numpy as np
+
+        key = taxonomy_fingerprint(areas)
+        if key not in self._prototypes:
+            names = list(areas)
+            texts = [t for name in names for t in [name, *areas[name]]]
+            vectors = self.store.vectors(embedding_rows(texts, self.store))
+            starts = np.cumsum([0] + [1 + len(areas[name]) for name in names[:-1]])
+            sums = np.add.reduceat(vectors, starts, axis=0)
+            self._prototypes[key] = (names, sums / np.linalg.norm(sums, axis=1, keepdims=True).clip(1e-12))
+        return self._prototypes[key]
+
+    def themes(self, ticker: str, quarters: Iterable[str] = None, top: int = 5,
+               min_similarity: float = THEME_MIN_SIMILARITY) -> Dict[str, Any]:
+        """
+        Per quarter (newest first), the `top` taxonomy areas by share of
+        spoken words: each turn is assigned to its most similar area when
+        the similarity is at least `min_similarity`. Each theme carries its
+        share, turn count, mean similarity and the closest turn.
+        """
+        import numpy as np
+
+        ticker = ticker.upper()
+        names, prototypes = self._area_prototypes(get_taxonomy(ticker))
+        columns = self._get_columns()
+        result = {"ticker": ticker, "model": self.store.model, "min_similarity": min_similarity, "quarters": {}}
+        if "ticker" not in columns:
+            return result
+        mask = columns["ticker"] == ticker
+        if quarters is not None:
+            mask &= np.isin(columns["quarter"], list(quarters))
+        idx = np.flatnonzero(mask)
+        if not len(idx):
+            return result
+
+        with span("themes", items=len(idx)):
+            sims = columns["matrix"][idx] @ prototypes.T
+            best = sims.argmax(axis=1)
+            best_sim = sims[np.arange(len(idx)), best]
+            assigned = best_sim >= min_similarity
+            quarter_names, quarter_of = np.unique(columns["quarter"][idx], return_inverse=True)
+            words = columns["words"][idx].astype(np.float64)
+            cells = len(quarter_names) * len(names)
+            cell = quarter_of * len(names) + best
+            spoken = np.bincount(quarter_of, weights=words, minlength=len(quarter_names))
+            share = (np.bincount(cell[assigned], weights=words[assigned], minlength=cells)
+                     .reshape(len(quarter_names), len(names)) / spoken[:, None])
+            turns = np.bincount(cell[assigned], minlength=cells).reshape(share.shape)
+            mean_sim = (np.bincount(cell[assigned], weights=best_sim[assigned], minlength=cells)
+                        .reshape(share.shape) / np.maximum(turns, 1))
+            # closest turn per (quarter, area): first of each cell after sorting by similarity
+            order = np.flatnonzero(assigned)
+            order = order[np.lexsort((-best_sim[order], cell[order]))]
+            first_cells, first = np.unique(cell[order], return_index=True)
+            example = dict(zip(first_cells.tolist(), order[first].tolist()))
+
+        for q in np.argsort(quarter_names)[::-1]:
+            ranked = [a for a in np.argsort(-share[q], kind="stable")[:top] if turns[q, a]]
+            result["quarters"][str(quarter_names[q])] = {
+                "date": str(columns["date"][idx[np.argmax(quarter_of == q)]]) or None,
+                "turns": int(np.count_nonzero(quarter_of == q)),
+                "themes": [{
+                    "area": names[a],
+                    "share": round(float(share[q, a]), 4),
+                    "turns": int(turns[q, a]),
+                    "similarity": round(float(mean_sim[q, a]), 4),
+                    "example": self._passage(columns, idx[example[q * len(names) + a]],
+                                             best_sim[example[q * len(names) + a]]),
+                } for a in ranked],
+            }
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"transcripts": len(self._files),
+                    "passages": sum(len(f[4]) for f in self._files.values()),
+                    "pending": len(self._pending)}
+
+
+_index: Optional[PassageIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_passage_index() -> PassageIndex:
+    """
+    The PassageIndex over DATA_DIR, synced with the transcript files on
+    every call (a directory scan when nothing changed). Only transcripts
+    whose turns are all in the embedding store are indexed here; the rest
+    wait for the CLI below (or any `sync()` with embedding) to embed them.
+    """
+    global _index
+    store = get_embedding_store()
+    if _index is None or _index.store is not store:
+        with _index_lock:
+            if _index is None or _index.store is not store:
+                _index = PassageIndex(DATA_DIR, store)
+    _index.sync(embed=False)
+    return _index
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Embed stored transcripts for /similar and /themes.")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    args = parser.parse_args()
+    index = PassageIndex(args.data_dir)
+    print(f"{index.sync()} transcript(s) embedded")
+    print(index.get_stats())
+    print(index.store.get_stats())
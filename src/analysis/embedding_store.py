@@ -0,0 +1,176 @@
+import os
+import re
+import json
+import fcntl
+import threading
+import contextlib
+from typing import Dict, Any, Iterable, List, Optional
+
+from utils.fileio import atomic_write_text
+
+DTYPES = ("float16", "float32")
+# bytes per key: a SHA-256 text hash (see sentiment_cache.text_hash)
+KEY_BYTES = 32
+
+
+class EmbeddingStore:
+    """
+    Append-only on-disk cache of text embeddings for one model revision:
+    a raw row-major matrix file ({model}-{revision}.{dtype}), memory-mapped
+    for reads, plus a parallel file of text hashes giving each row's key.
+    Rows are only ever appended, so an embedded text keeps its row and is
+    never recomputed. Vectors are written before their keys, so a row
+    counts once its key is complete; on open, rows without a key (or keys
+    without a full row) from an interrupted write are truncated away.
+    Several processes may share a store: appends and that truncation hold
+    an exclusive flock on {model}-{revision}.lock, and rows appended by
+    other processes are picked up on the next lookup or add.
+    """
+
+    def __init__(self, directory: str, model: str, revision: str, dtype: str = "float16"):
+        if dtype not in DTYPES:
+            raise ValueError(f"Unknown embedding dtype {dtype!r}; expected one of {', '.join(DTYPES)}")
+        os.makedirs(directory, exist_ok=True)
+        safe = re.sub(r"[^A-Za-z0-9_.-]+", "_", f"{model}-{revision}")
+        self.model = model
+        self.revision = revision
+        self.dtype = dtype
+        self.itemsize = 2 if dtype == "float16" else 4
+        self.matrix_path = os.path.join(directory, f"{safe}.{dtype}")
+        self.keys_path = os.path.join(directory, f"{safe}.keys")
+        self.meta_path = os.path.join(directory, f"{safe}.json")
+        self.lock_path = os.path.join(directory, f"{safe}.lock")
+        self.dim: Optional[int] = None
+        self._rows: Dict[str, int] = {}
+        # rows in the files; a duplicated key keeps its first row, so this can exceed len(_rows)
+        self._count = 0
+        self._map = None
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "writes": 0}
+        with self._file_lock():
+            self._truncate_partial()
+        self._refresh()
+
+    @contextlib.contextmanager
+    def _file_lock(self):
+        with open(self.lock_path, "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _complete_rows(self) -> int:
+        # rows with both a full vector and a full key
+        keys_bytes = os.path.getsize(self.keys_path) if os.path.exists(self.keys_path) else 0
+        matrix_bytes = os.path.getsize(self.matrix_path) if os.path.exists(self.matrix_path) else 0
+        return min(keys_bytes // KEY_BYTES, matrix_bytes // (self.dim * self.itemsize))
+
+    def _read_dim(self) -> bool:
+        if self.dim is None:
+            try:
+                with open(self.meta_path, "r", encoding="utf-8") as f:
+                    self.dim = json.load(f)["dim"]
+            except FileNotFoundError:
+                return False
+        return True
+
+    def _truncate_partial(self) -> None:
+        # caller holds the file lock, so no other process is mid-append
+        if not self._read_dim():
+            return
+        count = self._complete_rows()
+        for path, size in ((self.keys_path, count * KEY_BYTES), (self.matrix_path, count * self.dim * self.itemsize)):
+            if os.path.exists(path) and os.path.getsize(path) != size:
+                with open(path, "r+b") as f:
+                    f.truncate(size)
+
+    def _refresh(self) -> None:
+        # adopts rows appended (by any process) since the last refresh
+        if not self._read_dim():
+            return
+        count = self._complete_rows()
+        if count <= self._count:
+            return
+        with open(self.keys_path, "rb") as f:
+            f.seek(self._count * KEY_BYTES)
+            keys = f.read((count - self._count) * KEY_BYTES)
+        for i in range(0, len(keys), KEY_BYTES):
+            self._rows.setdefault(keys[i:i + KEY_BYTES].hex(), self._count + i // KEY_BYTES)
+        self._count = count
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._rows)
+
+    def lookup(self, hashes: Iterable[str]) -> Dict[str, int]:
+        """
+        Returns {text hash: row} for the hashes already stored.
+        """
+        hashes = set(hashes)
+        with self._lock:
+            self._refresh()
+            found = {h: self._rows[h] for h in hashes if h in self._rows}
+            self.stats["hits"] += len(found)
+            self.stats["misses"] += len(hashes) - len(found)
+        return found
+
+    def add(self, hashes: List[str], vectors) -> Dict[str, int]:
+        """
+        Appends `vectors` (one row per hash) for hashes not stored yet and
+        returns {text hash: row} for all of `hashes`.
+        """
+        import numpy as np
+
+        vectors = np.asarray(vectors)
+        with self._lock, self._file_lock():
+            self._refresh()
+            if self.dim is None:
+                self.dim = int(vectors.shape[1])
+                atomic_write_text(self.meta_path, json.dumps({"model": self.model, "revision": self.revision,
+                                                              "dtype": self.dtype, "dim": self.dim}))
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"expected {self.dim}-dimensional embeddings, got {vectors.shape[1]}")
+            fresh: Dict[str, int] = {}
+            for i, h in enumerate(hashes):
+                if h not in self._rows and h not in fresh:
+                    fresh[h] = i
+            if fresh:
+                with open(self.matrix_path, "ab") as f:
+                    f.write(vectors[list(fresh.values())].astype(self.dtype).tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+                with open(self.keys_path, "ab") as f:
+                    f.write(b"".join(bytes.fromhex(h) for h in fresh))
+                for h in fresh:
+                    self._rows[h] = self._count
+                    self._count += 1
+                self.stats["writes"] += len(fresh)
+            return {h: self._rows[h] for h in hashes}
+
+    def vectors(self, rows: List[int]):
+        """
+        float32 copy of the given rows, read through a memory map of the
+        matrix file (remapped when rows were appended since).
+        """
+        import numpy as np
+
+        if not len(rows):
+            return np.zeros((0, self.dim or 0), dtype=np.float32)
+        with self._lock:
+            count = self._count
+            if self._map is None or len(self._map) < count:
+                self._map = np.memmap(self.matrix_path, dtype=self.dtype, mode="r", shape=(count, self.dim))
+            matrix = self._map
+        return np.asarray(matrix[np.asarray(rows, dtype=np.int64)], dtype=np.float32)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats["entries"] = len(self._rows)
+        stats.update(dim=self.dim, dtype=self.dtype,
+                     bytes=os.path.getsize(self.matrix_path) if os.path.exists(self.matrix_path) else 0)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
@@ -0,0 +1,152 @@
+import os
+import re
+import types
+import importlib.util
+from typing import Any, Callable, Tuple
+
+DATA_DIR = os.path.abspath(os.getenv("EARNINGS_DATA_DIR", os.path.join(os.path.dirname(__file__), "..", "data")))
+
+# fp32 (PyTorch as loaded), int8 (dynamically quantized PyTorch) or onnx
+# (exported graph run by onnxruntime, which must be installed)
+BACKENDS = ("fp32", "int8", "onnx")
+SENTIMENT_BACKEND = os.getenv("SENTIMENT_BACKEND", "fp32").lower()
+# exported graphs, one per model and revision
+ONNX_DIR = os.getenv("SENTIMENT_ONNX_DIR", os.path.join(DATA_DIR, "onnx"))
+# onnxruntime intra-op threads; 0 lets onnxruntime use one per physical core
+ONNX_INTRA_OP_THREADS = int(os.getenv("ONNX_INTRA_OP_THREADS", "0"))
+ONNX_OPSET = 17
+
+
+def cache_revision(revision: str, backend: str = SENTIMENT_BACKEND) -> str:
+    """
+    Revision under which a backend's results are cached: fp32 keeps the
+    plain revision, others get a suffix since their scores differ slightly.
+    """
+    return revision if backend == "fp32" else f"{revision}+{backend}"
+
+
+def onnx_path(model_name: str, revision: str) -> str:
+    safe = re.sub(r"[^A-Za-z0-9_.-]+", "_", f"{model_name}-{revision}")
+    return os.path.join(ONNX_DIR, f"{safe}.onnx")
+
+
+def _logits_module(model):
+    """
+    Wraps a Hugging Face classifier so export sees a plain
+    (input_ids, attention_mask) -> logits graph.
+    """
+    import torch
+
+    class LogitsOnly(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.model = model
+
+        def forward(self, input_ids, attention_mask):
+            return self.model(input_ids=input_ids, attention_mask=attention_mask).logits
+
+    return LogitsOnly().eval()
+
+
+def export_onnx(model, path: str) -> str:
+    """
+    Exports `model` to `path` with dynamic batch and sequence axes.
+    """
+    import torch
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    dummy = torch.ones((2, 16), dtype=torch.long)
+    tmp = f"{path}.tmp"
+    with torch.inference_mode():
+        torch.onnx.export(
+            _logits_module(model), (dummy, dummy), tmp,
+            input_names=["input_ids", "attention_mask"],
+            output_names=["logits"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "logits": {0: "batch"},
+            },
+            opset_version=ONNX_OPSET,
+            dynamo=False,
+        )
+    os.replace(tmp, path)
+    return path
+
+
+class OnnxSequenceClassifier:
+    """
+    onnxruntime session with the calling convention SentimentEngine uses
+    for PyTorch models: model(input_ids=..., attention_mask=...).logits,
+    plus the model's `config` for its label names.
+    """
+
+    def __init__(self, path: str, config, intra_op_threads: int = ONNX_INTRA_OP_THREADS):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.intra_op_num_threads = intra_op_threads
+        options.inter_op_num_threads = 1
+        self.session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+        self.config = config
+
+    def __call__(self, input_ids, attention_mask):
+        import torch
+
+        (logits,) = self.session.run(["logits"], {
+            "input_ids": input_ids.numpy(),
+            "attention_mask": attention_mask.numpy(),
+        })
+        return types.SimpleNamespace(logits=torch.from_numpy(logits))
+
+
+def _require(modules: Tuple[str, ...], backend: str) -> None:
+    # fail before loading anything when an optional backend is not installed
+    missing = [m for m in modules if importlib.util.find_spec(m) is None]
+    if missing:
+        raise RuntimeError(f"SENTIMENT_BACKEND={backend} needs {' and '.join(missing)}; "
+                           f"install with: pip install {' '.join(missing)}")
+
+
+def _load_standalone(model_name: str, revision: str) -> Tuple[Any, Any]:
+    # a private fp32 copy for int8 / onnx export, never shared or registered,
+    # so it is freed once converted
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    model = AutoModelForSequenceClassification.from_pretrained(model_name, revision=revision).eval()
+    return model, AutoTokenizer.from_pretrained(model_name, revision=revision)
+
+
+def load_sentiment_model(model_name: str, revision: str,
+                         load_fp32: Callable[[], Tuple[Any, Any]],
+                         backend: str = SENTIMENT_BACKEND) -> Tuple[Any, Any]:
+    """
+    Returns (model, tokenizer) for `backend`. `load_fp32` supplies the
+    (possibly shared) PyTorch model and tokenizer and is only called for
+    fp32; int8 quantizes its own fp32 load in place and onnx loads one only
+    to export the graph the first time, so neither keeps an fp32 model.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown SENTIMENT_BACKEND {backend!r}; expected one of {', '.join(BACKENDS)}")
+    if backend == "fp32":
+        return load_fp32()
+    if backend == "int8":
+        import torch
+
+        model, tokenizer = _load_standalone(model_name, revision)
+        return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8,
+                                                      inplace=True), tokenizer
+
+    from transformers import AutoConfig, AutoTokenizer
+
+    path = onnx_path(model_name, revision)
+    _require(("onnxruntime",) if os.path.exists(path) else ("onnxruntime", "onnx"), backend)
+    if not os.path.exists(path):
+        model, tokenizer = _load_standalone(model_name, revision)
+        export_onnx(model, path)
+        return OnnxSequenceClassifier(path, model.config), tokenizer
+    config = AutoConfig.from_pretrained(model_name, revision=revision)
+    tokenizer = AutoTokenizer.from_pretrained(model_name, revision=revision)
+    return OnnxSequenceClassifier(path, config), tokenizer
@@ -0,0 +1,149 @@
+import os
+import sys
+from bisect import bisect_right
+from collections import deque
+from typing import Dict, List, Iterable, Tuple
+
+from utils.lru import ByteLRU
+
+SUBSTRING = "substring"
+WORD = "word"
+
+# compiled matchers kept for reuse, bounded by their approximate size;
+# per-request taxonomy overrides would otherwise accumulate without limit
+MATCHER_CACHE_MAX_BYTES = int(os.getenv("KEYWORD_MATCHER_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over a fixed keyword list.
+    Built once per taxonomy; a scan over a text reports every keyword
+    occurrence in one pass, regardless of how many keywords there are.
+    """
+
+    def __init__(self, keywords: Iterable[str], mode: str = SUBSTRING):
+        if mode not in (SUBSTRING, WORD):
+            raise ValueError(f"unknown match mode {mode!r}")
+        self.mode = mode
+        self.keywords: List[str] = list(dict.fromkeys(k for k in keywords if k))
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+        for index, keyword in enumerate(self.keywords):
+            self._add(keyword, index)
+        self._build_links()
+
+    def _add(self, keyword: str, index: int) -> None:
+        state = 0
+        for ch in keyword:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = nxt
+        self._out[state] = self._out[state] + (index,)
+
+    def _build_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def approx_bytes(self) -> int:
+        """
+        Rough in-memory size of the automaton, for cache accounting.
+        """
+        size = sum(sys.getsizeof(x) for x in (self._goto, self._fail, self._out, self.keywords))
+        size += sum(sys.getsizeof(d) for d in self._goto) + sum(sys.getsizeof(o) for o in self._out)
+        return size + sum(sys.getsizeof(k) for k in self.keywords)
+
+    def iter_matches(self, text: str):
+        """
+        Yields (start, end, keyword_index) for every occurrence in `text`.
+        """
+        goto, fail, out, keywords = self._goto, self._fail, self._out, self.keywords
+        state = 0
+        for pos, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for index in out[state]:
+                yield pos + 1 - len(keywords[index]), pos + 1, index
+
+    def contains_any(self, text: str) -> bool:
+        """
+        True if any keyword occurs in `text` (substring semantics).
+        """
+        return next(self.iter_matches(text), None) is not None
+
+    def count_ngram_hits(self, tokens: List[str], max_n: int = 3) -> Dict[str, int]:
+        """
+        For each keyword, the number of 1..max_n-grams of `tokens` (joined
+        with spaces) that contain it, i.e. the same figure as
+        sum(1 for ngram in all_ngrams if keyword in ngram)
+        but computed from a single scan of the token stream.
+        In WORD mode an occurrence must also start and end on token
+        boundaries ("ai" no longer matches inside "training").
+        """
+        counts = {keyword: 0 for keyword in self.keywords}
+        if not tokens:
+            return counts
+        text = " ".join(tokens)
+        starts: List[int] = []
+        offset = 0
+        for token in tokens:
+            starts.append(offset)
+            offset += len(token) + 1
+        ends = [start + len(token) for start, token in zip(starts, tokens)]
+        num_tokens = len(tokens)
+
+        # token span [first, last] of each occurrence, grouped per keyword;
+        # occurrences of one keyword arrive in increasing position order
+        spans: Dict[int, List[Tuple[int, int]]] = {}
+        for start, end, index in self.iter_matches(text):
+            first = bisect_right(starts, start) - 1
+            last = bisect_right(starts, end - 1) - 1
+            if self.mode == WORD and (starts[first] != start or ends[last] != end):
+                continue
+            spans.setdefault(index, []).append((first, last))
+
+        for index, occurrences in spans.items():
+            total = 0
+            for n in range(1, max_n + 1):
+                # n-grams starting at s..s+n-1 contain an occurrence [first, last]
+                # iff last - n + 1 <= s <= first; merge those intervals
+                covered_until = -1
+                for first, last in occurrences:
+                    lo = max(last - n + 1, covered_until + 1, 0)
+                    hi = min(first, num_tokens - n)
+                    if hi >= lo:
+                        total += hi - lo + 1
+                        covered_until = hi
+            counts[self.keywords[index]] = total
+        return counts
+
+
+_compiled = ByteLRU(MATCHER_CACHE_MAX_BYTES)
+
+
+def get_matcher(areas: Dict[str, List[str]], mode: str = SUBSTRING) -> KeywordMatcher:
+    """
+    The compiled matcher for a taxonomy {area: [keywords]}, built on first
+    use and reused while the taxonomy is unchanged and still cached.
+    """
+    key = (mode, tuple((area, tuple(keywords)) for area, keywords in areas.items()))
+    matcher = _compiled.get(key)
+    if matcher is None:
+        matcher = KeywordMatcher((k for keywords in areas.values() for k in keywords), mode)
+        _compiled.put(key, matcher, matcher.approx_bytes())
+    return matcher
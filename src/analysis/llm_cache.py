@@ -0,0 +1,132 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Dict, Any, Optional
+
+# size bound for the on-disk cache; least recently used rows are evicted,
+# unpinned rows first
+MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "50000"))
+# unpinned answers older than this are refetched; pinned ones never expire
+TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+
+
+def prompt_hash(text: str) -> str:
+    """
+    SHA-256 of the text substituted into the prompt template.
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """
+    Persistent SQLite cache of LLM answers keyed by (model, prompt template
+    version, text hash). Each row remembers the estimated tokens and the
+    seconds the original call took, so hits can report what they saved.
+    Pinned rows (e.g. finalized quarters) ignore the TTL.
+    """
+
+    def __init__(self, path: str, max_entries: int = MAX_ENTRIES, ttl: float = TTL_SECONDS):
+        self.path = path
+        self.max_entries = max_entries
+        # the row count is checked once per `evict_every` writes rather than on
+        # every write (other processes share the file, so it is not tracked here)
+        self.evict_every = max(1, max_entries // 100)
+        self._unchecked_writes = self.evict_every
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                model       TEXT NOT NULL,
+                template    TEXT NOT NULL,
+                text_hash   TEXT NOT NULL,
+                response    TEXT NOT NULL,
+                tokens      INTEGER NOT NULL,
+                seconds     REAL NOT NULL,
+                pinned      INTEGER NOT NULL,
+                created     REAL NOT NULL,
+                last_used   REAL NOT NULL,
+                PRIMARY KEY (model, template, text_hash)
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_lru ON llm_cache (pinned, last_used)")
+        self._conn.commit()
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "writes": 0, "evictions": 0,
+                      "saved_tokens": 0, "saved_seconds": 0.0}
+
+    def get(self, model: str, template: str, text: str) -> Optional[str]:
+        """
+        Returns the cached answer for `text`, or None if absent or expired.
+        """
+        key = (model, template, prompt_hash(text))
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, tokens, seconds, pinned, created FROM llm_cache "
+                "WHERE model = ? AND template = ? AND text_hash = ?",
+                key,
+            ).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            response, tokens, seconds, pinned, created = row
+            if not pinned and now - created > self.ttl:
+                self.stats["misses"] += 1
+                self.stats["expired"] += 1
+                return None
+            self._conn.execute(
+                "UPDATE llm_cache SET last_used = ? WHERE model = ? AND template = ? AND text_hash = ?",
+                (now, *key),
+            )
+            self._conn.commit()
+            self.stats["hits"] += 1
+            self.stats["saved_tokens"] += tokens
+            self.stats["saved_seconds"] += seconds
+        return response
+
+    def put(self, model: str, template: str, text: str, response: str,
+            tokens: int, seconds: float, pinned: bool = False) -> None:
+        """
+        Stores an answer and, every `evict_every` writes, evicts the least
+        recently used rows beyond `max_entries`.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache "
+                "(model, template, text_hash, response, tokens, seconds, pinned, created, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (model, template, prompt_hash(text), response, int(tokens), float(seconds), int(pinned), now, now),
+            )
+            self.stats["writes"] += 1
+            self._unchecked_writes += 1
+            if self._unchecked_writes >= self.evict_every:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        # called with the lock held
+        self._unchecked_writes = 0
+        count = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE rowid IN "
+                "(SELECT rowid FROM llm_cache ORDER BY pinned ASC, last_used ASC LIMIT ?)",
+                (excess,),
+            )
+            self.stats["evictions"] += excess
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats["entries"], stats["pinned"] = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(pinned), 0) FROM llm_cache").fetchone()
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
@@ -0,0 +1,237 @@
+"""
+Async client for OpenAI-compatible chat-completion endpoints (Together.ai
+by default), shared by the LLM signal extractors.
+
+Calls go through a per-event-loop aiohttp session, a semaphore bounding the
+number of in-flight requests, and a process-wide token bucket for the
+provider's rate limit. 429/5xx responses and connection errors are retried
+with exponential backoff (or the response's Retry-After, capped), waiting
+outside the semaphore so other calls can use the slot. Point TOGETHER_BASE_URL at a local mock server to
+run without the real API.
+"""
+import os
+import re
+import math
+import time
+import asyncio
+import weakref
+from typing import Any, Awaitable, Callable, List, Optional, Sequence, TypeVar
+
+import aiohttp
+
+from utils.rate_limit import TokenBucket
+from utils.metrics import span
+from .llm_cache import LLMCache
+
+BASE_URL = os.getenv("TOGETHER_BASE_URL", "https://api.together.xyz/v1")
+MODEL = os.getenv("TOGETHER_MODEL", "meta-llama/Llama-3.3-70B-Instruct-Turbo-Free")
+MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+RATE_LIMIT_PER_SEC = float(os.getenv("LLM_RATE_PER_SEC", "2"))
+RATE_LIMIT_BURST = float(os.getenv("LLM_RATE_BURST", "4"))
+MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", "0.5"))
+# longest Retry-After honoured; default: the longest exponential backoff
+MAX_RETRY_AFTER = float(os.getenv("LLM_MAX_RETRY_AFTER", str(BACKOFF_BASE * 2 ** MAX_RETRIES)))
+REQUEST_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))
+# prompt budget per call; longer sections are split into chunks under it
+MAX_PROMPT_TOKENS = int(os.getenv("LLM_MAX_PROMPT_TOKENS", "6000"))
+RETRY_STATUS = {429, 500, 502, 503, 504}
+# set LLM_CACHE=0 to always call the provider
+CACHE_ENABLED = os.getenv("LLM_CACHE", "1") != "0"
+
+DATA_DIR = os.path.abspath(os.getenv("EARNINGS_DATA_DIR", os.path.join(os.path.dirname(__file__), "..", "data")))
+os.makedirs(DATA_DIR, exist_ok=True)
+
+# shared by every event loop and thread in the process
+rate_limiter = TokenBucket(RATE_LIMIT_PER_SEC, RATE_LIMIT_BURST)
+# persistent answers keyed by (model, prompt template version, text hash)
+llm_cache = LLMCache(os.path.join(DATA_DIR, "llm_cache.sqlite"))
+
+T = TypeVar("T")
+
+
+class LLMError(Exception):
+    """
+    Raised when a completion request still fails after MAX_RETRIES retries.
+    """
+
+
+# --- token-aware chunking ---------------------------------------------------
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough BPE token count: words and punctuation marks, plus a third for
+    words the tokenizer splits further. Errs on the high side.
+    """
+    return math.ceil(len(_TOKEN_RE.findall(text)) * 4 / 3)
+
+
+def _split_long(text: str, max_tokens: int) -> List[str]:
+    """
+    Splits an over-budget text at sentence boundaries, hard-splitting any
+    sentence that is still too long by words.
+    """
+    parts: List[str] = []
+    raw_budget = max(1, max_tokens * 3 // 4)
+    for sentence in _SENTENCE_END.split(text):
+        if estimate_tokens(sentence) <= max_tokens:
+            parts.append(sentence)
+            continue
+        words: List[str] = []
+        used = 0
+        for word in sentence.split():
+            cost = len(_TOKEN_RE.findall(word))
+            if words and used + cost > raw_budget:
+                parts.append(" ".join(words))
+                words, used = [], 0
+            words.append(word)
+            used += cost
+        if words:
+            parts.append(" ".join(words))
+    return parts
+
+
+def chunk_texts(texts: Sequence[str], max_tokens: int = MAX_PROMPT_TOKENS) -> List[str]:
+    """
+    Packs `texts` in order into newline-joined chunks of at most
+    `max_tokens` estimated tokens; a single text over the budget is split
+    first (see _split_long).
+    """
+    chunks: List[str] = []
+    current: List[str] = []
+    used = 0
+    for text in texts:
+        pieces = [text] if estimate_tokens(text) <= max_tokens else _split_long(text, max_tokens)
+        for piece in pieces:
+            cost = estimate_tokens(piece)
+            if current and used + cost > max_tokens:
+                chunks.append("\n".join(current))
+                current, used = [], 0
+            current.append(piece)
+            used += cost
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+# --- client -----------------------------------------------------------------
+
+class _LoopState:
+    def __init__(self):
+        self.semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+        self.session: Optional[aiohttp.ClientSession] = None
+
+
+_loop_states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = weakref.WeakKeyDictionary()
+
+
+def _state() -> _LoopState:
+    # sessions and semaphores are bound to the loop that created them
+    loop = asyncio.get_running_loop()
+    state = _loop_states.get(loop)
+    if state is None:
+        state = _loop_states[loop] = _LoopState()
+    if state.session is None or state.session.closed:
+        state.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT))
+    return state
+
+
+async def close_session() -> None:
+    """
+    Closes the running loop's session (call on shutdown).
+    """
+    state = _loop_states.pop(asyncio.get_running_loop(), None)
+    if state is not None and state.session is not None:
+        await state.session.close()
+
+
+def _retry_delay(attempt: int, resp: aiohttp.ClientResponse = None) -> float:
+    if resp is not None:
+        retry_after = resp.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), MAX_RETRY_AFTER)
+    return BACKOFF_BASE * (2 ** attempt)
+
+
+async def complete(prompt: str, model: str = MODEL, **params: Any) -> str:
+    """
+    Sends one chat-completion request and returns the message content.
+    Raises LLMError once retries are exhausted.
+    """
+    state = _state()
+    body = {"model": model, "messages": [{"role": "user", "content": prompt}], **params}
+    headers = {"Authorization": f"Bearer {os.getenv('TOGETHER_API_KEY', '')}"}
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            async with state.semaphore:
+                delay = rate_limiter.reserve()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                async with state.session.post(f"{BASE_URL}/chat/completions", json=body, headers=headers) as resp:
+                    if resp.status in RETRY_STATUS and attempt < MAX_RETRIES:
+                        retry_in = _retry_delay(attempt, resp)
+                    elif resp.status >= 400:
+                        raise LLMError(f"{resp.status} from {BASE_URL}: {(await resp.text())[:200]}")
+                    else:
+                        data = await resp.json(content_type=None)
+                        return data["choices"][0]["message"]["content"]
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            if attempt == MAX_RETRIES:
+                raise LLMError(f"request to {BASE_URL} failed: {e}") from e
+            retry_in = _retry_delay(attempt)
+        # the response is released and the slot freed before waiting
+        await asyncio.sleep(retry_in)
+    raise LLMError(f"request to {BASE_URL} failed after {MAX_RETRIES} retries")
+
+
+async def complete_cached(template: str, text: str, prompt: str, pin: bool = False,
+                          refresh: bool = False, model: str = MODEL) -> str:
+    """
+    `complete(prompt)` through `llm_cache`. `template` names the prompt
+    template version and `text` is what was substituted into it, so a
+    template change misses the cache. `pin` keeps the answer past the TTL
+    (finalized quarters); `refresh` skips the lookup but stores the answer.
+    """
+    if CACHE_ENABLED and not refresh:
+        cached = llm_cache.get(model, template, text)
+        if cached is not None:
+            return cached
+    start = time.perf_counter()
+    with span("llm_request", items=1):
+        response = await complete(prompt, model)
+    if CACHE_ENABLED:
+        llm_cache.put(model, template, text, response,
+                      estimate_tokens(prompt) + estimate_tokens(response),
+                      time.perf_counter() - start, pin)
+    return response
+
+
+async def gather(*aws: Awaitable[T]) -> List[T]:
+    """
+    asyncio.gather that cancels the remaining calls as soon as one fails,
+    so a failed request does not keep spending quota.
+    """
+    tasks = [asyncio.ensure_future(a) for a in aws]
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+
+def run_sync(fn: Callable[..., Awaitable[T]], *args: Any) -> T:
+    """
+    Runs coroutine function `fn` to completion from synchronous code, on a
+    private event loop whose session is closed afterwards.
+    """
+    async def _main() -> T:
+        try:
+            return await fn(*args)
+        finally:
+            await close_session()
+    return asyncio.run(_main())
@@ -1,61 +1,166 @@
-from typing import Dict, List, Any
+from typing import AsyncIterator, Dict, List, Any, Tuple
 from collections import Counter
+import asyncio
 import os
-from together import Together
+import re
 
-# Initialize the Together client
-client = Together(api_key=os.getenv("TOGETHER_API_KEY"))
+from transcript.transcript_cache import is_finalized_quarter
+from . import llm_client
+from .model_registry import registry
+from utils.metrics import span
+
+# The Together SDK client is built on first use by the model registry (for
+# callers that pass a client around); classification goes through llm_client
+def _load_together_client():
+    from together import Together
+    return Together(api_key=os.getenv("TOGETHER_API_KEY"))
+
+registry.register("together", _load_together_client)
+
+def get_together_client():
+    return registry.get("together")
+
+LABELS = ("Positive", "Neutral", "Negative")
+_LABEL_SCORES = {"Positive": 1.0, "Neutral": 0.0, "Negative": -1.0}
+# how chunk labels of one section are combined: "majority" (token-weighted
+# vote) or "score" (token-weighted mean of +1/0/-1, thresholded at ±1/3)
+AGGREGATION = os.getenv("LLM_AGGREGATION", "majority")
+# bump when the classification prompt changes so cached answers are not reused
+CLASSIFY_TEMPLATE = "sentiment-v1"
+
+def _prompt(text: str) -> str:
+    return (
+        "Classify the sentiment of this text as Positive, Neutral, or Negative:\n\n"
+        f"\"{text}\"\n\nSentiment:"
+    )
+
+def _parse_label(out: str) -> str:
+    words = out.strip().split()
+    label = words[0].strip(".,:;*\"'").capitalize() if words else ""
+    return label if label in LABELS else "Neutral"
+
+def aggregate_labels(labels: List[str], weights: List[float] = None, method: str = None) -> str:
+    """
+    Combines per-chunk labels into one, weighting each by `weights`
+    (e.g. chunk token counts). Ties in a majority vote go to Neutral.
+    """
+    if not labels:
+        return None
+    weights = weights or [1.0] * len(labels)
+    if (method or AGGREGATION) == "score":
+        mean = sum(_LABEL_SCORES[l] * w for l, w in zip(labels, weights)) / sum(weights)
+        return "Positive" if mean > 1 / 3 else "Negative" if mean < -1 / 3 else "Neutral"
+    totals = Counter()
+    for label, weight in zip(labels, weights):
+        totals[label] += weight
+    ranked = totals.most_common()
+    if len(ranked) > 1 and ranked[0][1] == ranked[1][1]:
+        return "Neutral"
+    return ranked[0][0]
 
 # 1. Classify a single text block using Together.ai
+async def classify_text_async(text: str, pin: bool = False, refresh: bool = False) -> str:
+    """
+    Classifies `text` as Positive, Neutral, or Negative with one LLM call,
+    answered from the LLM cache when the same text was classified before.
+    """
+    return _parse_label(await llm_client.complete_cached(CLASSIFY_TEMPLATE, text, _prompt(text), pin, refresh))
+
 def classify_text_together(text: str) -> str:
     """
     Uses Together.ai to classify `text` as Positive, Neutral, or Negative.
     """
-    excerpt = text
-    prompt = (
-        "Classify the sentiment of this text as Positive, Neutral, or Negative:\n\n"
-        f"\"{excerpt}\"\n\nSentiment:"
-    )
-    resp = client.chat.completions.create(
-        model="meta-llama/Llama-3.3-70B-Instruct-Turbo-Free",
-        messages=[{"role": "user", "content": prompt}]
-    )
-    out = resp.choices[0].message.content.strip()
-    label = out.split()[0].capitalize()
-    return label if label in {"Positive", "Neutral", "Negative"} else "Neutral"
+    return llm_client.run_sync(classify_text_async, text)
+
+async def classify_section_async(texts: List[str], pin: bool = False, refresh: bool = False) -> str:
+    """
+    Classifies a whole section: splits it into chunks under the prompt
+    budget, classifies them concurrently and aggregates the labels.
+    """
+    chunks = llm_client.chunk_texts(texts)
+    if not chunks:
+        return "Neutral"
+    with span("llm_section", items=len(chunks)):
+        labels = await llm_client.gather(*(classify_text_async(c, pin, refresh) for c in chunks))
+    return aggregate_labels(labels, [llm_client.estimate_tokens(c) for c in chunks])
 
 # 2. Optional per-chunk classification (not used here)
 def section_sentiment_together(entries: List[Dict[str, str]]) -> Dict[str, Any]:
     """
     Classifies each chunk individually and returns all labels and majority.
-    (Kept for backwards compatibility.)
+    (Kept for backwards compatibility.) The calls run concurrently.
     """
     filtered = [e for e in entries if e.get("speaker", "").lower() != "operator"]
-    labels = []
-    for entry in filtered:
-        labels.append(classify_text_together(entry["text"]))
+
+    async def _classify_all() -> List[str]:
+        return await llm_client.gather(*(classify_text_async(e["text"]) for e in filtered))
+
+    labels = llm_client.run_sync(_classify_all) if filtered else []
     majority = Counter(labels).most_common(1)[0][0] if labels else None
     return {"labels": labels, "majority": majority}
 
-# 3. New: collect full section text and classify in two API calls
-def extract_together_signals(transcript: Dict[str, Any]) -> Dict[str, Any]:
+# 3. Collect full section text and classify each section in as few calls as fit the context window
+async def extract_together_signals_async(transcript: Dict[str, Any], pin: bool = False,
+                                         refresh: bool = False) -> Dict[str, Any]:
     """
-    Concatenates all Prepared Remarks and Q&A into two strings,
-    excludes any Operator entries, then makes exactly two LLM calls
-    to classify overall sentiment.
+    Classifies the Prepared Remarks and Q&A (excluding Operator entries)
+    concurrently; long sections are chunked and their labels aggregated.
+    `pin` / `refresh` are passed to the LLM cache (see complete_cached).
     """
-    # Filter out Operator entries
     prepared_entries = [e for e in transcript.get("preparedRemarks", []) if e.get("speaker", "").lower() != "operator"]
     qanda_entries   = [e for e in transcript.get("qanda", [])         if e.get("speaker", "").lower() != "operator"]
 
-    # Concatenate texts for each section
-    management_text = "\n".join(e["text"] for e in prepared_entries)
-    qa_text         = "\n".join(e["text"] for e in qanda_entries)
-
-    # Single API call per section
-    management_sentiment = classify_text_together(management_text)
-    qa_sentiment         = classify_text_together(qa_text)
+    management_sentiment, qa_sentiment = await llm_client.gather(
+        classify_section_async([e["text"] for e in prepared_entries], pin, refresh),
+        classify_section_async([e["text"] for e in qanda_entries], pin, refresh),
+    )
     return {
         "management_sentiment": management_sentiment,
         "qa_sentiment": qa_sentiment
     }
+
+def extract_together_signals(transcript: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Concatenates all Prepared Remarks and Q&A into two strings,
+    excludes any Operator entries, then classifies overall sentiment
+    (one LLM call per section unless it exceeds the prompt budget).
+    """
+    return llm_client.run_sync(extract_together_signals_async, transcript)
+
+def _is_finalized(quarter: str) -> bool:
+    match = re.fullmatch(r"(\d{4})Q([1-4])", quarter)
+    return bool(match) and is_finalized_quarter(int(match.group(1)), int(match.group(2)))
+
+async def extract_all_together_signals(transcripts: Dict[str, Dict[str, Any]],
+                                       refresh: bool = False) -> Dict[str, Any]:
+    """
+    Runs extract_together_signals_async for every quarter concurrently.
+    Answers for finalized quarters are pinned in the LLM cache, so repeat
+    calls never reach the provider; `refresh` forces new calls.
+    Returns {quarter: signals} in the input order.
+    """
+    quarters = list(transcripts)
+    with span("llm_signals", items=len(quarters)):
+        results = await llm_client.gather(*(
+            extract_together_signals_async(transcripts[q], _is_finalized(q), refresh) for q in quarters))
+    return dict(zip(quarters, results))
+
+async def iter_together_signals(transcripts: Dict[str, Dict[str, Any]],
+                                refresh: bool = False) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Streaming form of extract_all_together_signals: every quarter is
+    classified concurrently and (quarter, signals) pairs are yielded in
+    completion order, so quarters answered from the LLM cache come first.
+    Quarters still running are cancelled if the consumer stops early.
+    """
+    async def classify(quarter: str):
+        return quarter, await extract_together_signals_async(transcripts[quarter], _is_finalized(quarter), refresh)
+
+    tasks = [asyncio.ensure_future(classify(q)) for q in transcripts]
+    try:
+        with span("llm_signals", items=len(tasks)):
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,159 @@
+import os
+import re
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Set
+
+logger = logging.getLogger(__name__)
+
+# a revision that could not be resolved (e.g. offline) is retried after
+# this many seconds rather than used as given for the rest of the process
+REVISION_RETRY_SECONDS = float(os.getenv("MODEL_REVISION_RETRY_SECONDS", "300"))
+
+_COMMIT = re.compile(r"^[0-9a-f]{40}$")
+_resolved: Dict[tuple, str] = {}
+# (model, revision) -> time of the last failed attempt
+_failed: Dict[tuple, float] = {}
+# revisions the analysis modules load, resolved together at startup
+_revisions: Set[tuple] = set()
+
+
+def _rss_bytes() -> int:
+    """
+    Resident set size of this process, 0 if it cannot be determined.
+    """
+    try:
+        import psutil
+        return psutil.Process(os.getpid()).memory_info().rss
+    except Exception:
+        return 0
+
+
+class ModelRegistry:
+    """
+    Lazily builds heavyweight resources (ML pipelines, NLTK data, API
+    clients) on first use or on an explicit warm-up, and shares them across
+    requests. Each resource is built at most once, under its own lock, and
+    its load time and resident-memory growth are recorded.
+    """
+
+    def __init__(self):
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._registry_lock = threading.Lock()
+
+    def register(self, name: str, loader: Callable[[], Any]) -> None:
+        with self._registry_lock:
+            self._loaders[name] = loader
+            self._locks.setdefault(name, threading.Lock())
+
+    def set(self, name: str, instance: Any) -> None:
+        """
+        Installs a prebuilt instance (e.g. a stub model), skipping the loader.
+        """
+        with self._registry_lock:
+            self._locks.setdefault(name, threading.Lock())
+            self._instances[name] = instance
+            self._stats[name] = {"load_seconds": 0.0, "rss_delta_bytes": 0, "loaded_at": time.time()}
+
+    def get(self, name: str) -> Any:
+        if name in self._instances:
+            return self._instances[name]
+        if name not in self._loaders:
+            raise KeyError(f"No model registered under {name!r}")
+        with self._locks[name]:
+            if name not in self._instances:
+                rss_before = _rss_bytes()
+                start = time.perf_counter()
+                instance = self._loaders[name]()
+                self._stats[name] = {
+                    "load_seconds": time.perf_counter() - start,
+                    "rss_delta_bytes": max(_rss_bytes() - rss_before, 0),
+                    "loaded_at": time.time(),
+                }
+                self._instances[name] = instance
+        return self._instances[name]
+
+    def warm_up(self, names: Iterable[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Resolves the registered model revisions, then loads the given
+        (default: all registered) resources now.
+        """
+        resolve_revisions()
+        for name in list(names if names is not None else self._loaders):
+            self.get(name)
+        return self.get_stats()
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        stats = {}
+        for name in sorted(set(self._loaders) | set(self._instances)):
+            stats[name] = {"loaded": name in self._instances, **self._stats.get(name, {})}
+        return stats
+
+
+# process-wide registry shared by the analysis modules and the API
+registry = ModelRegistry()
+
+
+def register_revision(model_name: str, revision: str) -> None:
+    """
+    Declares a Hub model revision the process uses, so resolve_revisions
+    can resolve it at startup instead of on the first request.
+    """
+    _revisions.add((model_name, revision))
+
+
+def is_resolved(model_name: str, revision: str) -> bool:
+    """
+    True once `revision` is known as a commit (or needs no resolving).
+    """
+    return bool(_COMMIT.match(revision)) or os.path.isdir(model_name) or (model_name, revision) in _resolved
+
+
+def resolve_revisions() -> List[str]:
+    """
+    Resolves every registered revision now (at startup and on warm-up).
+    Returns the "model@revision" pairs still unresolved.
+    """
+    unresolved = []
+    for model_name, revision in sorted(_revisions):
+        resolve_revision(model_name, revision)
+        if not is_resolved(model_name, revision):
+            unresolved.append(f"{model_name}@{revision}")
+    return unresolved
+
+
+def resolve_revision(model_name: str, revision: str) -> str:
+    """
+    The commit hash that `revision` (a branch, tag or commit) of the Hub
+    model `model_name` points to, so results cached under it stay tied to
+    the weights that produced them. Read from the local Hub cache when it
+    holds the revision, else asked of the Hub once per process. Local model
+    directories are returned as given. A revision the Hub cannot resolve is
+    also returned as given, and only tried again once REVISION_RETRY_SECONDS
+    have passed; callers should not hold on to it (see is_resolved).
+    """
+    if is_resolved(model_name, revision):
+        return _resolved.get((model_name, revision), revision)
+    key = (model_name, revision)
+    if time.time() - _failed.get(key, float("-inf")) < REVISION_RETRY_SECONDS:
+        return revision
+    from huggingface_hub import model_info, try_to_load_from_cache
+
+    cached = try_to_load_from_cache(model_name, "config.json", revision=revision)
+    if isinstance(cached, str):
+        # .../models--{org}--{name}/snapshots/{commit}/config.json
+        _resolved[key] = os.path.basename(os.path.dirname(cached))
+    else:
+        try:
+            _resolved[key] = model_info(model_name, revision=revision).sha
+        except Exception as e:
+            _failed[key] = time.time()
+            logger.warning("could not resolve %s@%s to a commit, using it as given and retrying in %.0fs: %s",
+                           model_name, revision, REVISION_RETRY_SECONDS, e)
+            return revision
+    _failed.pop(key, None)
+    return _resolved[key]
@@ -0,0 +1,124 @@
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Dict, Any, Iterable
+
+# size bound for the on-disk cache; least recently used rows are evicted
+MAX_ENTRIES = int(os.getenv("SENTIMENT_CACHE_MAX_ENTRIES", "200000"))
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def text_hash(text: str) -> str:
+    """
+    SHA-256 of the whitespace-normalized text.
+    """
+    normalized = _WHITESPACE.sub(" ", text).strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class SentimentCache:
+    """
+    Persistent SQLite cache mapping (model, revision, text hash) to the
+    model's label and score, with size-bounded LRU eviction.
+    """
+
+    def __init__(self, path: str, max_entries: int = MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        # the row count is checked once per `evict_every` writes rather than on
+        # every write (other processes share the file, so it is not tracked here)
+        self.evict_every = max(1, max_entries // 100)
+        self._unchecked_writes = self.evict_every
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS sentiment (
+                model     TEXT NOT NULL,
+                revision  TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                label     TEXT NOT NULL,
+                score     REAL NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model, revision, text_hash)
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS sentiment_lru ON sentiment (last_used)")
+        self._conn.commit()
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+    def get_many(self, model: str, revision: str, texts: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns {text: {"label", "score"}} for the texts already cached and
+        marks them as recently used.
+        """
+        hash_of = {t: text_hash(t) for t in texts}
+        keys = list(set(hash_of.values()))
+        rows: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                for h, label, score in self._conn.execute(
+                    f"SELECT text_hash, label, score FROM sentiment WHERE model = ? AND revision = ? "
+                    f"AND text_hash IN ({','.join('?' * len(chunk))})",
+                    [model, revision, *chunk],
+                ):
+                    rows[h] = {"label": label, "score": score}
+            if rows:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE sentiment SET last_used = ? WHERE model = ? AND revision = ? AND text_hash = ?",
+                    [(now, model, revision, h) for h in rows],
+                )
+                self._conn.commit()
+            found = {t: rows[h] for t, h in hash_of.items() if h in rows}
+            self.stats["hits"] += len(found)
+            self.stats["misses"] += len(hash_of) - len(found)
+        return found
+
+    def put_many(self, model: str, revision: str, results: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Stores {text: {"label", "score"}} and, every `evict_every` rows,
+        evicts the least recently used rows beyond `max_entries`.
+        """
+        if not results:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO sentiment (model, revision, text_hash, label, score, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(model, revision, text_hash(t), r["label"], float(r["score"]), now) for t, r in results.items()],
+            )
+            self.stats["writes"] += len(results)
+            self._unchecked_writes += len(results)
+            if self._unchecked_writes >= self.evict_every:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        # called with the lock held
+        self._unchecked_writes = 0
+        count = self._conn.execute("SELECT COUNT(*) FROM sentiment").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM sentiment WHERE rowid IN "
+                "(SELECT rowid FROM sentiment ORDER BY last_used ASC LIMIT ?)",
+                (excess,),
+            )
+            self.stats["evictions"] += excess
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats["entries"] = self._conn.execute("SELECT COUNT(*) FROM sentiment").fetchone()[0]
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
@@ -0,0 +1,135 @@
+import os
+from typing import Dict, List, Any, Iterable, Tuple
+
+import torch
+
+from utils.metrics import span
+
+# tuned for CPU inference of a distilroberta-sized model
+MAX_BATCH_SIZE = int(os.getenv("SENTIMENT_MAX_BATCH_SIZE", "32"))
+# upper bound on padded tokens per batch (batch_size * longest sequence)
+BATCH_TOKEN_BUDGET = int(os.getenv("SENTIMENT_BATCH_TOKENS", "8192"))
+# tokens shared by consecutive windows when a text exceeds the model length
+WINDOW_STRIDE = int(os.getenv("SENTIMENT_WINDOW_STRIDE", "128"))
+
+
+class SentimentEngine:
+    """
+    Batched sequence-classification runner.
+    All texts of a request are tokenized once, texts longer than the model's
+    max length are split into overlapping windows, windows are sorted by
+    length so each batch pads to a similar size, and window probabilities
+    are averaged (weighted by window length) back into one label per text.
+    """
+
+    def __init__(self, model, tokenizer, max_length: int = None,
+                 stride: int = WINDOW_STRIDE, max_batch_size: int = MAX_BATCH_SIZE,
+                 batch_token_budget: int = BATCH_TOKEN_BUDGET):
+        self.model = model
+        self.tokenizer = tokenizer
+        model_max = getattr(tokenizer, "model_max_length", 512)
+        self.max_length = min(max_length or model_max, 512 if model_max > 100_000 else model_max)
+        # single-sequence encoder layout: <cls> ids <sep>
+        self.prefix = [tokenizer.cls_token_id if tokenizer.cls_token_id is not None else tokenizer.bos_token_id]
+        self.suffix = [tokenizer.sep_token_id if tokenizer.sep_token_id is not None else tokenizer.eos_token_id]
+        self.window = self.max_length - len(self.prefix) - len(self.suffix)
+        self.stride = min(stride, self.window // 2)
+        self.max_batch_size = max_batch_size
+        self.batch_token_budget = batch_token_budget
+        self.id2label = {int(k): v for k, v in model.config.id2label.items()}
+        self.stats = {"texts": 0, "windows": 0, "tokens": 0, "padded_tokens": 0, "batches": 0}
+
+    def _windows(self, ids: List[int]) -> List[List[int]]:
+        """
+        Splits token ids into overlapping windows of at most `self.window` ids.
+        """
+        if len(ids) <= self.window:
+            return [ids]
+        step = self.window - self.stride
+        windows = []
+        for start in range(0, len(ids), step):
+            windows.append(ids[start:start + self.window])
+            if start + self.window >= len(ids):
+                break
+        return windows
+
+    def _batches(self, lengths: List[Tuple[int, int]]) -> Iterable[List[int]]:
+        """
+        Given (window_index, length) pairs sorted by length, yields lists of
+        window indices whose padded size stays inside the token budget.
+        """
+        batch: List[int] = []
+        longest = 0
+        for index, length in lengths:
+            longest_if_added = max(longest, length)
+            if batch and (len(batch) >= self.max_batch_size
+                          or longest_if_added * (len(batch) + 1) > self.batch_token_budget):
+                yield batch
+                batch, longest_if_added = [], length
+            batch.append(index)
+            longest = longest_if_added
+        if batch:
+            yield batch
+
+    def predict_proba(self, texts: List[str]) -> List[List[float]]:
+        """
+        Returns one probability vector per text, in input order.
+        """
+        if not texts:
+            return []
+        with span("sentiment_tokenize", items=len(texts)):
+            encoded = self.tokenizer(list(texts), add_special_tokens=False, truncation=False, verbose=False)["input_ids"]
+
+        windows: List[List[int]] = []
+        owners: List[int] = []
+        for text_index, ids in enumerate(encoded):
+            for window in self._windows(ids):
+                windows.append(self.prefix + window + self.suffix)
+                owners.append(text_index)
+
+        order = sorted(((i, len(w)) for i, w in enumerate(windows)), key=lambda x: x[1])
+        window_probs: List[torch.Tensor] = [None] * len(windows)
+        pad_id = self.tokenizer.pad_token_id or 0
+        with span("sentiment_inference", items=len(windows)), torch.inference_mode():
+            for batch in self._batches(order):
+                longest = max(len(windows[i]) for i in batch)
+                input_ids = torch.full((len(batch), longest), pad_id, dtype=torch.long)
+                attention_mask = torch.zeros((len(batch), longest), dtype=torch.long)
+                for row, i in enumerate(batch):
+                    ids = windows[i]
+                    input_ids[row, :len(ids)] = torch.tensor(ids, dtype=torch.long)
+                    attention_mask[row, :len(ids)] = 1
+                logits = self.model(input_ids=input_ids, attention_mask=attention_mask).logits
+                probs = torch.softmax(logits.float(), dim=-1)
+                for row, i in enumerate(batch):
+                    window_probs[i] = probs[row]
+                self.stats["batches"] += 1
+                self.stats["padded_tokens"] += longest * len(batch)
+
+        # aggregate windows back to texts, weighting each window by its length
+        num_labels = len(self.id2label)
+        totals = torch.zeros((len(texts), num_labels))
+        weights = torch.zeros(len(texts))
+        for i, owner in enumerate(owners):
+            totals[owner] += window_probs[i] * len(windows[i])
+            weights[owner] += len(windows[i])
+        totals /= weights.clamp(min=1).unsqueeze(1)
+
+        self.stats["texts"] += len(texts)
+        self.stats["windows"] += len(windows)
+        self.stats["tokens"] += sum(len(w) for w in windows)
+        return totals.tolist()
+
+    def score_texts(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Classifies `texts` and returns pipeline-style results
+        [{"label": ..., "score": ...}, ...] in input order.
+        Duplicate texts are only scored once.
+        """
+        unique = list(dict.fromkeys(texts))
+        probs = self.predict_proba(unique)
+        by_text = {}
+        for text, p in zip(unique, probs):
+            best = max(range(len(p)), key=p.__getitem__)
+            by_text[text] = {"label": self.id2label[best], "score": p[best]}
+        return [by_text[text] for text in texts]
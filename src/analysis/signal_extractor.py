@@ -1,39 +1,132 @@
 # src/analysis/section_sentiment.py
 import os
 import json
+import logging
 import re
-from typing import Dict, Any, List
-from transformers import pipeline
-from .strategic_focus import extract_strategic_focuses
+import hashlib
+from typing import Dict, Any, List, Callable, Iterable, Iterator, Optional
+from .strategic_focus import extract_strategic_focuses, analyze_terms
+from .term_index import TermIndex, get_term_index, UNIQUENESS_WINDOW
+from .taxonomy import get_taxonomy, normalize_taxonomy, taxonomy_fingerprint
+from .sentiment_cache import SentimentCache
+from .model_registry import registry, resolve_revision, register_revision, is_resolved
+from .inference_backends import load_sentiment_model, cache_revision
+from utils.fileio import atomic_write_text
+from utils.metrics import span
 
-DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data"))
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.path.abspath(os.getenv("EARNINGS_DATA_DIR", os.path.join(os.path.dirname(__file__), "..", "data")))
 os.makedirs(DATA_DIR, exist_ok=True)
-# 1. Initialize the sentiment‐analysis pipeline
+# 1. Sentiment-analysis pipeline, built lazily by the model registry
 #    Uses a financial‐tuned model that returns Positive/Neutral/Negative
 SENTIMENT_MODEL = "mrm8488/distilroberta-finetuned-financial-news-sentiment-analysis"
-sentiment_analyzer = pipeline(
-    "sentiment-analysis",
-    model=SENTIMENT_MODEL,
-    tokenizer=SENTIMENT_MODEL
-)
+# branch, tag or commit; the model loads, and results are cached, at the
+# commit it resolves to, which needs no model load
+SENTIMENT_REVISION = os.getenv("SENTIMENT_MODEL_REVISION", "main")
+
+def _load_sentiment_pipeline():
+    from transformers import pipeline
+    return pipeline(
+        "sentiment-analysis",
+        model=SENTIMENT_MODEL,
+        tokenizer=SENTIMENT_MODEL,
+        revision=resolve_revision(SENTIMENT_MODEL, SENTIMENT_REVISION)
+    )
+
+def _load_sentiment_engine():
+    # Batched runner on the SENTIMENT_BACKEND model (fp32 shares the
+    # pipeline's, int8 and onnx load their own): length-bucketed batches and overlapping windows instead
+    # of truncating texts past 512 tokens
+    from .sentiment_engine import SentimentEngine
+
+    def load_fp32():
+        analyzer = registry.get("sentiment")
+        return analyzer.model, analyzer.tokenizer
+
+    model, tokenizer = load_sentiment_model(SENTIMENT_MODEL, resolve_revision(SENTIMENT_MODEL, SENTIMENT_REVISION),
+                                            load_fp32)
+    return SentimentEngine(model, tokenizer)
+
+registry.register("sentiment", _load_sentiment_pipeline)
+registry.register("sentiment_engine", _load_sentiment_engine)
+register_revision(SENTIMENT_MODEL, SENTIMENT_REVISION)
+
+def get_sentiment_engine():
+    return registry.get("sentiment_engine")
+
+# Persistent per-utterance results keyed by (model, resolved commit, text
+# hash); non-fp32 backends cache under their own revision. Set by
+# _cache_revision once the revision resolves; until then results are
+# cached under the revision as given.
+CACHE_REVISION: Optional[str] = None
+sentiment_cache = SentimentCache(os.path.join(DATA_DIR, "sentiment_cache.sqlite"))
+
+
+def _cache_revision() -> str:
+    global CACHE_REVISION
+    if CACHE_REVISION is not None:
+        return CACHE_REVISION
+    revision = cache_revision(resolve_revision(SENTIMENT_MODEL, SENTIMENT_REVISION))
+    if is_resolved(SENTIMENT_MODEL, SENTIMENT_REVISION):
+        CACHE_REVISION = revision
+    return revision
+
+
+def score_texts(texts: List[str]) -> List[Dict[str, Any]]:
+    """
+    Pipeline-style results for `texts`, served from `sentiment_cache` where
+    possible; only cache misses go through the model.
+    """
+    with span("sentiment_cache", items=len(texts)):
+        cached = sentiment_cache.get_many(SENTIMENT_MODEL, _cache_revision(), texts)
+    missing = [t for t in dict.fromkeys(texts) if t not in cached]
+    if missing:
+        fresh = dict(zip(missing, get_sentiment_engine().score_texts(missing)))
+        with span("sentiment_cache", items=len(fresh)):
+            sentiment_cache.put_many(SENTIMENT_MODEL, _cache_revision(), fresh)
+        cached.update(fresh)
+    return [cached[t] for t in texts]
+
 
+def _section_texts(entries: List[Dict[str, str]]) -> List[str]:
+    """
+    Texts of a section's entries, excluding the "Operator".
+    """
+    return [e["text"] for e in entries if e.get("speaker", "").lower() != "operator"]
+
+
+def score_transcripts(transcripts: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Runs sentiment once over every non-Operator entry of every section and
+    quarter in `transcripts`. Returns {text: {"label": ..., "score": ...}}
+    for use as `section_sentiment(..., scored=...)`.
+    """
+    texts: List[str] = []
+    for transcript in transcripts.values():
+        texts.extend(_section_texts(transcript.get("preparedRemarks", [])))
+        texts.extend(_section_texts(transcript.get("qanda", [])))
+    texts = list(dict.fromkeys(texts))
+    return dict(zip(texts, score_texts(texts)))
 
-def section_sentiment(entries: List[Dict[str, str]]) -> Dict[str, float]:
+
+def section_sentiment(entries: List[Dict[str, str]],
+                      scored: Dict[str, Dict[str, Any]] = None) -> Dict[str, float]:
     """
     Given a list of {"speaker":..., "text":...} entries,
     classify each text chunk (excluding "Operator"), then average scores per label.
+    `scored` may hold results precomputed by `score_transcripts`.
     Returns a dict with positive_avg, neutral_avg, negative_avg.
     """
-    # Filter out entries where speaker is "Operator"
-    filtered_entries = [e for e in entries if e.get("speaker", "").lower() != "operator"]
-    
-    # Extract just the text field from each filtered entry
-    texts = [e["text"] for e in filtered_entries]
+    texts = _section_texts(entries)
     if not texts:
         return {"positive_avg": 0.0, "neutral_avg": 0.0, "negative_avg": 0.0}
 
-    results = sentiment_analyzer(texts, truncation=True)
-    print(results)
+    if scored is not None:
+        results = [scored[t] for t in texts]
+    else:
+        results = score_texts(texts)
+    logger.debug("section sentiment: %s", results)
 
     pos_count = neg_count = neu_count = 0
     for result in results:
@@ -60,24 +153,11 @@ def section_sentiment(entries: List[Dict[str, str]]) -> Dict[str, float]:
     }
 
 
-def extract_nlp_signals(transcript: Dict[str, Any]) -> Dict[str, Any]:
+def focus_entries(transcript: Dict[str, Any]) -> List[Dict[str, str]]:
     """
-    Given a transcript dict with keys:
-      {
-        "date": "...",
-        "preparedRemarks": [...],
-        "qanda": [...]
-      }
-    returns per-section sentiment and strategic focuses:
-      {
-        "management_sentiment": {...},
-        "qa_sentiment":         {...},
-        "strategic_focuses":    ["focus1", "focus2", ...]
-      }
+    Prepared remarks plus executives' Q&A answers: the text strategic
+    focuses are extracted from.
     """
-    mgmt = section_sentiment(transcript.get("preparedRemarks", []))
-    qa   = section_sentiment(transcript.get("qanda", []))
-    
     # Extract strategic focuses from both prepared remarks and Q&A sections
     # This provides a more comprehensive view of strategic focuses for each quarter
     prepared_remarks = transcript.get("preparedRemarks", [])
@@ -92,8 +172,42 @@ def extract_nlp_signals(transcript: Dict[str, Any]) -> Dict[str, Any]:
             exec_responses.append(entry)
     
     # Combine prepared remarks and executive Q&A responses for strategic focus extraction
-    all_exec_content = prepared_remarks + exec_responses
-    focuses = extract_strategic_focuses(all_exec_content, top_n=5)
+    return prepared_remarks + exec_responses
+
+
+def extract_nlp_signals(transcript: Dict[str, Any],
+                        scored: Dict[str, Dict[str, Any]] = None,
+                        progress: Callable[[str], None] = None,
+                        prior_docs: List[Dict[str, Any]] = None,
+                        terms: Dict[str, Any] = None,
+                        areas: Dict[str, List[str]] = None) -> Dict[str, Any]:
+    """
+    Given a transcript dict with keys:
+      {
+        "date": "...",
+        "preparedRemarks": [...],
+        "qanda": [...]
+      }
+    returns per-section sentiment and strategic focuses:
+      {
+        "management_sentiment": {...},
+        "qa_sentiment":         {...},
+        "strategic_focuses":    ["focus1", "focus2", ...]
+      }
+    `prior_docs` are the preceding quarters' term docs used to discount
+    recurring topics; `terms` is this transcript's `analyze_terms` output,
+    if already computed; `areas` is the strategic-area taxonomy.
+    `progress`, if given, is called with each section name as it completes.
+    """
+    progress = progress or (lambda section: None)
+    mgmt = section_sentiment(transcript.get("preparedRemarks", []), scored)
+    progress("management_sentiment")
+    qa   = section_sentiment(transcript.get("qanda", []), scored)
+    progress("qa_sentiment")
+    
+    focuses = extract_strategic_focuses(focus_entries(transcript), top_n=5,
+                                        prior_docs=prior_docs, terms=terms, areas=areas)
+    progress("strategic_focuses")
     
     return {
         "management_sentiment": mgmt,
@@ -102,7 +216,9 @@ def extract_nlp_signals(transcript: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def compute_qoq_tone(signals: Dict[str, Any]) -> Dict[str, Any]:
+def compute_qoq_tone(signals: Dict[str, Any],
+                     previous: Dict[str, Any] = None,
+                     changed: Iterable[str] = None) -> Dict[str, Any]:
     """
     Given per-quarter signals mapping:
       {
@@ -115,6 +231,8 @@ def compute_qoq_tone(signals: Dict[str, Any]) -> Dict[str, Any]:
         "2024Q3_to_2024Q4": {"management_tone_shift": x, "qa_tone_shift": y},
         ...
       }
+    If `previous` deltas are given, edges whose quarters are both outside
+    `changed` are reused instead of recomputed.
     """
     # Sort quarters chronologically by year and quarter number
     def sort_key(q: str):
@@ -122,16 +240,22 @@ def compute_qoq_tone(signals: Dict[str, Any]) -> Dict[str, Any]:
         return (int(year), int(qnum))
 
     quarters = sorted(signals.keys(), key=sort_key)
+    previous = previous or {}
+    changed = set(changed) if changed is not None else set(quarters)
     qoq: Dict[str, Dict[str, float]] = {}
     for i in range(1, len(quarters)):
         prev_q = quarters[i-1]
         cur_q  = quarters[i]
+        edge = f"{prev_q}_to_{cur_q}"
+        if edge in previous and prev_q not in changed and cur_q not in changed:
+            qoq[edge] = previous[edge]
+            continue
         prev_sig = signals[prev_q]["management_sentiment"]["positive_avg"]
         cur_sig  = signals[cur_q]["management_sentiment"]["positive_avg"]
         prev_qa  = signals[prev_q]["qa_sentiment"]["positive_avg"]
         cur_qa   = signals[cur_q]["qa_sentiment"]["positive_avg"]
 
-        qoq[f"{prev_q}_to_{cur_q}"] = {
+        qoq[edge] = {
             "management_tone_shift": cur_sig - prev_sig,
             "qa_tone_shift":         cur_qa  - prev_qa
         }
@@ -139,7 +263,182 @@ def compute_qoq_tone(signals: Dict[str, Any]) -> Dict[str, Any]:
     return qoq
 
 
-def extract_all_signals(ticker:str, transcripts: Dict[str, Any]) -> Dict[str, Any]:
+# Sections reported to `progress` callbacks, per quarter
+SIGNAL_SECTIONS = ("management_sentiment", "qa_sentiment", "strategic_focuses")
+
+# Reuse stored per-quarter signals for transcripts that have not changed
+INCREMENTAL_ANALYSIS = os.getenv("INCREMENTAL_ANALYSIS", "1") != "0"
+
+
+def transcript_fingerprint(transcript: Dict[str, Any]) -> str:
+    """
+    Content hash of a parsed transcript, independent of file layout.
+    """
+    canonical = json.dumps(transcript, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _analysis_paths(ticker: str):
+    base = os.path.join(DATA_DIR, f"analysis_{ticker}")
+    return base + ".txt", base + ".meta.json"
+
+
+def load_stored_analysis(ticker: str, taxonomy: str = None):
+    """
+    Returns (analysis, meta) from the last run for `ticker`, or (None, {})
+    if there is no usable stored analysis (including one built with a
+    taxonomy other than the `taxonomy` fingerprint, if given). The meta
+    holds per-quarter transcript "fingerprints" and the "focus_inputs"
+    each quarter's strategic focuses were computed from.
+    """
+    analysis_path, meta_path = _analysis_paths(ticker)
+    try:
+        with open(analysis_path, "r", encoding="utf-8") as f:
+            analysis = json.load(f)
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None, {}
+    if taxonomy is not None and meta.get("taxonomy") != taxonomy:
+        return None, {}
+    return analysis, meta
+
+
+def sort_quarters(quarters: Iterable[str]) -> List[str]:
+    """
+    "YYYYQn" keys in chronological order.
+    """
+    def sort_key(q: str):
+        year, qnum = q.split('Q')
+        return (int(year), int(qnum))
+    return sorted(quarters, key=sort_key)
+
+
+def _plan_analysis(ticker: str, transcripts: Dict[str, Any], incremental: bool,
+                   areas: Dict[str, List[str]]) -> Dict[str, Any]:
+    """
+    The work shared by the batch and streaming paths: which quarters the
+    stored analysis still covers, which changed, and which unchanged ones
+    need their strategic focuses recomputed. Refreshes the term index in
+    memory; it is only written to disk with the analysis (_save_analysis).
+    A run with `areas` other than the ticker's taxonomy is not persisted
+    and works on a private copy of the term index.
+    """
+    if incremental is None:
+        incremental = INCREMENTAL_ANALYSIS
+    default_taxonomy = taxonomy_fingerprint(get_taxonomy(ticker))
+    areas = normalize_taxonomy(areas) if areas else get_taxonomy(ticker)
+    taxonomy = taxonomy_fingerprint(areas)
+    persist = taxonomy == default_taxonomy
+    # Sort quarters chronologically to ensure consistent processing order
+    # This is important for our TF-IDF-like approach that compares with previous quarters
+    sorted_quarters = sort_quarters(transcripts.keys())
+    fingerprints = {q: transcript_fingerprint(transcripts[q]) for q in sorted_quarters}
+
+    stored, stored_meta = load_stored_analysis(ticker, taxonomy) if incremental else (None, {})
+    stored_signals = (stored or {}).get("signals", {})
+    stored_fingerprints = stored_meta.get("fingerprints", {})
+    changed = [
+        q for q in sorted_quarters
+        if q not in stored_signals or stored_fingerprints.get(q) != fingerprints[q]
+    ]
+
+    # Refresh the ticker's term index for quarters whose transcript changed
+    term_index = get_term_index(ticker)
+    if not persist:
+        term_index = TermIndex(term_index.path)
+    term_index.remove_missing(set(sorted_quarters))
+    terms: Dict[str, Dict[str, Any]] = {}
+    reindexed = set()
+    with span("term_index") as stage:
+        for quarter in sorted_quarters:
+            # keyword sets depend on the taxonomy as well as the text
+            index_fingerprint = f"{fingerprints[quarter]}:{taxonomy}"
+            if term_index.fingerprint(quarter) != index_fingerprint:
+                terms[quarter] = analyze_terms(focus_entries(transcripts[quarter]), areas)
+                term_index.put(quarter, index_fingerprint, terms[quarter]["keywords"], terms[quarter]["phrases"])
+                reindexed.add(quarter)
+        stage.items = len(reindexed)
+
+    # A quarter's focuses depend on the term docs of itself and the
+    # UNIQUENESS_WINDOW quarters before it; they are recomputed whenever
+    # those differ from what the stored analysis was built from, even if
+    # the quarter's own text is unchanged. Comparing against the stored
+    # meta (not this run's re-indexing) keeps a run that failed after
+    # updating the term index from leaving stale focuses behind.
+    focus_inputs = {}
+    for i, quarter in enumerate(sorted_quarters):
+        window = sorted_quarters[max(0, i - UNIQUENESS_WINDOW):i + 1]
+        canonical = json.dumps([[q, term_index.fingerprint(q)] for q in window])
+        focus_inputs[quarter] = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+    stored_inputs = stored_meta.get("focus_inputs", {})
+    refocus = {q for q in sorted_quarters if stored_inputs.get(q) != focus_inputs[q]}
+
+    return {
+        "areas": areas,
+        "taxonomy": taxonomy,
+        "persist": persist,
+        "quarters": sorted_quarters,
+        "fingerprints": fingerprints,
+        "focus_inputs": focus_inputs,
+        "stored": stored or {},
+        "changed": changed,
+        "term_index": term_index,
+        "terms": terms,
+        "refocus": refocus,
+    }
+
+
+def _quarter_signals(plan: Dict[str, Any], transcripts: Dict[str, Any], quarter: str,
+                     scored: Dict[str, Dict[str, Any]] = None,
+                     progress: Callable[[str], None] = None) -> Dict[str, Any]:
+    """
+    One quarter's signals: reused from the stored analysis when unchanged
+    (with focuses refreshed if needed), otherwise computed from `scored`.
+    """
+    transcript = transcripts[quarter]
+    prior_docs = plan["term_index"].prior(quarter, UNIQUENESS_WINDOW)
+    if quarter in plan["changed"]:
+        return extract_nlp_signals(transcript, scored, progress, prior_docs=prior_docs,
+                                   terms=plan["terms"].get(quarter), areas=plan["areas"])
+    signals = plan["stored"]["signals"][quarter]
+    if quarter in plan["refocus"]:
+        signals = dict(signals, strategic_focuses=extract_strategic_focuses(
+            focus_entries(transcript), top_n=5, prior_docs=prior_docs, terms=plan["terms"].get(quarter),
+            areas=plan["areas"]))
+    if progress:
+        for section in SIGNAL_SECTIONS:
+            progress(section)
+    return signals
+
+
+def _save_analysis(ticker: str, plan: Dict[str, Any], signals: Dict[str, Any],
+                   qoq_changes: Dict[str, Any]) -> None:
+    if not plan["persist"]:
+        return
+    filepath, meta_path = _analysis_paths(ticker)
+    result = {
+        "signals": signals,
+        "qoq_tone_change": qoq_changes
+    }
+    # write-then-rename so concurrent readers never see a partial file; the
+    # meta goes last, so quarters it vouches for are always in the analysis,
+    # and only quarters present in `signals` are vouched for
+    with span("write"):
+        plan["term_index"].save()
+        atomic_write_text(filepath, json.dumps(result, ensure_ascii=False))
+        atomic_write_text(meta_path, json.dumps({
+            "fingerprints": {q: plan["fingerprints"][q] for q in signals},
+            "focus_inputs": {q: plan["focus_inputs"][q] for q in signals},
+            "taxonomy": plan["taxonomy"],
+        }))
+
+
+def extract_all_signals(ticker:str, transcripts: Dict[str, Any],
+                        progress: Callable[[str, str], None] = None,
+                        incremental: bool = None,
+                        areas: Dict[str, List[str]] = None,
+                        scored: Dict[str, Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Given a dict of transcripts per quarter:
       { "2024Q3": {...}, "2024Q4": {...}, ... }
@@ -148,32 +447,94 @@ def extract_all_signals(ticker:str, transcripts: Dict[str, Any]) -> Dict[str, An
         "signals": { ... per-quarter sentiment and strategic focuses ... },
         "qoq_tone_change": { ... deltas ... }
       }
+    In incremental mode (default INCREMENTAL_ANALYSIS), quarters whose
+    transcript fingerprint matches the stored analysis are reused, and only
+    new or changed quarters and their QoQ edges are recomputed.
+    `progress`, if given, is called as progress(quarter, section) for each
+    of SIGNAL_SECTIONS as it completes.
+    `scored` may hold sentiment already computed by `score_transcripts`
+    for every changed quarter, in which case no inference runs here.
+    Results built from `areas` other than the ticker's taxonomy are
+    returned without being saved.
     """
-    # Sort quarters chronologically to ensure consistent processing order
-    # This is important for our TF-IDF-like approach that compares with previous quarters
-    def sort_key(q: str):
-        year, qnum = q.split('Q')
-        return (int(year), int(qnum))
-    
-    sorted_quarters = sorted(transcripts.keys(), key=sort_key)
-    
+    plan = _plan_analysis(ticker, transcripts, incremental, areas)
+    changed = plan["changed"]
+
+    # One batched inference pass over every section of the changed quarters
+    if scored is None:
+        scored = score_transcripts({q: transcripts[q] for q in changed})
+
     signals: Dict[str, Any] = {}
     # Process quarters in chronological order
-    for quarter in sorted_quarters:
-        transcript = transcripts[quarter]
-        signals[quarter] = extract_nlp_signals(transcript)
+    for quarter in plan["quarters"]:
+        quarter_progress = (lambda section, q=quarter: progress(q, section)) if progress else None
+        signals[quarter] = _quarter_signals(plan, transcripts, quarter, scored, quarter_progress)
 
-    qoq_changes = compute_qoq_tone(signals)
-    filename = f"analysis_{ticker}.txt"
-    filepath = os.path.join(DATA_DIR, filename)
-    result = {
-        "signals": signals,
-        "qoq_tone_change": qoq_changes
-    }
-    result = json.dumps(result, ensure_ascii=False)
-    with open(filepath, "w", encoding="utf-8") as f:
-        f.write(result)
+    with span("qoq", items=len(changed)):
+        qoq_changes = compute_qoq_tone(signals, plan["stored"].get("qoq_tone_change"), changed)
+    _save_analysis(ticker, plan, signals, qoq_changes)
     return {
         "signals": signals,
         "qoq_tone_change": qoq_changes
     }
+
+
+def iter_signals(ticker: str, transcripts: Dict[str, Any],
+                 incremental: bool = None,
+                 areas: Dict[str, List[str]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Streaming form of `extract_all_signals`. Yields, as each is ready:
+      {"type": "quarter", "quarter": q, "signals": {...}, "cached": bool}
+      {"type": "qoq", "edge": "2024Q3_to_2024Q4", "delta": {...}}
+    Quarters the stored analysis still covers come first, without any
+    inference; changed quarters follow one at a time, each scored on its
+    own so the first new result costs one quarter of inference rather
+    than all of them. A QoQ edge is yielded once both its quarters are.
+    The analysis is saved when the stream ends, also if the consumer
+    stops early or a quarter fails: quarters computed so far are kept, as
+    are stored quarters still valid for this run, so an interrupted stream
+    does not repeat their work. A final
+    {"type": "done", "quarters": n, "recomputed": m} follows a complete run.
+    """
+    plan = _plan_analysis(ticker, transcripts, incremental, areas)
+    quarters, changed = plan["quarters"], plan["changed"]
+    previous = plan["stored"].get("qoq_tone_change")
+    position = {q: i for i, q in enumerate(quarters)}
+    signals: Dict[str, Any] = {}
+
+    def ready_edges(quarter: str) -> Iterator[Dict[str, Any]]:
+        i = position[quarter]
+        for prev_q, cur_q in ((quarters[i - 1] if i else None, quarter),
+                              (quarter, quarters[i + 1] if i + 1 < len(quarters) else None)):
+            if prev_q in signals and cur_q in signals:
+                with span("qoq", items=1):
+                    edge = compute_qoq_tone({prev_q: signals[prev_q], cur_q: signals[cur_q]}, previous, changed)
+                for name, delta in edge.items():
+                    yield {"type": "qoq", "edge": name, "delta": delta}
+
+    try:
+        unchanged = [q for q in quarters if q not in changed]
+        for quarter in unchanged + changed:
+            scored = score_transcripts({quarter: transcripts[quarter]}) if quarter in changed else None
+            signals[quarter] = _quarter_signals(plan, transcripts, quarter, scored)
+            yield {"type": "quarter", "quarter": quarter, "signals": signals[quarter],
+                   "cached": quarter not in changed}
+            yield from ready_edges(quarter)
+    finally:
+        _save_streamed(ticker, plan, signals)
+    yield {"type": "done", "quarters": len(quarters), "recomputed": len(changed)}
+
+
+def _save_streamed(ticker: str, plan: Dict[str, Any], signals: Dict[str, Any]) -> None:
+    # computed quarters plus stored ones this run would have reused as-is,
+    # in chronological order, with the QoQ edges between adjacent ones
+    stored = plan["stored"].get("signals", {})
+    kept = {q: signals[q] if q in signals else stored[q] for q in plan["quarters"]
+            if q in signals or (q not in plan["changed"] and q not in plan["refocus"])}
+    qoq_changes: Dict[str, Any] = {}
+    for prev_q, cur_q in zip(plan["quarters"], plan["quarters"][1:]):
+        if prev_q in kept and cur_q in kept:
+            qoq_changes.update(compute_qoq_tone({prev_q: kept[prev_q], cur_q: kept[cur_q]},
+                                                plan["stored"].get("qoq_tone_change"), plan["changed"]))
+    if kept:
+        _save_analysis(ticker, plan, kept, qoq_changes)
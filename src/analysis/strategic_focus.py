@@ -1,11 +1,22 @@
 from typing import Dict, Any, List
-import re
-import nltk
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
-from nltk.probability import FreqDist
+import os
+import time
+import logging
+from types import SimpleNamespace
 from collections import Counter
 
+from .model_registry import registry
+from .keyword_matcher import get_matcher, SUBSTRING
+from .term_index import document_frequency
+from .tokenizer import Tokenizer, count_ngrams
+from utils.metrics import span, timed
+
+logger = logging.getLogger(__name__)
+
+# "substring" (default) counts a keyword inside any n-gram containing it, as
+# before; "word" only counts occurrences aligned to token boundaries
+KEYWORD_MATCH_MODE = os.getenv("KEYWORD_MATCH_MODE", SUBSTRING)
+
 # Custom financial stopwords to filter out common earnings call terms
 FINANCIAL_STOPWORDS = {
     "quarter", "year", "fiscal", "revenue", "growth", "percent", "earnings",
@@ -54,82 +65,125 @@ NVIDIA_STRATEGIC_AREAS = {
     "Metaverse": ["metaverse", "virtual reality", "vr", "ar", "xr", "omniverse"],
 }
 
+def _load_nltk() -> SimpleNamespace:
+    """
+    Imports NLTK and makes sure the tokenizer and stopword data are present.
+    """
+    import nltk
+    from nltk.tokenize import word_tokenize
+    from nltk.corpus import stopwords
+    from nltk.probability import FreqDist
+
+    for resource, package in (("tokenizers/punkt_tab", "punkt_tab"), ("corpora/stopwords", "stopwords")):
+        try:
+            nltk.data.find(resource)
+        except LookupError:
+            nltk.download(package, quiet=True)
+    return SimpleNamespace(word_tokenize=word_tokenize, stopwords=stopwords, FreqDist=FreqDist)
+
+registry.register("nltk", _load_nltk)
+
+def _load_tokenizer() -> Tokenizer:
+    # stopword set (English + financial) built once for the process
+    english = registry.get("nltk").stopwords.words('english')
+    return Tokenizer(set(english) | FINANCIAL_STOPWORDS)
+
+registry.register("tokenizer", _load_tokenizer)
+
 def preprocess_text(text: str) -> List[str]:
     """
     Preprocess text by converting to lowercase, removing punctuation,
     tokenizing, and removing stopwords.
+    Tokens come from the process-wide Tokenizer and are interned strings.
     """
-    # Convert to lowercase and remove punctuation
-    text = text.lower()
-    text = re.sub(r'[^\w\s]', ' ', text)
-    
-    # Tokenize
-    tokens = word_tokenize(text)
-    
-    # Remove stopwords (English + financial)
-    stop_words = set(stopwords.words('english')).union(FINANCIAL_STOPWORDS)
-    filtered_tokens = [token for token in tokens if token not in stop_words and len(token) > 2]
-    
-    return filtered_tokens
+    tokenizer = registry.get("tokenizer")
+    return tokenizer.tokens(tokenizer.token_ids(text))
 
 def extract_ngrams(tokens: List[str], n: int) -> List[str]:
     """
     Extract n-grams from a list of tokens.
     """
-    ngrams = []
-    for i in range(len(tokens) - n + 1):
-        ngram = ' '.join(tokens[i:i+n])
-        ngrams.append(ngram)
-    return ngrams
-
-# Global variable to store transcript text from previous quarters for comparison
-_previous_transcripts_text = []
+    return [' '.join(ngram) for ngram in zip(*(tokens[i:] for i in range(n)))]
 
-def extract_strategic_focuses(entries: List[Dict[str, str]], top_n: int = 5) -> List[str]:
+def analyze_terms(entries: List[Dict[str, str]],
+                  areas: Dict[str, List[str]] = None) -> Dict[str, Any]:
     """
-    Extract strategic focuses from a list of transcript entries.
-    Returns a list of the top N strategic areas mentioned.
-    Uses a TF-IDF-like approach to emphasize terms unique to this transcript.
+    Tokenizes the non-Operator text of `entries` and returns the pieces
+    strategic-focus extraction and the term index need (keywords come from
+    `areas`, default NVIDIA_STRATEGIC_AREAS):
+      {
+        "tokens":        [...],       # preprocessed unigrams
+        "top_phrases":   [...],       # 30 most common bigrams + trigrams, (phrase, count)
+        "keywords":      {...},       # taxonomy keywords present in the raw text
+        "phrases":       {...}        # distinct bigrams + trigrams, as strings
+      }
     """
-    global _previous_transcripts_text
-    
     # Filter out entries where speaker is "Operator"
     filtered_entries = [e for e in entries if e.get("speaker", "").lower() != "operator"]
     
     # Combine all text
     current_text = " ".join([e["text"] for e in filtered_entries])
     
-    # Preprocess text
-    tokens = preprocess_text(current_text)
-    
-    # Extract unigrams, bigrams, and trigrams
-    unigrams = tokens
-    bigrams = extract_ngrams(tokens, 2)
-    trigrams = extract_ngrams(tokens, 3)
+    with span("focus_tokenize") as stage:
+        # Preprocess text into interned token ids
+        tokenizer = registry.get("tokenizer")
+        ids = tokenizer.token_ids(current_text)
+        tokens = tokenizer.tokens(ids)
+
+        # Count bigrams and trigrams as id tuples; only distinct ones become strings
+        phrase_counts = count_ngrams(ids, (2, 3))
+        stage.items = len(tokens)
+
+    with span("keyword_match", items=len(current_text)):
+        matcher = get_matcher(areas or NVIDIA_STRATEGIC_AREAS, KEYWORD_MATCH_MODE)
+        present = {matcher.keywords[i] for _, _, i in matcher.iter_matches(current_text.lower())}
+    return {
+        "tokens": tokens,
+        "top_phrases": [(tokenizer.phrase(ngram), count) for ngram, count in phrase_counts.most_common(30)],
+        "keywords": present,
+        "phrases": {tokenizer.phrase(ngram) for ngram in phrase_counts},
+    }
+
+@timed("strategic_focus")
+def extract_strategic_focuses(entries: List[Dict[str, str]], top_n: int = 5,
+                              prior_docs: List[Dict[str, Any]] = None,
+                              terms: Dict[str, Any] = None,
+                              areas: Dict[str, List[str]] = None) -> List[str]:
+    """
+    Extract strategic focuses from a list of transcript entries.
+    Returns a list of the top N strategic areas mentioned.
+    `areas` is the {area: [keywords]} taxonomy, default NVIDIA_STRATEGIC_AREAS.
+    Uses a TF-IDF-like approach to emphasize terms unique to this transcript:
+    `prior_docs` are the term docs of the preceding quarters (see
+    term_index.TermIndex.prior), and each one containing a term discounts it.
+    The result depends only on the arguments. `terms` may be passed if
+    `analyze_terms(entries)` was already computed.
+    """
+    prior_docs = prior_docs or []
+    areas = areas or NVIDIA_STRATEGIC_AREAS
+    terms = terms or analyze_terms(entries, areas)
+    tokens = terms["tokens"]
     
-    # Combine all n-grams
-    all_ngrams = unigrams + bigrams + trigrams
+    # Count, for every keyword, the unigrams/bigrams/trigrams containing it
+    # in a single pass of the compiled taxonomy matcher
+    matcher = get_matcher(areas, KEYWORD_MATCH_MODE)
+    keyword_counts = matcher.count_ngram_hits(tokens, 3)
     
     # Count occurrences of strategic area keywords in current transcript
     area_counts = {}
     area_uniqueness = {}
     
-    for area, keywords in NVIDIA_STRATEGIC_AREAS.items():
+    for area, keywords in areas.items():
         count = 0
         for keyword in keywords:
-            # Count exact matches of keywords in n-grams
-            keyword_count = sum(1 for ngram in all_ngrams if keyword in ngram)
+            keyword_count = keyword_counts[keyword]
             count += keyword_count
             
             # Calculate uniqueness score (similar to TF-IDF)
             # Higher score for terms that appear more in current transcript
             # and less in previous transcripts
-            uniqueness = keyword_count
-            for prev_text in _previous_transcripts_text:
-                # If this keyword appears frequently in previous transcripts,
-                # reduce its uniqueness score
-                if keyword in prev_text.lower():
-                    uniqueness *= 0.7  # Reduce weight for terms common across quarters
+            # Reduce weight for terms common across quarters
+            uniqueness = keyword_count * 0.7 ** document_frequency(keyword, prior_docs, "keywords")
             
             if uniqueness > 0:
                 if area not in area_uniqueness:
@@ -140,25 +194,18 @@ def extract_strategic_focuses(entries: List[Dict[str, str]], top_n: int = 5) ->
             area_counts[area] = count
     
     # Add frequency analysis for unique terms in this transcript
-    freq_dist = FreqDist(bigrams + trigrams)
-    common_phrases = freq_dist.most_common(30)  # Get top 30 most common phrases
+    common_phrases = terms["top_phrases"]  # Get top 30 most common phrases
     
     # Add any frequent phrases that aren't already in our strategic areas
     for phrase, count in common_phrases:
         # Check if this phrase is not already covered by existing strategic areas
         if count > 2:  # Lower threshold to capture more unique phrases
-            is_new = True
-            for area_keywords in NVIDIA_STRATEGIC_AREAS.values():
-                if any(keyword in phrase for keyword in area_keywords):
-                    is_new = False
-                    break
+            is_new = not matcher.contains_any(phrase)
             
             if is_new:
                 # Calculate uniqueness for this phrase
-                uniqueness = count
-                for prev_text in _previous_transcripts_text:
-                    if phrase in prev_text.lower():
-                        uniqueness *= 0.5  # Heavily penalize phrases that appear in previous transcripts
+                # Heavily penalize phrases that appear in previous transcripts
+                uniqueness = count * 0.5 ** document_frequency(phrase, prior_docs, "phrases")
                 
                 if uniqueness > 1:  # Only add if it's somewhat unique
                     # Capitalize first letter of each word for consistency
@@ -166,12 +213,6 @@ def extract_strategic_focuses(entries: List[Dict[str, str]], top_n: int = 5) ->
                     area_counts[new_area] = count
                     area_uniqueness[new_area] = uniqueness
     
-    # Store current transcript for future comparisons
-    _previous_transcripts_text.append(current_text)
-    # Keep only the last 3 transcripts to avoid excessive memory usage
-    if len(_previous_transcripts_text) > 3:
-        _previous_transcripts_text.pop(0)
-    
     # Sort by uniqueness score (not just frequency) to prioritize quarter-specific topics
     if area_uniqueness:
         sorted_areas = sorted(area_uniqueness.items(), key=lambda x: x[1], reverse=True)
@@ -180,25 +221,41 @@ def extract_strategic_focuses(entries: List[Dict[str, str]], top_n: int = 5) ->
     
     return [area for area, _ in sorted_areas[:top_n]]
 
-def extract_strategic_focuses_llm(text: str, client) -> List[str]:
+# bump when the focus prompt changes so cached answers are not reused
+FOCUS_TEMPLATE = "focuses-v1"
+
+def extract_strategic_focuses_llm(text: str, client, pin: bool = False, refresh: bool = False) -> List[str]:
     """
     Uses an LLM to extract strategic focuses from transcript text.
     Requires a Together.ai client or similar.
+    Answers are kept in the LLM cache (see llm_client.complete_cached for
+    `pin` / `refresh`).
     """
+    from .llm_client import llm_cache, CACHE_ENABLED, MODEL, estimate_tokens
+
+    excerpt = text[:4000]
     prompt = (
         "Based on the following earnings call transcript excerpt, identify the top 3-5 strategic focuses or key themes "
         "that the company is emphasizing. Format your response as a comma-separated list of short phrases (2-4 words each).\n\n"
-        f"Transcript excerpt:\n{text[:4000]}...\n\nStrategic focuses:"
+        f"Transcript excerpt:\n{excerpt}...\n\nStrategic focuses:"
     )
     
-    try:
-        resp = client.chat.completions.create(
-            model="meta-llama/Llama-3.3-70B-Instruct-Turbo-Free",
-            messages=[{"role": "user", "content": prompt}]
-        )
-        focuses = resp.choices[0].message.content.strip().split(",")
-        return [focus.strip() for focus in focuses if focus.strip()]
-    except Exception as e:
-        print(f"Error using LLM for strategic focuses: {e}")
-        # Fall back to keyword-based extraction
-        return ["AI acceleration", "Data center growth", "Enterprise adoption"]
\ No newline at end of file
+    content = llm_cache.get(MODEL, FOCUS_TEMPLATE, excerpt) if CACHE_ENABLED and not refresh else None
+    if content is None:
+        start = time.perf_counter()
+        try:
+            resp = client.chat.completions.create(
+                model=MODEL,
+                messages=[{"role": "user", "content": prompt}]
+            )
+            content = resp.choices[0].message.content
+        except Exception as e:
+            logger.warning("LLM strategic focus extraction failed, using fallback focuses: %s", e)
+            # Fall back to keyword-based extraction
+            return ["AI acceleration", "Data center growth", "Enterprise adoption"]
+        if CACHE_ENABLED:
+            llm_cache.put(MODEL, FOCUS_TEMPLATE, excerpt, content,
+                          estimate_tokens(prompt) + estimate_tokens(content),
+                          time.perf_counter() - start, pin)
+    focuses = content.strip().split(",")
+    return [focus.strip() for focus in focuses if focus.strip()]
@@ -0,0 +1,58 @@
+import os
+import json
+import hashlib
+import threading
+from typing import Dict, List
+
+from .strategic_focus import NVIDIA_STRATEGIC_AREAS
+
+DATA_DIR = os.path.abspath(os.getenv("EARNINGS_DATA_DIR", os.path.join(os.path.dirname(__file__), "..", "data")))
+# {TICKER}.json files here ({"Area": ["keyword", ...], ...}) override the default
+TAXONOMY_DIR = os.getenv("TAXONOMY_DIR", os.path.join(DATA_DIR, "taxonomies"))
+
+Taxonomy = Dict[str, List[str]]
+
+_registered: Dict[str, Taxonomy] = {}
+_lock = threading.Lock()
+
+
+def normalize_taxonomy(areas: Taxonomy) -> Taxonomy:
+    """
+    `areas` with lowercased keywords, as they are matched against
+    lowercased transcript text.
+    """
+    return {area: [k.lower() for k in keywords] for area, keywords in areas.items()}
+
+
+def register_taxonomy(ticker: str, areas: Taxonomy) -> None:
+    """
+    Uses `areas` ({area: [keywords]}) for `ticker`'s strategic focuses.
+    """
+    with _lock:
+        _registered[ticker.upper()] = normalize_taxonomy(areas)
+
+
+def get_taxonomy(ticker: str) -> Taxonomy:
+    """
+    The strategic-area taxonomy for `ticker`: a registered one, else
+    TAXONOMY_DIR/{TICKER}.json, else NVIDIA_STRATEGIC_AREAS.
+    """
+    ticker = ticker.upper()
+    with _lock:
+        if ticker in _registered:
+            return _registered[ticker]
+    path = os.path.join(TAXONOMY_DIR, f"{ticker}.json")
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            areas = json.load(f)
+    except FileNotFoundError:
+        return NVIDIA_STRATEGIC_AREAS
+    return normalize_taxonomy(areas)
+
+
+def taxonomy_fingerprint(areas: Taxonomy) -> str:
+    """
+    Content hash of a taxonomy, stored with analyses built from it.
+    """
+    canonical = json.dumps(areas, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
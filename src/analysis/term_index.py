@@ -0,0 +1,98 @@
+import os
+import json
+import threading
+from typing import Dict, Any, List, Optional, Set
+
+from utils.fileio import atomic_write_text
+
+DATA_DIR = os.path.abspath(os.getenv("EARNINGS_DATA_DIR", os.path.join(os.path.dirname(__file__), "..", "data")))
+
+# how many preceding quarters count towards a term's document frequency
+UNIQUENESS_WINDOW = int(os.getenv("UNIQUENESS_WINDOW", "3"))
+
+
+def _sort_key(q: str):
+    year, qnum = q.split('Q')
+    return (int(year), int(qnum))
+
+
+class TermIndex:
+    """
+    Per-ticker document-frequency index over quarters.
+    For each quarter it keeps the set of taxonomy keywords present in the
+    executive text and the set of bigram/trigram phrases, plus the
+    transcript fingerprint they were built from. Persisted as JSON next to
+    the transcripts (terms_{ticker}.json).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._docs: Dict[str, Dict[str, Any]] = {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+            for quarter, doc in stored.get("docs", {}).items():
+                self._docs[quarter] = {
+                    "fingerprint": doc["fingerprint"],
+                    "keywords": set(doc["keywords"]),
+                    "phrases": set(doc["phrases"]),
+                }
+        except (FileNotFoundError, ValueError, KeyError):
+            self._docs = {}
+
+    def fingerprint(self, quarter: str) -> Optional[str]:
+        with self._lock:
+            doc = self._docs.get(quarter)
+            return doc["fingerprint"] if doc else None
+
+    def put(self, quarter: str, fingerprint: str, keywords: Set[str], phrases: Set[str]) -> None:
+        with self._lock:
+            self._docs[quarter] = {"fingerprint": fingerprint, "keywords": set(keywords), "phrases": set(phrases)}
+
+    def remove_missing(self, quarters: Set[str]) -> None:
+        """
+        Drops quarters that are no longer among `quarters`.
+        """
+        with self._lock:
+            for quarter in [q for q in self._docs if q not in quarters]:
+                del self._docs[quarter]
+
+    def prior(self, quarter: str, window: int = UNIQUENESS_WINDOW) -> List[Dict[str, Set[str]]]:
+        """
+        Term docs of the `window` quarters immediately preceding `quarter`.
+        """
+        with self._lock:
+            earlier = sorted((q for q in self._docs if _sort_key(q) < _sort_key(quarter)), key=_sort_key)
+            return [self._docs[q] for q in earlier[-window:]] if window > 0 else []
+
+    def save(self) -> None:
+        with self._lock:
+            docs = {
+                q: {"fingerprint": d["fingerprint"], "keywords": sorted(d["keywords"]), "phrases": sorted(d["phrases"])}
+                for q, d in self._docs.items()
+            }
+        atomic_write_text(self.path, json.dumps({"docs": docs}, ensure_ascii=False))
+
+
+def document_frequency(term: str, docs: List[Dict[str, Set[str]]], field: str) -> int:
+    """
+    Number of `docs` whose `field` ("keywords" or "phrases") contains `term`.
+    """
+    return sum(1 for doc in docs if term in doc[field])
+
+
+_indexes: Dict[str, TermIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_term_index(ticker: str) -> TermIndex:
+    """
+    The shared TermIndex for `ticker`, loaded from disk on first use.
+    """
+    with _indexes_lock:
+        index = _indexes.get(ticker)
+        if index is None:
+            index = TermIndex(os.path.join(DATA_DIR, f"terms_{ticker}.json"))
+            _indexes[ticker] = index
+        return index
@@ -0,0 +1,113 @@
+import re
+import sys
+import threading
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+# After punctuation is dropped, NLTK's word_tokenize reduces to splitting on
+# whitespace plus the Treebank contraction rules that need no apostrophe
+_WORD = re.compile(r"\w+")
+CONTRACTIONS = {
+    "cannot": ("can", "not"),
+    "gimme": ("gim", "me"),
+    "gonna": ("gon", "na"),
+    "gotta": ("got", "ta"),
+    "lemme": ("lem", "me"),
+    "wanna": ("wan", "na"),
+}
+MIN_TOKEN_LENGTH = 3
+
+
+class Tokenizer:
+    """
+    Single-pass tokenizer for strategic-focus preprocessing, equivalent to
+    lowercasing, replacing punctuation with spaces, word_tokenize and
+    dropping stopwords and tokens shorter than MIN_TOKEN_LENGTH.
+    Kept tokens are interned and numbered; every raw word seen is mapped
+    once to the ids it contributes (none for stopwords), so tokenizing is
+    one regex scan plus one dict lookup per word.
+    """
+
+    def __init__(self, stopwords: Iterable[str]):
+        self.stopwords = frozenset(stopwords)
+        self._by_word: Dict[str, Tuple[int, ...]] = {}
+        self._ids: Dict[str, int] = {}
+        self.strings: List[str] = []
+        self._lock = threading.Lock()
+
+    def _id(self, token: str) -> int:
+        token_id = self._ids.get(token)
+        if token_id is None:
+            token_id = self._ids[token] = len(self.strings)
+            self.strings.append(sys.intern(token))
+        return token_id
+
+    def _learn(self, word: str) -> Tuple[int, ...]:
+        with self._lock:
+            ids = self._by_word.get(word)
+            if ids is None:
+                ids = tuple(self._id(t) for t in CONTRACTIONS.get(word, (word,))
+                            if len(t) >= MIN_TOKEN_LENGTH and t not in self.stopwords)
+                self._by_word[word] = ids
+        return ids
+
+    def token_ids(self, text: str) -> List[int]:
+        """
+        Ids of the kept tokens of `text`, in order.
+        """
+        by_word = self._by_word
+        out: List[int] = []
+        for word in _WORD.findall(text.lower()):
+            ids = by_word.get(word)
+            if ids is None:
+                ids = self._learn(word)
+            out += ids
+        return out
+
+    def tokens(self, ids: Iterable[int]) -> List[str]:
+        strings = self.strings
+        return [strings[i] for i in ids]
+
+    def phrase(self, ngram: Tuple[int, ...]) -> str:
+        """
+        The space-joined string of an n-gram of ids.
+        """
+        strings = self.strings
+        return " ".join(strings[i] for i in ngram)
+
+
+def iter_words(text: str) -> Iterator[Tuple[str, int]]:
+    """
+    (word, character offset) for every word of `text`, lowercased and with
+    contractions split as Tokenizer does, but keeping stopwords and short
+    words, for positional indexes where phrases must match word for word.
+    """
+    for match in _WORD.finditer(text):
+        word = match.group().lower()
+        parts = CONTRACTIONS.get(word)
+        if parts is None:
+            yield word, match.start()
+            continue
+        offset = match.start()
+        for part in parts:
+            yield part, offset
+            offset += len(part)
+
+
+def ngram_ids(ids: List[int], n: int) -> Iterator[Tuple[int, ...]]:
+    """
+    Yields the n-grams of `ids` as tuples, without building strings.
+    """
+    return zip(*(ids[i:] for i in range(n)))
+
+
+def count_ngrams(ids: List[int], sizes: Iterable[int] = (2, 3)) -> "Counter[Tuple[int, ...]]":
+    """
+    Occurrence counts of the n-grams of each size in `sizes`, inserted in
+    the order bigrams-then-trigrams so ties in most_common() break the
+    same way as counting the joined strings did.
+    """
+    counts: "Counter[Tuple[int, ...]]" = Counter()
+    for n in sizes:
+        counts.update(ngram_ids(ids, n))
+    return counts
@@ -1,21 +1,85 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, Response, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import AsyncIterator, Dict, Any, List, Optional
+from contextlib import asynccontextmanager, aclosing
 from fastapi.middleware.cors import CORSMiddleware
 import os
 import glob
 import json
+import time
+import asyncio
+import logging
+import concurrent.futures
+import anyio
 
 
-from transcript.transcript_client import fetch_and_save_last_n_transcripts
-from transcript.transcript_loader import load_json_transcripts
-from analysis.signal_extractor import extract_all_signals
-from analysis.llm_signal_extractor import extract_together_signals
+from transcript.transcript_client import (
+    fetch_and_save_last_n_transcripts,
+    fetch_and_save_transcripts_batch,
+    transcript_cache,
+)
+from transcript.search_index import get_search_index
+from transcript.transcript_loader import (
+    load_json_transcripts,
+    load_transcripts_response,
+    loaded_cache,
+    response_cache,
+)
+from analysis.signal_extractor import extract_all_signals, iter_signals, sentiment_cache
+from analysis.cross_section import extract_batch_signals
+from analysis.embedding_index import get_passage_index, get_embedding_store
+from analysis.llm_signal_extractor import extract_all_together_signals, iter_together_signals
+from analysis.llm_client import LLMError, llm_cache, close_session as close_llm_session
+from analysis.model_registry import registry, resolve_revisions, REVISION_RETRY_SECONDS
+from api.workers import pools, run_in_pool, run_async_in_pool, PoolBusyError
+from api.singleflight import SingleFlight
+from jobs.job_queue import get_job_queue, DONE, FAILED
+from utils.metrics import metrics, profiling
+
+logger = logging.getLogger(__name__)
+
+# Comma-separated registry names to load at startup ("all" for everything);
+# otherwise models load on first use
+WARMUP_MODELS = os.getenv("WARMUP_MODELS", "")
+
+def _warmup_names():
+    names = [n.strip() for n in WARMUP_MODELS.split(",") if n.strip()]
+    return None if names == ["all"] else names
+
+async def _retry_revisions():
+    # model revisions the Hub could not resolve at startup (e.g. offline) are
+    # retried here, so requests never wait on the Hub
+    while True:
+        await asyncio.sleep(REVISION_RETRY_SECONDS)
+        if not await anyio.to_thread.run_sync(resolve_revisions):
+            return
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # model revisions resolve to commits before the first request
+    retry_revisions = None
+    if await anyio.to_thread.run_sync(resolve_revisions):
+        retry_revisions = asyncio.create_task(_retry_revisions())
+    if WARMUP_MODELS:
+        await anyio.to_thread.run_sync(registry.warm_up, _warmup_names())
+    # background jobs share the inference pool and coalescing with requests;
+    # start() also resumes jobs whose process went away
+    jobs = get_job_queue()
+    jobs.runner = _job_runner(asyncio.get_running_loop())
+    jobs.start()
+    yield
+    if retry_revisions:
+        retry_revisions.cancel()
+    jobs.stop()
+    await close_llm_session()
 
 app = FastAPI(
     title="Earnings Call Analyzer",
     description="Fetch & analyze NVIDIA earnings call transcripts",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -30,7 +94,36 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data"))
+request_seconds = metrics.histogram("earnings_http_request_seconds", "HTTP request latency")
+
+@app.middleware("http")
+async def add_timing_header(request: Request, call_next):
+    start = time.perf_counter()
+    response = await call_next(request)
+    elapsed = time.perf_counter() - start
+    response.headers["X-Process-Time"] = f"{elapsed:.4f}"
+    # route templates rather than raw paths keep label cardinality bounded
+    route = request.scope.get("route")
+    request_seconds.observe(elapsed, method=request.method,
+                            route=getattr(route, "path", "unmatched"), status=response.status_code)
+    logger.info("%s %s %d %.1fms", request.method, request.url.path, response.status_code, elapsed * 1000)
+    return response
+
+@app.exception_handler(PoolBusyError)
+async def pool_busy_handler(request: Request, exc: PoolBusyError):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+DATA_DIR = os.path.abspath(os.getenv("EARNINGS_DATA_DIR", os.path.join(os.path.dirname(__file__), "..", "data")))
+
+# concurrent identical requests to the expensive endpoints share one computation
+single_flights = {
+    "signals": SingleFlight("signals"),
+    "signals_llm": SingleFlight("signals_llm"),
+}
 
 @app.get("/")
 async def read_root():
@@ -43,22 +136,251 @@ async def get_nvidia_transcripts(ticker: str):
     saves them under src/data/, and returns their file paths (or errors).
     """
     try:
-        results = fetch_and_save_last_n_transcripts(ticker.upper(), 4)
+        results = await run_in_pool("fetch", fetch_and_save_last_n_transcripts, ticker.upper(), 4)
         return {"ticker": ticker.upper(), "results": results}
+    except PoolBusyError:
+        raise
     except Exception as e:
         # fallback for any unexpected error
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/saveTranscripts", summary="Get last n transcripts for several tickers")
+async def save_transcripts_batch(
+    tickers: List[str] = Query(..., description="Ticker symbols, repeated or comma-separated"),
+    n: int = Query(4, ge=1, le=40),
+):
+    """
+    Fetches the last n quarters for every ticker concurrently via API Ninjas,
+    saves them under src/data/, and returns per-ticker file paths (or errors).
+    """
+    symbols = [t.strip().upper() for raw in tickers for t in raw.split(",") if t.strip()]
+    if not symbols:
+        raise HTTPException(status_code=400, detail="No tickers given")
+    try:
+        results = await run_in_pool("fetch", fetch_and_save_transcripts_batch, symbols, n)
+        return {"tickers": symbols, "results": results}
+    except PoolBusyError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/cacheStats", summary="Transcript cache statistics")
+async def get_cache_stats():
+    """
+    Hits, misses and bytes saved by the on-disk transcript cache, plus the
+    in-memory parsed-transcript and response caches, the LLM answer cache
+    (including tokens and seconds saved) and the turn embedding store.
+    """
+    return {
+        "transcripts": transcript_cache.get_stats(),
+        "loaded_transcripts": loaded_cache.get_stats(),
+        "transcript_responses": response_cache.get_stats(),
+        "llm": llm_cache.get_stats(),
+        "embeddings": get_embedding_store().get_stats(),
+    }
+
+@app.get("/coalescing", summary="Request coalescing statistics")
+async def get_coalescing():
+    """
+    Per endpoint: calls, computations actually run, and requests that
+    joined an identical in-flight computation instead.
+    """
+    return {name: flight.get_stats() for name, flight in single_flights.items()}
+
+def _collect_service_metrics():
+    """
+    Scrape-time gauges and counters read from the existing stats objects.
+    """
+    caches = {
+        "transcripts": transcript_cache.stats,
+        "loaded_transcripts": loaded_cache.stats,
+        "transcript_responses": response_cache.stats,
+        "sentiment": sentiment_cache.stats,
+        "llm": llm_cache.stats,
+        "embeddings": get_embedding_store().stats,
+    }
+    yield ("earnings_cache_hits_total", "counter", "Cache hits",
+           [({"cache": name}, stats.get("hits", 0) + stats.get("negative_hits", 0)) for name, stats in caches.items()])
+    yield ("earnings_cache_misses_total", "counter", "Cache misses",
+           [({"cache": name}, stats.get("misses", 0)) for name, stats in caches.items()])
+    ratios = []
+    for name, stats in caches.items():
+        hits = stats.get("hits", 0) + stats.get("negative_hits", 0)
+        lookups = hits + stats.get("misses", 0)
+        ratios.append(({"cache": name}, hits / lookups if lookups else 0.0))
+    yield ("earnings_cache_hit_ratio", "gauge", "Cache hit ratio since start", ratios)
+
+    models = registry.get_stats()
+    yield ("earnings_model_loaded", "gauge", "Whether a model is loaded",
+           [({"model": name}, 1.0 if m["loaded"] else 0.0) for name, m in models.items()])
+    yield ("earnings_model_load_seconds", "gauge", "Model load time",
+           [({"model": name}, m["load_seconds"]) for name, m in models.items() if "load_seconds" in m])
+    yield ("earnings_model_rss_delta_bytes", "gauge", "Resident memory growth while loading a model",
+           [({"model": name}, m["rss_delta_bytes"]) for name, m in models.items() if "rss_delta_bytes" in m])
+
+    workers = {name: pool.get_stats() for name, pool in pools.items()}
+    for key, kind, help in (("running", "gauge", "Calls running on a worker pool"),
+                            ("queued", "gauge", "Calls waiting for a worker pool slot"),
+                            ("completed", "counter", "Calls completed by a worker pool"),
+                            ("failed", "counter", "Calls that raised on a worker pool"),
+                            ("rejected", "counter", "Calls rejected because the queue was full")):
+        name = f"earnings_worker_{key}" + ("_total" if kind == "counter" else "")
+        yield (name, kind, help, [({"pool": pool}, stats[key]) for pool, stats in workers.items()])
+
+    yield ("earnings_coalesced_requests_total", "counter", "Requests that joined an in-flight computation",
+           [({"endpoint": name}, f.stats["coalesced"]) for name, f in single_flights.items()])
+    yield ("earnings_inflight_computations", "gauge", "Distinct computations in flight",
+           [({"endpoint": name}, f.get_stats()["in_flight"]) for name, f in single_flights.items()])
+
+    active: Dict[str, int] = {}
+    for job in get_job_queue().store.list_active():
+        active[job["status"]] = active.get(job["status"], 0) + 1
+    yield ("earnings_jobs_active", "gauge", "Queued or running background jobs",
+           [({"status": status}, count) for status, count in active.items()])
+
+metrics.register_collector(_collect_service_metrics)
+
+@app.get("/metrics", summary="Prometheus metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """
+    Stage latency histograms and item counts, HTTP latency, cache hit
+    rates, model load times and worker queue depth in the Prometheus text
+    exposition format.
+    """
+    body = await run_in_pool("io", metrics.render)
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.get("/models", summary="Model load status")
+async def get_models():
+    """
+    Which models are loaded, with load time and resident-memory growth.
+    """
+    return registry.get_stats()
+
+@app.post("/models/warmup", summary="Load models now")
+async def warmup_models(names: List[str] = Query(None)):
+    """
+    Loads the given (default: all) models so later requests don't pay for it.
+    """
+    try:
+        return await anyio.to_thread.run_sync(registry.warm_up, names)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@app.get("/workers", summary="Worker pool status")
+async def get_workers():
+    """
+    Running / queued / rejected counts for each worker pool.
+    """
+    return {name: pool.get_stats() for name, pool in pools.items()}
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or etag in (t[2:] if t.startswith("W/") else t for t in tags)
+
 @app.get("/getTranscripts/{ticker}")
-async def get_transcripts(ticker: str):
-    data = load_json_transcripts(ticker.upper())
-    if not data:
+async def get_transcripts(
+    request: Request,
+    ticker: str,
+    quarter: Optional[str] = Query(None, description="Only this quarter, e.g. 2025Q1"),
+    section: Optional[str] = Query(None, description="preparedRemarks or qanda"),
+    speaker: Optional[str] = Query(None, description="Only this speaker's turns"),
+):
+    """
+    Serves the serialized transcripts with an ETag; a matching
+    If-None-Match gets 304 Not Modified.
+    """
+    try:
+        etag, body = await run_in_pool("io", load_transcripts_response, ticker.upper(),
+                                       [quarter] if quarter else None, section, speaker)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if body is None:
         raise HTTPException(404, "No transcripts found")
-    return data
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _search(q: str, tickers: Optional[List[str]], start: Optional[str], end: Optional[str],
+            limit: int) -> Dict[str, Any]:
+    return get_search_index().search(q, tickers, start, end, limit)
+
+@app.get("/search", summary="Full-text search across stored transcripts")
+async def search_transcripts(
+    q: str = Query(..., description='Words and "quoted phrases"; every one must occur'),
+    tickers: List[str] = Query(None, description="Ticker symbols, repeated or comma-separated"),
+    start: Optional[str] = Query(None, description="First quarter (2024Q1) or call date (2024-02-21)"),
+    end: Optional[str] = Query(None, description="Last quarter or call date"),
+    limit: int = Query(20, ge=0, le=500, description="Hits to return with snippets"),
+):
+    """
+    Which quarters and speakers mentioned the query, with per-quarter hit
+    counts and snippets for the first `limit` hits (newest first), served
+    from the inverted index over every stored transcript.
+    """
+    symbols = [t.strip().upper() for raw in tickers or [] for t in raw.split(",") if t.strip()] or None
+    try:
+        return await run_in_pool("io", _search, q, symbols, start, end, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _similar(q: str, tickers: Optional[List[str]], start: Optional[str], end: Optional[str],
+             limit: int) -> Dict[str, Any]:
+    return get_passage_index().similar(q, tickers, start, end, limit)
+
+@app.get("/similar", summary="Stored passages most similar to a text")
+async def similar_passages(
+    q: str = Query(..., description="Text to compare every stored speaker turn against"),
+    tickers: List[str] = Query(None, description="Ticker symbols, repeated or comma-separated"),
+    start: Optional[str] = Query(None, description="First quarter (2024Q1) or call date (2024-02-21)"),
+    end: Optional[str] = Query(None, description="Last quarter or call date"),
+    limit: int = Query(10, ge=1, le=100, description="Passages to return"),
+):
+    """
+    The speaker turns closest in meaning to `q` across tickers and
+    quarters, by cosine similarity of sentence embeddings. Turns are
+    embedded once and served from the embedding store afterwards.
+    """
+    symbols = [t.strip().upper() for raw in tickers or [] for t in raw.split(",") if t.strip()] or None
+    try:
+        return await run_in_pool("inference", _similar, q, symbols, start, end, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _themes(ticker: str, quarters: Optional[List[str]], top: int, min_similarity: Optional[float]) -> Dict[str, Any]:
+    index = get_passage_index()
+    if min_similarity is None:
+        return index.themes(ticker, quarters, top)
+    return index.themes(ticker, quarters, top, min_similarity)
 
+@app.get("/themes/{ticker}", summary="Top strategic themes per quarter by embedding similarity")
+async def get_themes(
+    ticker: str,
+    quarters: List[str] = Query(None, description="Only these quarters, e.g. 2025Q1"),
+    top: int = Query(5, ge=1, le=50, description="Themes per quarter"),
+    min_similarity: Optional[float] = Query(None, ge=-1.0, le=1.0,
+                                            description="Least similarity for a turn to count toward an area"),
+):
+    """
+    Per quarter, the strategic areas of the ticker's taxonomy that its
+    speaker turns are closest to, by share of spoken words, with the
+    closest turn for each. Paraphrases count without a literal keyword.
+    """
+    result = await run_in_pool("inference", _themes, ticker, quarters, top, min_similarity)
+    if not result["quarters"]:
+        raise HTTPException(404, "No transcripts found")
+    return result
 
 @app.get("/signals/{ticker}", response_model=Dict[str, Any])
-async def get_signals(ticker: str):
+async def get_signals(
+    ticker: str,
+    full: bool = Query(False, description="Recompute every quarter"),
+    profile: bool = Query(False, description="Add a per-stage timing breakdown"),
+):
     """
     Returns section-level sentiment, strategic focuses, and quarter-over-quarter tone shifts for given ticker.
     {
@@ -72,20 +394,144 @@ async def get_signals(ticker: str):
       },
       "qoq_tone_change": { <prev_to_cur>: {...deltas...}, ... }
     }
+    With `profile`, the response also has "profile": {"wall_seconds",
+    "stages": {stage: {"seconds", "calls", "items"}}}.
     """
+    if profile:
+        return await _profiled(_compute_signals, ticker.upper(), full)
+    return await single_flights["signals"].do((ticker.upper(), full), _compute_signals, ticker.upper(), full)
+
+async def _profiled(compute, *args) -> Dict[str, Any]:
+    # run outside the single-flight so every recorded span is this request's
+    with profiling() as prof:
+        result = await compute(*args)
+    return {**result, "profile": prof.breakdown()}
+
+async def _compute_signals(ticker: str, full: bool) -> Dict[str, Any]:
     # Load structured transcripts JSON
-    transcripts = load_json_transcripts(ticker.upper())
+    transcripts = await run_in_pool("io", load_json_transcripts, ticker)
     if not transcripts:
         raise HTTPException(status_code=404, detail="No transcripts found for ticker")
 
-    # Extract NLP signals and QoQ changes
-    result = extract_all_signals(ticker.upper(), transcripts)
-    return result
+    # Extract NLP signals and QoQ changes on the inference pool
+    return await run_in_pool("inference", extract_all_signals, ticker, transcripts, None, not full)
 
+def _wants_sse(request: Request, format: Optional[str]) -> bool:
+    if format:
+        return format == "sse"
+    return "text/event-stream" in request.headers.get("accept", "")
 
-@app.get("/analysis/{ticker}", response_model=dict)
-async def get_analysis(ticker: str):
-    pattern = os.path.join(DATA_DIR, f"analysis_{ticker.upper()}.txt")
+def _encode_event(event: Dict[str, Any], sse: bool) -> str:
+    data = json.dumps(event, ensure_ascii=False)
+    return f"event: {event['type']}\ndata: {data}\n\n" if sse else data + "\n"
+
+async def _stream_events(request: Request, events: AsyncIterator[Dict[str, Any]],
+                         format: Optional[str]) -> StreamingResponse:
+    """
+    NDJSON (default) or Server-Sent Events response over `events`. The
+    first event is awaited before responding, so a full queue (429) or a
+    provider error still gets a proper status; later failures become a
+    final {"type": "error"} event.
+    """
+    sse = _wants_sse(request, format)
+    try:
+        first = await events.__anext__()
+    except StopAsyncIteration:
+        first = None
+    except BaseException:
+        await events.aclose()
+        raise
+
+    async def body():
+        async with aclosing(events):
+            if first is None:
+                return
+            yield _encode_event(first, sse)
+            try:
+                async for event in events:
+                    yield _encode_event(event, sse)
+            except (LLMError, HTTPException) as e:
+                yield _encode_event({"type": "error", "detail": str(getattr(e, "detail", e))}, sse)
+            except Exception:
+                logger.exception("signal stream failed")
+                yield _encode_event({"type": "error", "detail": "Internal error"}, sse)
+
+    return StreamingResponse(body(), media_type="text/event-stream" if sse else "application/x-ndjson",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.get("/signals/{ticker}/stream", summary="Signals per quarter as they are computed")
+async def stream_signals(
+    request: Request,
+    ticker: str,
+    full: bool = Query(False, description="Recompute every quarter"),
+    format: Optional[str] = Query(None, pattern="^(ndjson|sse)$",
+                                  description="ndjson (default) or sse; text/event-stream in Accept also selects sse"),
+):
+    """
+    Same analysis as /signals/{ticker}, streamed as one event per line:
+    {"type": "quarter", "quarter", "signals", "cached"} for each quarter,
+    {"type": "qoq", "edge", "delta"} for each QoQ tone shift once both its
+    quarters are known, then {"type": "done"}. Quarters reused from the
+    stored analysis are sent first; each changed quarter follows as soon
+    as its own inference finishes. Not coalesced with /signals.
+    """
+    transcripts = await run_in_pool("io", load_json_transcripts, ticker.upper())
+    if not transcripts:
+        raise HTTPException(status_code=404, detail="No transcripts found for ticker")
+    events = pools["inference"].stream(iter_signals(ticker.upper(), transcripts, not full))
+    return await _stream_events(request, events, format)
+
+@app.get("/signals_llm/{ticker}/stream", summary="LLM sentiment per quarter as it is classified")
+async def stream_together_signals(
+    request: Request,
+    ticker: str,
+    refresh: bool = Query(False, description="Bypass cached LLM answers"),
+    format: Optional[str] = Query(None, pattern="^(ndjson|sse)$",
+                                  description="ndjson (default) or sse; text/event-stream in Accept also selects sse"),
+):
+    """
+    /signals_llm/{ticker} as a stream of {"type": "quarter", "quarter",
+    "signals"} events in completion order (cached answers first), then
+    {"type": "done"}.
+    """
+    transcripts = await run_in_pool("io", load_json_transcripts, ticker.upper())
+    if not transcripts:
+        raise HTTPException(404, "No transcripts found")
+
+    async def events():
+        async with aclosing(iter_together_signals(transcripts, refresh)) as quarters:
+            async for quarter, signals in quarters:
+                yield {"type": "quarter", "quarter": quarter, "signals": signals}
+        yield {"type": "done", "quarters": len(transcripts)}
+
+    try:
+        return await _stream_events(request, pools["llm"].stream(events()), format)
+    except LLMError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+
+
+class BatchSignalsRequest(BaseModel):
+    tickers: List[str]
+    full: bool = False
+    # optional per-ticker taxonomy overrides: {ticker: {area: [keywords]}}
+    areas: Optional[Dict[str, Dict[str, List[str]]]] = None
+
+@app.post("/signals/batch", summary="Signals and cross-section for several tickers")
+async def get_batch_signals(request: BatchSignalsRequest):
+    """
+    Per-ticker signals (as /signals/{ticker}) for every ticker in one
+    batched pipeline, plus a cross-sectional table: positive-sentiment
+    z-scores per quarter and tickers ranked by QoQ tone shift.
+    """
+    tickers = [t.strip().upper() for t in request.tickers if t.strip()]
+    if not tickers:
+        raise HTTPException(status_code=400, detail="No tickers given")
+    areas = {t.upper(): a for t, a in (request.areas or {}).items()}
+    return await run_in_pool("inference", extract_batch_signals, tickers, None, areas, not request.full)
+
+
+def _read_analysis(ticker: str) -> Dict[str, Any]:
+    pattern = os.path.join(DATA_DIR, f"analysis_{ticker}.txt")
     result: Dict[str, Any] = {}
     for path in sorted(glob.glob(pattern), reverse=True):
         filename = os.path.basename(path)
@@ -93,19 +539,99 @@ async def get_analysis(ticker: str):
             result = json.load(f)
     return result
 
+@app.get("/analysis/{ticker}", response_model=dict)
+async def get_analysis(ticker: str):
+    return await run_in_pool("io", _read_analysis, ticker.upper())
+
 @app.get("/signals_llm/{ticker}", response_model=Dict[str, Any])
-async def get_together_signals(ticker: str):
+async def get_together_signals(
+    ticker: str,
+    refresh: bool = Query(False, description="Bypass cached LLM answers"),
+    profile: bool = Query(False, description="Add a per-stage timing breakdown"),
+):
     """
     LLM‑based sentiment for each quarter, powered by Together.ai.
+    All quarters and sections are classified concurrently; answers come
+    from the LLM cache unless `refresh` is set. `profile` adds a stage
+    breakdown as for /signals.
     """
-    transcripts = load_json_transcripts(ticker.upper())
+    if profile:
+        return await _profiled(_compute_together_signals, ticker.upper(), refresh)
+    return await single_flights["signals_llm"].do(
+        (ticker.upper(), refresh), _compute_together_signals, ticker.upper(), refresh)
+
+async def _compute_together_signals(ticker: str, refresh: bool) -> Dict[str, Any]:
+    transcripts = await run_in_pool("io", load_json_transcripts, ticker)
     if not transcripts:
         raise HTTPException(404, "No transcripts found")
 
-    out = {}
-    for quarter, tr in transcripts.items():
-        out[quarter] = extract_together_signals(tr)
-    return out
+    try:
+        return await run_async_in_pool("llm", extract_all_together_signals, transcripts, refresh)
+    except LLMError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+
+async def _compute_job_signals(ticker: str, transcripts: Dict[str, Any], progress) -> Dict[str, Any]:
+    return await run_in_pool("inference", extract_all_signals, ticker, transcripts, progress, True)
+
+def _job_runner(loop: asyncio.AbstractEventLoop):
+    """
+    Job-queue runner (called on a job thread) that analyses a ticker the
+    way GET /signals does: on the inference pool, coalesced with identical
+    in-flight /signals requests. A full pool queue makes the job wait and
+    retry instead of failing.
+    """
+    def run(ticker: str, transcripts: Dict[str, Any], progress) -> Dict[str, Any]:
+        while True:
+            future = asyncio.run_coroutine_threadsafe(
+                single_flights["signals"].do((ticker, False), _compute_job_signals, ticker, transcripts, progress),
+                loop)
+            try:
+                while True:
+                    try:
+                        return future.result(timeout=1.0)
+                    except concurrent.futures.TimeoutError:
+                        if loop.is_closed():
+                            raise RuntimeError("API shut down while the job was running")
+            except PoolBusyError as e:
+                time.sleep(e.retry_after)
+    return run
+
+class JobRequest(BaseModel):
+    tickers: List[str]
+
+@app.post("/jobs", status_code=202, summary="Queue signal analysis")
+async def submit_job(request: JobRequest):
+    """
+    Queues /signals-style analysis for one or many tickers and returns a job
+    ID right away. An identical job already queued or running is reused.
+    """
+    tickers = [t.strip().upper() for t in request.tickers if t.strip()]
+    if not tickers:
+        raise HTTPException(status_code=400, detail="No tickers given")
+    job = get_job_queue().submit(tickers)
+    return {"job_id": job["id"], "status": job["status"], "deduplicated": job["deduplicated"]}
+
+@app.get("/jobs/{job_id}", summary="Job status and progress")
+async def get_job(job_id: str):
+    """
+    Status plus per-ticker progress: the sections completed for each quarter.
+    """
+    status = get_job_queue().status(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    return status
+
+@app.get("/jobs/{job_id}/result", summary="Job result")
+async def get_job_result(job_id: str):
+    """
+    The per-ticker signals once the job is done; 409 while it is still running.
+    """
+    job = get_job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    if job["status"] not in (DONE, FAILED):
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}")
+    return {"job_id": job_id, "status": job["status"], "results": job["result"], "errors": job["error"]}
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,44 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key onto one computation:
+    the first caller starts it, later callers await the same result (or
+    exception) until it finishes. The computation runs as its own task, so
+    a caller that disconnects does not cancel it for the others.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self.stats = {"calls": 0, "executions": 0, "coalesced": 0, "failed": 0}
+
+    async def do(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        self.stats["calls"] += 1
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn(*args))
+            self._inflight[key] = task
+            self.stats["executions"] += 1
+            task.add_done_callback(lambda t: self._finished(key, t))
+        else:
+            self.stats["coalesced"] += 1
+        return await asyncio.shield(task)
+
+    def _finished(self, key: Hashable, task: "asyncio.Future[Any]") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # retrieve the exception so it is not reported as unhandled when
+        # every waiter has gone away
+        if not task.cancelled() and task.exception() is not None:
+            self.stats["failed"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        calls = self.stats["calls"]
+        return {
+            **self.stats,
+            "in_flight": len(self._inflight),
+            "coalesced_ratio": self.stats["coalesced"] / calls if calls else 0.0,
+        }
@@ -0,0 +1,141 @@
+import os
+import time
+import threading
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, Union
+
+import anyio
+
+
+class PoolBusyError(Exception):
+    """
+    Raised when a pool's queue is full; the API maps it to 429.
+    """
+
+    def __init__(self, pool: str, retry_after: int = 1):
+        super().__init__(f"Too many queued '{pool}' requests, retry later")
+        self.pool = pool
+        self.retry_after = retry_after
+
+
+class WorkerPool:
+    """
+    Runs blocking callables on worker threads so the event loop stays free.
+    At most `concurrency` calls run at once; up to `queue_limit` more wait
+    for a slot, and anything beyond that is rejected with PoolBusyError.
+    """
+
+    def __init__(self, name: str, concurrency: int, queue_limit: int):
+        self.name = name
+        self.concurrency = concurrency
+        self.queue_limit = queue_limit
+        self._limiter = None
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.stats = {"completed": 0, "failed": 0, "rejected": 0, "busy_seconds": 0.0}
+
+    @property
+    def limiter(self) -> anyio.CapacityLimiter:
+        # created lazily so it binds to the running event loop
+        if self._limiter is None:
+            self._limiter = anyio.CapacityLimiter(self.concurrency)
+        return self._limiter
+
+    @asynccontextmanager
+    async def _slot(self) -> AsyncIterator[None]:
+        with self._lock:
+            if self.pending >= self.concurrency + self.queue_limit:
+                self.stats["rejected"] += 1
+                raise PoolBusyError(self.name)
+            self.pending += 1
+        start = time.perf_counter()
+        try:
+            yield
+            self.stats["completed"] += 1
+        except Exception:
+            self.stats["failed"] += 1
+            raise
+        finally:
+            with self._lock:
+                self.pending -= 1
+                self.stats["busy_seconds"] += time.perf_counter() - start
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        async with self._slot():
+            return await anyio.to_thread.run_sync(fn, *args, limiter=self.limiter)
+
+    async def run_async(self, fn: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        """
+        Same admission control for a coroutine function, which runs on the
+        event loop while holding one of the pool's slots.
+        """
+        async with self._slot():
+            async with self.limiter:
+                return await fn(*args)
+
+    async def stream(self, items: Union[Iterator[Any], AsyncIterator[Any]]) -> AsyncIterator[Any]:
+        """
+        Yields from a blocking iterator, stepping it on worker threads, or
+        from an async iterator, under one slot held for the whole stream.
+        Each step takes the limiter separately (a response may consume the
+        stream from another task), so other calls on the pool can run
+        between items.
+        """
+        async with self._slot():
+            done = object()
+            try:
+                while True:
+                    if hasattr(items, "__anext__"):
+                        async with self.limiter:
+                            item = await anext(items, done)
+                    else:
+                        item = await anyio.to_thread.run_sync(next, items, done, limiter=self.limiter)
+                    if item is done:
+                        return
+                    yield item
+            finally:
+                # shielded so a cancelled response still releases the
+                # iterator; a blocking close runs on a worker thread too
+                with anyio.CancelScope(shield=True):
+                    if hasattr(items, "aclose"):
+                        await items.aclose()
+                    elif hasattr(items, "close"):
+                        await anyio.to_thread.run_sync(items.close, limiter=self.limiter)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "concurrency": self.concurrency,
+            "queue_limit": self.queue_limit,
+            "running": min(self.pending, self.concurrency),
+            "queued": max(self.pending - self.concurrency, 0),
+            **self.stats,
+        }
+
+
+def _pool(name: str, concurrency: int, queue_limit: int) -> WorkerPool:
+    """
+    Pool sized from WORKERS_<NAME>_CONCURRENCY / WORKERS_<NAME>_QUEUE.
+    """
+    prefix = f"WORKERS_{name.upper()}"
+    return WorkerPool(
+        name,
+        int(os.getenv(f"{prefix}_CONCURRENCY", str(concurrency))),
+        int(os.getenv(f"{prefix}_QUEUE", str(queue_limit))),
+    )
+
+
+# one pool per resource type
+pools: Dict[str, WorkerPool] = {
+    "inference": _pool("inference", 1, 8),   # torch already uses all cores per call
+    "llm": _pool("llm", 4, 32),              # /signals_llm requests (async Together.ai calls)
+    "fetch": _pool("fetch", 2, 16),          # API-Ninjas downloads
+    "io": _pool("io", 16, 256),              # local file reads/writes
+}
+
+
+async def run_in_pool(pool: str, fn: Callable[..., Any], *args: Any) -> Any:
+    return await pools[pool].run(fn, *args)
+
+
+async def run_async_in_pool(pool: str, fn: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+    return await pools[pool].run_async(fn, *args)
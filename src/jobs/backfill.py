@@ -0,0 +1,375 @@
+"""
+Historical backfill: fetches, stores and analyzes every quarter of a date
+range for a list of tickers.
+
+    cd src && python -m jobs.backfill --tickers NVDA,AMD --start 2015Q1 [--end 2025Q2]
+    cd src && python -m jobs.backfill --tickers-file tickers.txt --start 2015Q1 --no-analyze
+
+The stages run concurrently, connected by bounded queues so a slow stage
+holds the earlier ones back instead of buffering without limit:
+
+    fetch (--fetch-workers threads, rate-limited; responses are parsed as
+    they stream in and written to src/data/)
+      -> parse (loads a ticker's stored transcripts once all of its
+         quarters in the range are fetched)
+      -> analyze (extract_all_signals, one ticker at a time)
+
+Progress is checkpointed to a manifest (default src/data/backfill_manifest.json).
+A killed run started again with the same arguments skips quarters already
+fetched (or known to be unavailable) and tickers already analyzed with the
+same quarters.
+"""
+import os
+import re
+import sys
+import json
+import time
+import queue
+import argparse
+import threading
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from transcript.transcript_client import (
+    fetch_and_save_transcript,
+    get_last_n_quarters,
+    TranscriptUnavailableError,
+    MAX_PARALLEL_FETCHES,
+    MAX_RETRIES,
+    REQUEST_TIMEOUT,
+)
+from transcript.transcript_cache import is_finalized_quarter
+from transcript.transcript_loader import load_json_transcripts
+from analysis.signal_extractor import extract_all_signals
+from utils.fileio import atomic_write_text
+
+DATA_DIR = os.path.abspath(os.getenv("EARNINGS_DATA_DIR", os.path.join(os.path.dirname(__file__), "..", "data")))
+DEFAULT_MANIFEST = os.path.join(DATA_DIR, "backfill_manifest.json")
+
+# items buffered between stages; the analyze queue holds whole tickers' transcripts
+QUEUE_SIZE = int(os.getenv("BACKFILL_QUEUE_SIZE", "64"))
+ANALYZE_QUEUE_SIZE = int(os.getenv("BACKFILL_ANALYZE_QUEUE_SIZE", "2"))
+# seconds between manifest checkpoints
+CHECKPOINT_INTERVAL = float(os.getenv("BACKFILL_CHECKPOINT_INTERVAL", "5"))
+
+OK, UNAVAILABLE, ERROR = "ok", "unavailable", "error"
+_QUARTER = re.compile(r"^(\d{4})Q([1-4])$")
+_DONE = object()
+
+
+def parse_quarter(value: str) -> Tuple[int, int]:
+    match = _QUARTER.match(value.strip().upper())
+    if not match:
+        raise argparse.ArgumentTypeError(f"expected YYYYQn, got {value!r}")
+    return int(match.group(1)), int(match.group(2))
+
+
+def quarter_range(start: Tuple[int, int], end: Tuple[int, int]) -> List[Tuple[int, int]]:
+    """
+    (year, quarter) pairs from `start` to `end` inclusive, newest first
+    (the order get_last_n_quarters uses).
+    """
+    quarters = []
+    year, quarter = end
+    while (year, quarter) >= start:
+        quarters.append((year, quarter))
+        year, quarter = (year - 1, 4) if quarter == 1 else (year, quarter - 1)
+    return quarters
+
+
+class Manifest:
+    """
+    Backfill checkpoint persisted as JSON:
+      {"fetched":  {ticker: {"YYYYQn": {"status", "at", ["error"]}}},
+       "analyzed": {ticker: {"quarters": [...], "at": ...}}}
+    Errors are recorded but retried on the next run; quarters that are
+    unavailable are only skipped once the quarter is finalized.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._saved_at = 0.0
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.data = {}
+        self.data.setdefault("fetched", {})
+        self.data.setdefault("analyzed", {})
+
+    def is_fetched(self, ticker: str, year: int, quarter: int) -> bool:
+        with self._lock:
+            entry = self.data["fetched"].get(ticker, {}).get(f"{year}Q{quarter}")
+        if entry is None:
+            return False
+        return entry["status"] == OK or (entry["status"] == UNAVAILABLE and is_finalized_quarter(year, quarter))
+
+    def record_fetch(self, ticker: str, year: int, quarter: int, status: str, error: str = None) -> None:
+        entry = {"status": status, "at": time.time()}
+        if error:
+            entry["error"] = error
+        with self._lock:
+            self.data["fetched"].setdefault(ticker, {})[f"{year}Q{quarter}"] = entry
+            self._dirty = True
+
+    def fetched_quarters(self, ticker: str) -> List[str]:
+        with self._lock:
+            return sorted(q for q, e in self.data["fetched"].get(ticker, {}).items() if e["status"] == OK)
+
+    def is_analyzed(self, ticker: str, quarters: List[str]) -> bool:
+        with self._lock:
+            return self.data["analyzed"].get(ticker, {}).get("quarters") == quarters
+
+    def record_analyzed(self, ticker: str, quarters: List[str]) -> None:
+        with self._lock:
+            self.data["analyzed"][ticker] = {"quarters": quarters, "at": time.time()}
+            self._dirty = True
+
+    def save(self, force: bool = False) -> None:
+        """
+        Writes the manifest if it changed and CHECKPOINT_INTERVAL has passed
+        since the last write (or `force`).
+        """
+        with self._lock:
+            if not self._dirty or (not force and time.time() - self._saved_at < CHECKPOINT_INTERVAL):
+                return
+            atomic_write_text(self.path, json.dumps(self.data, ensure_ascii=False))
+            self._dirty = False
+            self._saved_at = time.time()
+
+
+class Progress:
+    """
+    Counters shared by the stages, reported as throughput and ETA.
+    """
+
+    def __init__(self, quarters_total: int, tickers_total: int):
+        self.started = time.time()
+        self.quarters_total = quarters_total
+        self.tickers_total = tickers_total
+        self.counts = {"fetched": 0, "skipped": 0, "unavailable": 0, "errors": 0,
+                       "analyzed": 0, "analysis_skipped": 0, "analysis_errors": 0}
+        self._lock = threading.Lock()
+
+    def add(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counts[key] += amount
+
+    def line(self, queues: Dict[str, "queue.Queue"]) -> str:
+        with self._lock:
+            c = dict(self.counts)
+        elapsed = max(time.time() - self.started, 1e-9)
+        # skipped work costs nothing, so rates and ETA only count real work
+        fetch_done = c["fetched"] + c["unavailable"] + c["errors"]
+        quarters_left = self.quarters_total - fetch_done - c["skipped"]
+        tickers_done = c["analyzed"] + c["analysis_skipped"] + c["analysis_errors"]
+        tickers_left = self.tickers_total - tickers_done
+        fetch_rate = fetch_done / elapsed
+        analyze_rate = c["analyzed"] / elapsed
+        etas = []
+        if quarters_left:
+            etas.append(quarters_left / fetch_rate if fetch_rate else float("inf"))
+        if tickers_left and c["analyzed"]:
+            etas.append(tickers_left / analyze_rate)
+        eta = max(etas) if etas else 0.0
+        depth = " ".join(f"{name}={q.qsize()}" for name, q in queues.items())
+        return (
+            f"[{elapsed:7.0f}s] quarters {fetch_done + c['skipped']}/{self.quarters_total} "
+            f"({c['fetched']} fetched, {c['skipped']} skipped, {c['unavailable']} unavailable, {c['errors']} errors) "
+            f"{fetch_rate:.2f}/s | tickers {tickers_done}/{self.tickers_total} {analyze_rate * 60:.1f}/min | "
+            f"queues {depth} | ETA {_format_eta(eta)}"
+        )
+
+
+def _format_eta(seconds: float) -> str:
+    if seconds == float("inf"):
+        return "unknown"
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:d}:{minutes:02d}:{secs:02d}"
+
+
+def run_backfill(tickers: Iterable[str], quarters: List[Tuple[int, int]],
+                 manifest_path: str = DEFAULT_MANIFEST, analyze: bool = True,
+                 fetch_workers: int = MAX_PARALLEL_FETCHES, queue_size: int = QUEUE_SIZE,
+                 report_every: float = 10.0, out=sys.stdout) -> Dict[str, Any]:
+    """
+    Runs the fetch -> parse -> analyze pipeline for every ticker and
+    quarter, resuming from `manifest_path`. Returns the final counters.
+    """
+    tickers = list(dict.fromkeys(t.strip().upper() for t in tickers if t.strip()))
+    manifest = Manifest(manifest_path)
+    progress = Progress(len(tickers) * len(quarters), len(tickers) if analyze else 0)
+    stop = threading.Event()
+
+    fetch_q: "queue.Queue" = queue.Queue(maxsize=queue_size)
+    parse_q: "queue.Queue" = queue.Queue(maxsize=queue_size)
+    analyze_q: "queue.Queue" = queue.Queue(maxsize=ANALYZE_QUEUE_SIZE)
+    queues = {"fetch": fetch_q, "parse": parse_q, "analyze": analyze_q}
+
+    def put(q: "queue.Queue", item: Any) -> bool:
+        # blocks while the next stage is behind, but gives up on stop
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def get(q: "queue.Queue") -> Any:
+        # waits for the previous stage, but returns None on stop
+        while not stop.is_set():
+            try:
+                return q.get(timeout=0.5)
+            except queue.Empty:
+                continue
+        return None
+
+    def produce() -> None:
+        # ticker-major order so whole tickers reach analysis early
+        for ticker in tickers:
+            for year, quarter in quarters:
+                if manifest.is_fetched(ticker, year, quarter):
+                    progress.add("skipped")
+                    item = (ticker, year, quarter, None)
+                    if not put(parse_q, item):
+                        return
+                elif not put(fetch_q, (ticker, year, quarter)):
+                    return
+        for _ in range(fetch_workers):
+            put(fetch_q, _DONE)
+
+    def fetch() -> None:
+        while True:
+            item = get(fetch_q)
+            if item is None:
+                return
+            if item is _DONE:
+                put(parse_q, _DONE)
+                return
+            ticker, year, quarter = item
+            try:
+                fetch_and_save_transcript(ticker, year, quarter)
+                manifest.record_fetch(ticker, year, quarter, OK)
+                progress.add("fetched")
+                status = OK
+            except TranscriptUnavailableError:
+                manifest.record_fetch(ticker, year, quarter, UNAVAILABLE)
+                progress.add("unavailable")
+                status = UNAVAILABLE
+            except Exception as e:
+                manifest.record_fetch(ticker, year, quarter, ERROR, str(e))
+                progress.add("errors")
+                status = ERROR
+            put(parse_q, (ticker, year, quarter, status))
+            manifest.save()
+
+    def parse() -> None:
+        # a ticker moves on once every quarter in the range has come back
+        remaining = {t: len(quarters) for t in tickers}
+        finished_fetchers = 0
+        while finished_fetchers < fetch_workers:
+            item = get(parse_q)
+            if item is None:
+                return
+            if item is _DONE:
+                finished_fetchers += 1
+                continue
+            ticker = item[0]
+            remaining[ticker] -= 1
+            if remaining[ticker] == 0 and analyze:
+                stored = manifest.fetched_quarters(ticker)
+                if not stored or manifest.is_analyzed(ticker, stored):
+                    progress.add("analysis_skipped")
+                    continue
+                try:
+                    transcripts = load_json_transcripts(ticker)
+                except Exception as e:
+                    progress.add("analysis_errors")
+                    print(f"{ticker}: loading transcripts failed: {e}", file=out, flush=True)
+                    continue
+                if not put(analyze_q, (ticker, stored, transcripts)):
+                    return
+        if analyze:
+            put(analyze_q, _DONE)
+
+    def analyze_stage() -> None:
+        while True:
+            item = get(analyze_q)
+            if item is None or item is _DONE:
+                return
+            ticker, stored, transcripts = item
+            try:
+                extract_all_signals(ticker, transcripts)
+                manifest.record_analyzed(ticker, stored)
+                progress.add("analyzed")
+            except Exception as e:
+                progress.add("analysis_errors")
+                print(f"{ticker}: analysis failed: {e}", file=out, flush=True)
+            manifest.save()
+
+    threads = [threading.Thread(target=produce, name="backfill-produce", daemon=True),
+               threading.Thread(target=parse, name="backfill-parse", daemon=True)]
+    threads += [threading.Thread(target=fetch, name=f"backfill-fetch-{i}", daemon=True)
+                for i in range(fetch_workers)]
+    if analyze:
+        threads.append(threading.Thread(target=analyze_stage, name="backfill-analyze", daemon=True))
+    for thread in threads:
+        thread.start()
+
+    last_report = time.time()
+    try:
+        while any(t.is_alive() for t in threads):
+            time.sleep(0.2)
+            if time.time() - last_report >= report_every:
+                print(progress.line(queues), file=out, flush=True)
+                last_report = time.time()
+    except KeyboardInterrupt:
+        stop.set()
+        print("Interrupted; finishing in-flight requests (Ctrl-C again to quit now)", file=out, flush=True)
+        # downloads in progress still land in the manifest and leave no temp files
+        deadline = time.time() + REQUEST_TIMEOUT * (MAX_RETRIES + 1)
+        for thread in threads:
+            if thread.name.startswith("backfill-fetch"):
+                thread.join(timeout=max(deadline - time.time(), 0))
+        print("Progress saved; rerun the same command to resume", file=out, flush=True)
+    finally:
+        manifest.save(force=True)
+    print(progress.line(queues), file=out, flush=True)
+    return progress.counts
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Backfill historical transcripts and signals.")
+    parser.add_argument("--tickers", default="", help="comma-separated ticker symbols")
+    parser.add_argument("--tickers-file", help="file with one ticker per line")
+    parser.add_argument("--start", type=parse_quarter, required=True, help="first quarter, e.g. 2015Q1")
+    parser.add_argument("--end", type=parse_quarter, default=None, help="last quarter (default: current)")
+    parser.add_argument("--manifest", default=DEFAULT_MANIFEST)
+    parser.add_argument("--fetch-workers", type=int, default=MAX_PARALLEL_FETCHES)
+    parser.add_argument("--queue-size", type=int, default=QUEUE_SIZE)
+    parser.add_argument("--no-analyze", action="store_true", help="only fetch and store transcripts")
+    parser.add_argument("--report-every", type=float, default=10.0, help="seconds between progress lines")
+    args = parser.parse_args(argv)
+
+    tickers = [t for t in args.tickers.split(",") if t.strip()]
+    if args.tickers_file:
+        with open(args.tickers_file, "r", encoding="utf-8") as f:
+            tickers += [line.split("#")[0].strip() for line in f if line.split("#")[0].strip()]
+    if not tickers:
+        parser.error("no tickers given (--tickers or --tickers-file)")
+    end = args.end or get_last_n_quarters(1)[0]
+    quarters = quarter_range(args.start, end)
+    if not quarters:
+        parser.error("--start is after --end")
+
+    print(f"Backfilling {len(set(t.upper() for t in tickers))} ticker(s) x {len(quarters)} quarter(s) "
+          f"({args.start[0]}Q{args.start[1]}..{end[0]}Q{end[1]}), manifest {args.manifest}", flush=True)
+    run_backfill(tickers, quarters, args.manifest, not args.no_analyze,
+                 args.fetch_workers, args.queue_size, args.report_every)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,387 @@
+import os
+import copy
+import json
+import time
+import uuid
+import socket
+import sqlite3
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, Iterable, List, Optional
+
+from transcript.transcript_loader import load_json_transcripts
+from analysis.signal_extractor import extract_all_signals, SIGNAL_SECTIONS
+
+DATA_DIR = os.path.abspath(os.getenv("EARNINGS_DATA_DIR", os.path.join(os.path.dirname(__file__), "..", "data")))
+
+# "memory" keeps jobs in-process; "sqlite" persists them to DATA_DIR/jobs.sqlite
+JOBS_BACKEND = os.getenv("JOBS_BACKEND", "memory")
+JOBS_WORKERS = int(os.getenv("JOBS_WORKERS", "1"))
+# an active job is leased to the process that runs it, which renews the
+# lease while it lives; once a lease lapses any queue may take the job over
+JOBS_LEASE_SECONDS = float(os.getenv("JOBS_LEASE_SECONDS", "60"))
+# finished jobs are dropped after JOBS_FINISHED_TTL seconds, and beyond the
+# newest JOBS_MAX_FINISHED
+JOBS_FINISHED_TTL = float(os.getenv("JOBS_FINISHED_TTL", str(24 * 3600)))
+JOBS_MAX_FINISHED = int(os.getenv("JOBS_MAX_FINISHED", "1000"))
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+ACTIVE_STATES = (QUEUED, RUNNING)
+FINISHED_STATES = (DONE, FAILED)
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryJobStore:
+    """
+    Jobs held in a dict; lost when the process exits.
+    """
+
+    def __init__(self):
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        # job id -> (owner, lease expiry)
+        self._leases: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def save(self, job: Dict[str, Any]) -> None:
+        self._jobs[job["id"]] = job
+
+    def claim(self, job_id: str, owner: str, until: float) -> bool:
+        with self._lock:
+            holder, expiry = self._leases.get(job_id, (None, 0.0))
+            if holder not in (None, owner) and expiry >= time.time():
+                return False
+            self._leases[job_id] = (owner, until)
+            return True
+
+    def renew(self, owner: str, job_ids: Iterable[str], until: float) -> None:
+        with self._lock:
+            for job_id in job_ids:
+                if self._leases.get(job_id, (None,))[0] == owner:
+                    self._leases[job_id] = (owner, until)
+
+    def list_expired(self) -> List[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            return [job for job in self.list_active() if self._leases.get(job["id"], (None, 0.0))[1] < now]
+
+    def prune(self, ttl: float, keep: int) -> int:
+        with self._lock:
+            finished = sorted((j for j in self._jobs.values() if j["status"] in FINISHED_STATES),
+                              key=lambda j: j.get("finished_at") or 0.0, reverse=True)
+            cutoff = time.time() - ttl
+            drop = [j["id"] for i, j in enumerate(finished) if i >= keep or (j.get("finished_at") or 0.0) < cutoff]
+            for job_id in drop:
+                self._jobs.pop(job_id, None)
+                self._leases.pop(job_id, None)
+            return len(drop)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self._jobs.get(job_id)
+
+    def find_active(self, key: str) -> Optional[Dict[str, Any]]:
+        for job in self._jobs.values():
+            if job["key"] == key and job["status"] in ACTIVE_STATES:
+                return job
+        return None
+
+    def list_active(self) -> List[Dict[str, Any]]:
+        return [job for job in self._jobs.values() if job["status"] in ACTIVE_STATES]
+
+
+class SqliteJobStore:
+    """
+    Jobs persisted as JSON rows, so queued work survives a restart.
+    """
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, key TEXT, status TEXT, "
+            "updated_at REAL, body TEXT, owner TEXT, lease_until REAL)"
+        )
+        # stores created before leases existed
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        for column, kind in (("owner", "TEXT"), ("lease_until", "REAL")):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {kind}")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_key ON jobs (key, status)")
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def save(self, job: Dict[str, Any]) -> None:
+        # the lease columns are only written by claim and renew
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, key, status, updated_at, body) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET key = excluded.key, status = excluded.status, "
+                "updated_at = excluded.updated_at, body = excluded.body",
+                (job["id"], job["key"], job["status"], time.time(), json.dumps(job, ensure_ascii=False)),
+            )
+            self._conn.commit()
+
+    def claim(self, job_id: str, owner: str, until: float) -> bool:
+        """
+        Leases an active job to `owner` unless another owner's lease is
+        still valid; atomic across processes sharing the file.
+        """
+        with self._lock:
+            claimed = self._conn.execute(
+                "UPDATE jobs SET owner = ?, lease_until = ? WHERE id = ? AND status IN (?, ?) "
+                "AND (owner IS NULL OR owner = ? OR lease_until IS NULL OR lease_until < ?)",
+                (owner, until, job_id, *ACTIVE_STATES, owner, time.time()),
+            ).rowcount
+            self._conn.commit()
+        return claimed == 1
+
+    def renew(self, owner: str, job_ids: Iterable[str], until: float) -> None:
+        with self._lock:
+            self._conn.executemany("UPDATE jobs SET lease_until = ? WHERE id = ? AND owner = ?",
+                                   [(until, job_id, owner) for job_id in job_ids])
+            self._conn.commit()
+
+    def list_expired(self) -> List[Dict[str, Any]]:
+        return self._select("status IN (?, ?) AND (lease_until IS NULL OR lease_until < ?)",
+                            (*ACTIVE_STATES, time.time()))
+
+    def prune(self, ttl: float, keep: int) -> int:
+        with self._lock:
+            dropped = self._conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND (updated_at < ? OR id IN "
+                "(SELECT id FROM jobs WHERE status IN (?, ?) ORDER BY updated_at DESC LIMIT -1 OFFSET ?))",
+                (*FINISHED_STATES, time.time() - ttl, *FINISHED_STATES, keep),
+            ).rowcount
+            self._conn.commit()
+        return dropped
+
+    def _select(self, where: str, args: tuple) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(f"SELECT body FROM jobs WHERE {where}", args).fetchall()
+        return [json.loads(body) for (body,) in rows]
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._select("id = ?", (job_id,))
+        return rows[0] if rows else None
+
+    def find_active(self, key: str) -> Optional[Dict[str, Any]]:
+        rows = self._select("key = ? AND status IN (?, ?)", (key, *ACTIVE_STATES))
+        return rows[0] if rows else None
+
+    def list_active(self) -> List[Dict[str, Any]]:
+        return self._select("status IN (?, ?)", ACTIVE_STATES)
+
+
+def _extract_signals(ticker: str, transcripts: Dict[str, Any], progress: Callable[[str, str], None]):
+    # extract_all_signals also persists analysis_{ticker}.txt
+    return extract_all_signals(ticker, transcripts, progress=progress)
+
+
+class JobQueue:
+    """
+    Runs signal extraction for one or many tickers in the background.
+    Submitting the same ticker set while an identical job is queued or
+    running returns the existing job instead of starting another one.
+    Progress is tracked per ticker, quarter and section.
+
+    Each ticker is analysed by `runner(ticker, transcripts, progress)`;
+    the API swaps in one that goes through its inference pool and request
+    coalescing. Jobs are leased to this queue while it has them: once
+    `start` is called, a heartbeat renews those leases and takes over
+    active jobs whose lease lapsed (their process died), so several
+    processes can share a sqlite store without running a job twice.
+    """
+
+    def __init__(self, store, workers: int = JOBS_WORKERS,
+                 runner: Callable[[str, Dict[str, Any], Callable[[str, str], None]], Any] = None,
+                 lease_seconds: float = JOBS_LEASE_SECONDS):
+        self.store = store
+        self.runner = runner or _extract_signals
+        self.lease_seconds = lease_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._lock = threading.RLock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="jobs")
+        # active jobs leased to this queue
+        self._owned: set = set()
+        self._heartbeat: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        """
+        Starts the lease heartbeat (idempotent), which also resumes jobs
+        whose previous owner is gone.
+        """
+        with self._lock:
+            if self._heartbeat is None:
+                self._heartbeat = threading.Thread(target=self._beat, name="jobs-heartbeat", daemon=True)
+                self._heartbeat.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def _beat(self) -> None:
+        while True:
+            try:
+                with self._lock:
+                    owned = list(self._owned)
+                self.store.renew(self.owner, owned, time.time() + self.lease_seconds)
+                self.recover()
+            except Exception:
+                logger.exception("job lease heartbeat failed")
+            if self._stopped.wait(self.lease_seconds / 3):
+                return
+
+    def recover(self) -> int:
+        """
+        Claims and queues active jobs whose lease has lapsed. Returns how
+        many were taken over.
+        """
+        taken = 0
+        for job in self.store.list_expired():
+            if not self.store.claim(job["id"], self.owner, time.time() + self.lease_seconds):
+                continue
+            with self._lock:
+                if job["id"] in self._owned:
+                    continue
+                self._owned.add(job["id"])
+                job["status"] = QUEUED
+                self.store.save(job)
+            self._executor.submit(self._run, job["id"])
+            taken += 1
+        return taken
+
+    @staticmethod
+    def job_key(kind: str, tickers: List[str]) -> str:
+        return f"{kind}:{','.join(sorted(tickers))}"
+
+    def submit(self, tickers: List[str], kind: str = "signals") -> Dict[str, Any]:
+        """
+        Queues analysis for `tickers`. Returns the job (possibly an existing
+        identical one, flagged with "deduplicated": True).
+        """
+        tickers = sorted({t.upper() for t in tickers})
+        key = self.job_key(kind, tickers)
+        with self._lock:
+            existing = self.store.find_active(key)
+            if existing:
+                return {**existing, "deduplicated": True}
+            job = {
+                "id": uuid.uuid4().hex,
+                "key": key,
+                "kind": kind,
+                "tickers": tickers,
+                "status": QUEUED,
+                "submitted_at": time.time(),
+                "started_at": None,
+                "finished_at": None,
+                "progress": {t: {"status": QUEUED, "quarters": {}} for t in tickers},
+                "result": None,
+                "error": None,
+            }
+            self.store.save(job)
+            self.store.claim(job["id"], self.owner, time.time() + self.lease_seconds)
+            self._owned.add(job["id"])
+        self.start()
+        self._executor.submit(self._run, job["id"])
+        return {**job, "deduplicated": False}
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return copy.deepcopy(self.store.get(job_id))
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        The job without its result payload, plus overall completion ratio.
+        """
+        job = self.get(job_id)
+        if job is None:
+            return None
+        total = done = 0
+        for ticker_progress in job["progress"].values():
+            total += ticker_progress.get("total_sections", 0)
+            done += sum(len(sections) for sections in ticker_progress["quarters"].values())
+        summary = {k: v for k, v in job.items() if k != "result"}
+        summary["completed_sections"] = done
+        summary["total_sections"] = total
+        summary["fraction_done"] = 1.0 if job["status"] == DONE else (done / total if total else 0.0)
+        return summary
+
+    def _update(self, job: Dict[str, Any], ticker: str = None, **changes: Any) -> None:
+        """
+        Applies `changes` to the job (or to one ticker's progress) and saves it.
+        """
+        with self._lock:
+            (job["progress"][ticker] if ticker else job).update(changes)
+            self.store.save(job)
+
+    def _run(self, job_id: str) -> None:
+        job = self.store.get(job_id)
+        try:
+            if job is not None:
+                self._execute(job)
+        except Exception as e:
+            # a failure outside the per-ticker handling (e.g. the store) must
+            # not leave the job running under a lease this queue keeps renewing
+            logger.exception("job %s failed", job_id)
+            try:
+                self._update(job, status=FAILED, finished_at=time.time(), error={"job": str(e)})
+            except Exception:
+                logger.exception("could not mark job %s failed", job_id)
+        finally:
+            with self._lock:
+                self._owned.discard(job_id)
+        self.store.prune(JOBS_FINISHED_TTL, JOBS_MAX_FINISHED)
+
+    def _execute(self, job: Dict[str, Any]) -> None:
+        # a job taken over from a dead process starts again from scratch
+        self._update(job, status=RUNNING, started_at=time.time(), finished_at=None, result=None, error=None,
+                     progress={t: {"status": QUEUED, "quarters": {}} for t in job["tickers"]})
+        results: Dict[str, Any] = {}
+        errors: Dict[str, str] = {}
+        for ticker in job["tickers"]:
+            try:
+                transcripts = load_json_transcripts(ticker)
+                if not transcripts:
+                    raise LookupError("No transcripts found for ticker")
+                self._update(job, ticker, status=RUNNING,
+                             total_sections=len(transcripts) * len(SIGNAL_SECTIONS))
+
+                def progress(quarter: str, section: str, ticker: str = ticker) -> None:
+                    with self._lock:
+                        job["progress"][ticker]["quarters"].setdefault(quarter, []).append(section)
+                        self.store.save(job)
+
+                results[ticker] = self.runner(ticker, transcripts, progress)
+                self._update(job, ticker, status=DONE)
+            except Exception as e:
+                errors[ticker] = str(e)
+                self._update(job, ticker, status=FAILED)
+        self._update(
+            job,
+            status=FAILED if errors and not results else DONE,
+            finished_at=time.time(),
+            result=results,
+            error=errors or None,
+        )
+
+
+def _make_store():
+    if JOBS_BACKEND == "sqlite":
+        return SqliteJobStore(os.path.join(DATA_DIR, "jobs.sqlite"))
+    return MemoryJobStore()
+
+
+_queue: Optional[JobQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """
+    The process-wide job queue, created on first use.
+    """
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = JobQueue(_make_store())
+    return _queue
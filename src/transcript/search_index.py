@@ -0,0 +1,524 @@
+"""
+Full-text search over every stored transcript: a positional inverted
+index in SQLite mapping each word to, per transcript, the (section, turn,
+position) of its occurrences. Phrase queries match consecutive positions
+within one turn.
+
+Words are split as `preprocess_text` splits them (lowercased, contractions
+split) but stopwords and short words are kept, so "sovereign AI" or
+"export control" match exactly. A transcript is indexed when
+fetch_and_save_transcript writes it; files already on disk are picked up
+by `sync` on first use, or with
+
+    cd src && python -m transcript.search_index [--data-dir DIR] [--query '"export control"']
+"""
+import os
+import re
+import json
+import sqlite3
+import logging
+import argparse
+import threading
+from array import array
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+
+from analysis.tokenizer import iter_words
+from utils.metrics import span
+from .transcript_store import SECTIONS, _FILENAME
+
+logger = logging.getLogger(__name__)
+
+# index transcripts as they are saved (SEARCH_INDEX=0 turns it off)
+SEARCH_INDEX_ENABLED = os.getenv("SEARCH_INDEX", "1") != "0"
+# characters of context on each side of a hit
+SNIPPET_CHARS = int(os.getenv("SEARCH_SNIPPET_CHARS", "80"))
+
+# each occurrence is one uint64: doc id | section | turn | word position,
+# so a term's postings concatenated in doc order form one sorted array and
+# a phrase step is "+1"; words past MAX_POSITION in a turn (or turns past
+# MAX_TURN in a section) are not indexed
+POSITION_BITS = 20
+TURN_BITS = 15
+TURN_SHIFT = POSITION_BITS
+SECTION_SHIFT = TURN_SHIFT + TURN_BITS
+DOC_SHIFT = SECTION_SHIFT + 1
+MAX_POSITION = (1 << POSITION_BITS) - 1
+MAX_TURN = (1 << TURN_BITS) - 1
+# SQLite's default limit on bound parameters is 999
+_IN_BATCH = 500
+
+_QUARTER = re.compile(r"^\d{4}Q[1-4]$")
+_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_CLAUSE = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def parse_query(query: str) -> List[List[str]]:
+    """
+    Splits a query into clauses, each a list of words: "quoted text" is
+    one phrase, other whitespace-separated terms are clauses of their own.
+    A document matches when every clause occurs in it.
+    """
+    clauses = []
+    for phrase, term in _CLAUSE.findall(query):
+        words = [w for w, _ in iter_words(phrase or term)]
+        if words:
+            clauses.append(words)
+    if not clauses:
+        raise ValueError("query has no searchable words")
+    return clauses
+
+
+def _bound(value: Optional[str], name: str) -> Tuple[Optional[str], Optional[str]]:
+    # (column, value) for a start/end filter given as YYYYQn or YYYY-MM-DD
+    if value is None:
+        return None, None
+    if _QUARTER.match(value):
+        return "quarter", value
+    if _DATE.match(value):
+        return "date", value
+    raise ValueError(f"{name} must be a quarter (2024Q3) or a date (2024-08-28), got {value!r}")
+
+
+class SearchIndex:
+    """
+    SQLite inverted index over the transcript files in `directory`
+    (search_index.sqlite there). Postings are stored one row per
+    (term, transcript) as a packed uint64 array of occurrences, so a query
+    reads one row per matching transcript per term and matches phrases
+    with vectorized set operations.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.path = os.path.join(directory, "search_index.sqlite")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS docs (
+                id      INTEGER PRIMARY KEY,
+                ticker  TEXT NOT NULL,
+                quarter TEXT NOT NULL,
+                date    TEXT,
+                source_size  INTEGER NOT NULL,
+                source_mtime INTEGER NOT NULL,
+                UNIQUE (ticker, quarter)
+            );
+            CREATE TABLE IF NOT EXISTS terms (
+                id   INTEGER PRIMARY KEY,
+                term TEXT NOT NULL UNIQUE
+            );
+            CREATE TABLE IF NOT EXISTS postings (
+                term_id   INTEGER NOT NULL,
+                doc_id    INTEGER NOT NULL,
+                count     INTEGER NOT NULL,
+                positions BLOB NOT NULL,
+                PRIMARY KEY (term_id, doc_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc_id);
+            CREATE TABLE IF NOT EXISTS speakers (
+                id   INTEGER PRIMARY KEY,
+                name TEXT NOT NULL UNIQUE
+            );
+            -- id is an occurrence's doc | section | turn prefix
+            CREATE TABLE IF NOT EXISTS turns (
+                id         INTEGER PRIMARY KEY,
+                speaker_id INTEGER NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+        self._synced_mtime: Optional[int] = None
+        self._sync_lock = threading.Lock()
+        self._load_ids()
+
+    def _load_ids(self) -> None:
+        # term and speaker ids are only ever added, so these caches can lag
+        # behind other writers (see _id, _term_id, _speakers) but never be wrong
+        self._term_ids: Dict[str, int] = dict(self._conn.execute("SELECT term, id FROM terms"))
+        self._speaker_ids: Dict[str, int] = dict(self._conn.execute("SELECT name, id FROM speakers"))
+        self._speaker_names: Dict[int, str] = {i: n for n, i in self._speaker_ids.items()}
+
+    # --- writes ---------------------------------------------------------
+
+    def _id(self, table: str, column: str, cache: Dict[str, int], value: str) -> int:
+        # another process may have added `value` since the cache was loaded
+        value_id = cache.get(value)
+        if value_id is None:
+            self._conn.execute(f"INSERT OR IGNORE INTO {table} ({column}) VALUES (?)", (value,))
+            value_id = self._conn.execute(f"SELECT id FROM {table} WHERE {column} = ?", (value,)).fetchone()[0]
+            cache[value] = value_id
+        return value_id
+
+    def index_transcript(self, ticker: str, quarter: str, transcript: Dict[str, Any],
+                         source_size: int = 0, source_mtime: int = 0) -> None:
+        """
+        Indexes (or re-indexes) one processed transcript.
+        """
+        import numpy as np
+
+        positions: Dict[str, array] = {}
+        turns: List[Tuple[int, str]] = []
+        with span("search_index", items=1):
+            for section, key in enumerate(SECTIONS):
+                for turn, entry in enumerate((transcript.get(key) or [])[:MAX_TURN + 1]):
+                    turn_key = section << SECTION_SHIFT | turn << TURN_SHIFT
+                    turns.append((turn_key, entry.get("speaker", "")))
+                    for position, (word, _) in enumerate(iter_words(entry.get("text", ""))):
+                        if position > MAX_POSITION:
+                            break
+                        occurrences = positions.get(word)
+                        if occurrences is None:
+                            occurrences = positions[word] = array("Q")
+                        occurrences.append(turn_key | position)
+
+            # one write transaction per transcript, taken up front so other
+            # processes indexing the same directory wait instead of racing on
+            # the docs row; on any error nothing of it is committed
+            with self._lock:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    doc_id = self._doc_id(ticker, quarter, transcript.get("date"), source_size, source_mtime)
+                    base = np.uint64(doc_id << DOC_SHIFT)
+                    self._conn.executemany("INSERT INTO postings VALUES (?, ?, ?, ?)", [
+                        (self._id("terms", "term", self._term_ids, word), doc_id, len(occ),
+                         (np.frombuffer(occ, dtype=np.uint64) + base).tobytes())
+                        for word, occ in positions.items()
+                    ])
+                    self._conn.executemany("INSERT INTO turns VALUES (?, ?)", [
+                        ((doc_id << DOC_SHIFT | turn_key) >> TURN_SHIFT,
+                         self._id("speakers", "name", self._speaker_ids, speaker))
+                        for turn_key, speaker in turns
+                    ])
+                    self._conn.commit()
+                except BaseException:
+                    self._conn.rollback()
+                    # ids cached during the transaction were rolled back too
+                    self._load_ids()
+                    raise
+                self._speaker_names = {i: n for n, i in self._speaker_ids.items()}
+
+    def _doc_id(self, ticker: str, quarter: str, date: Optional[str], source_size: int, source_mtime: int) -> int:
+        # id of the (ticker, quarter) row, with its old postings and turns dropped
+        row = self._conn.execute("SELECT id FROM docs WHERE ticker = ? AND quarter = ?", (ticker, quarter)).fetchone()
+        if row is None:
+            return self._conn.execute(
+                "INSERT INTO docs (ticker, quarter, date, source_size, source_mtime) VALUES (?, ?, ?, ?, ?)",
+                (ticker, quarter, date, source_size, source_mtime)).lastrowid
+        doc_id = row[0]
+        self._conn.execute("UPDATE docs SET date = ?, source_size = ?, source_mtime = ? WHERE id = ?",
+                           (date, source_size, source_mtime, doc_id))
+        self._delete_doc(doc_id)
+        return doc_id
+
+    def _delete_doc(self, doc_id: int) -> None:
+        self._conn.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+        first = doc_id << (DOC_SHIFT - TURN_SHIFT)
+        self._conn.execute("DELETE FROM turns WHERE id >= ? AND id < ?",
+                           (first, first + (1 << (DOC_SHIFT - TURN_SHIFT))))
+
+    def remove(self, ticker: str, quarter: str) -> None:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT id FROM docs WHERE ticker = ? AND quarter = ?", (ticker, quarter)).fetchone()
+                if row is not None:
+                    self._delete_doc(row[0])
+                    self._conn.execute("DELETE FROM docs WHERE id = ?", (row[0],))
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+
+    def index_file(self, path: str) -> bool:
+        """
+        Indexes a processed `{ticker}_{YYYYQX}.txt` file unless it is
+        already indexed at its current size and mtime. Returns whether it
+        was (re)indexed.
+        """
+        match = _FILENAME.match(os.path.basename(path))
+        if not match:
+            return False
+        st = os.stat(path)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT source_size, source_mtime FROM docs WHERE ticker = ? AND quarter = ?",
+                (match["ticker"], match["quarter"])).fetchone()
+        if row == (st.st_size, st.st_mtime_ns):
+            return False
+        with open(path, "r", encoding="utf-8") as f:
+            transcript = json.load(f)
+        self.index_transcript(match["ticker"], match["quarter"], transcript, st.st_size, st.st_mtime_ns)
+        return True
+
+    def sync(self) -> int:
+        """
+        Indexes every transcript file in the directory that is new or
+        changed and drops transcripts whose file is gone. Returns files
+        indexed.
+        """
+        self._synced_mtime = os.stat(self.directory).st_mtime_ns
+        on_disk = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                match = _FILENAME.match(entry.name)
+                if match:
+                    on_disk[(match["ticker"], match["quarter"])] = entry.path
+        with self._lock:
+            stored = set(self._conn.execute("SELECT ticker, quarter FROM docs"))
+        for ticker, quarter in stored - set(on_disk):
+            self.remove(ticker, quarter)
+        indexed = 0
+        for path in on_disk.values():
+            # a file deleted or replaced mid-sync, or one that does not
+            # parse, is skipped rather than failing the query that synced
+            try:
+                indexed += self.index_file(path)
+            except (FileNotFoundError, ValueError) as e:
+                logger.warning("skipping %s in search index sync: %s", path, e)
+        return indexed
+
+    def sync_if_changed(self) -> int:
+        """
+        sync(), but only when a file was added, renamed or deleted in the
+        directory since the last one (fetch_and_save_transcript writes by
+        rename, so files saved by another process, e.g. the backfill CLI,
+        are picked up by the next query).
+        """
+        with self._sync_lock:
+            if os.stat(self.directory).st_mtime_ns == self._synced_mtime:
+                return 0
+            return self.sync()
+
+    # --- reads ----------------------------------------------------------
+
+    def _term_id(self, word: str) -> Optional[int]:
+        term_id = self._term_ids.get(word)
+        if term_id is None:
+            row = self._conn.execute("SELECT id FROM terms WHERE term = ?", (word,)).fetchone()
+            if row is not None:
+                term_id = self._term_ids[word] = row[0]
+        return term_id
+
+    def _postings(self, term_id: int, doc_ids: Optional[List[int]]) -> List[bytes]:
+        # blobs in doc id order, so their concatenation stays sorted
+        if doc_ids is None:
+            return [b for b, in self._conn.execute(
+                "SELECT positions FROM postings WHERE term_id = ? ORDER BY doc_id", (term_id,))]
+        found = []
+        for i in range(0, len(doc_ids), _IN_BATCH):
+            batch = doc_ids[i:i + _IN_BATCH]
+            found += [b for b, in self._conn.execute(
+                f"SELECT positions FROM postings WHERE term_id = ? AND doc_id IN ({','.join('?' * len(batch))}) "
+                "ORDER BY doc_id", [term_id, *batch])]
+        return found
+
+    def _speakers(self, turn_ids: List[int]) -> Dict[int, str]:
+        speaker_of: Dict[int, str] = {}
+        for i in range(0, len(turn_ids), _IN_BATCH):
+            batch = turn_ids[i:i + _IN_BATCH]
+            for turn_id, speaker_id in self._conn.execute(
+                    f"SELECT id, speaker_id FROM turns WHERE id IN ({','.join('?' * len(batch))})", batch):
+                if speaker_id not in self._speaker_names:
+                    # added by another process since the names were loaded
+                    self._speaker_names = dict(self._conn.execute("SELECT id, name FROM speakers"))
+                speaker_of[turn_id] = self._speaker_names[speaker_id]
+        return speaker_of
+
+    def search(self, query: str, tickers: Iterable[str] = None, start: str = None, end: str = None,
+               limit: int = 20) -> Dict[str, Any]:
+        """
+        Transcripts and turns where every clause of `query` (see
+        parse_query) occurs, optionally restricted to `tickers` and to
+        quarters or call dates from `start` to `end` (inclusive):
+          {
+            "query": ..., "total_hits": n,
+            "quarters": [{"ticker", "quarter", "date", "hits"}, ...],   # newest first
+            "speakers": [{"speaker", "hits"}, ...],                     # most hits first
+            "hits": [{"ticker", "quarter", "section", "turn", "speaker",
+                      "offset", "length", "snippet"}, ...]               # first `limit`
+          }
+        A hit is one occurrence of one clause; `offset` and `length` locate
+        it in the turn's text.
+        """
+        import numpy as np
+
+        clauses = parse_query(query)
+        where, params = [], []
+        if tickers:
+            tickers = [t.upper() for t in tickers]
+            where.append(f"ticker IN ({','.join('?' * len(tickers))})")
+            params.extend(tickers)
+        for value, name, op in ((start, "start", ">="), (end, "end", "<=")):
+            column, bound = _bound(value, name)
+            if column:
+                where.append(f"{column} {op} ?")
+                params.append(bound)
+        empty = {"query": query, "total_hits": 0, "quarters": [], "speakers": [], "hits": []}
+        shift = np.uint64(DOC_SHIFT)
+
+        with span("search", items=len(clauses)), self._lock:
+            docs = {doc_id: (ticker, quarter, date) for doc_id, ticker, quarter, date in self._conn.execute(
+                "SELECT id, ticker, quarter, date FROM docs" + (f" WHERE {' AND '.join(where)}" if where else ""),
+                params)}
+            words = list(dict.fromkeys(w for clause in clauses for w in clause))
+            term_ids = {w: self._term_id(w) for w in words}
+            if not docs or None in term_ids.values():
+                return empty
+            # rarest term first; later terms are only read for surviving docs
+            frequency = {w: self._conn.execute("SELECT COUNT(*) FROM postings WHERE term_id = ?",
+                                               (term_ids[w],)).fetchone()[0] for w in words}
+            candidates = np.array(sorted(docs), dtype=np.uint64)
+            occurrences: Dict[str, Any] = {}
+            for word in sorted(words, key=frequency.get):
+                restrict = candidates.tolist() if len(candidates) < frequency[word] else None
+                blobs = self._postings(term_ids[word], restrict)
+                found = np.frombuffer(b"".join(blobs), dtype=np.uint64)
+                found = found[np.isin(found >> shift, candidates)]
+                occurrences[word] = found
+                candidates = np.unique(found >> shift)
+                if not len(candidates):
+                    return empty
+
+            # start occurrences of each clause, then only docs where all clauses occur
+            matched, lengths = [], []
+            for clause in clauses:
+                starts = occurrences[clause[0]]
+                for step, word in enumerate(clause[1:], 1):
+                    starts = starts[np.isin(starts + np.uint64(step), occurrences[word], assume_unique=True)]
+                candidates = np.intersect1d(candidates, np.unique(starts >> shift), assume_unique=True)
+                matched.append(starts)
+                lengths.append(np.full(len(starts), len(clause), dtype=np.uint64))
+            hits_at = np.concatenate(matched)
+            keep = np.isin(hits_at >> shift, candidates)
+            order = np.argsort(hits_at[keep], kind="stable")
+            hits_at, hit_lengths = hits_at[keep][order], np.concatenate(lengths)[keep][order]
+            if not len(hits_at):
+                return empty
+
+            hit_docs = (hits_at >> shift).astype(np.int64)
+            doc_ids, per_doc = np.unique(hit_docs, return_counts=True)
+            turn_ids, per_turn = np.unique(hits_at >> np.uint64(TURN_SHIFT), return_counts=True)
+            speaker_of = self._speakers(turn_ids.tolist())
+
+        speaker_hits: Dict[str, int] = {}
+        for turn_id, count in zip(turn_ids.tolist(), per_turn.tolist()):
+            name = speaker_of.get(turn_id, "")
+            speaker_hits[name] = speaker_hits.get(name, 0) + count
+        counts = dict(zip(doc_ids.tolist(), per_doc.tolist()))
+        newest_first = sorted(counts, key=lambda d: (docs[d][1], docs[d][0]), reverse=True)
+
+        hits = []
+        for doc_id in newest_first:
+            if len(hits) >= limit:
+                break
+            first = int(np.searchsorted(hit_docs, doc_id))
+            ticker, quarter, _ = docs[doc_id]
+            for value, length in zip(hits_at[first:first + min(counts[doc_id], limit - len(hits))].tolist(),
+                                     hit_lengths[first:first + counts[doc_id]].tolist()):
+                hits.append({"ticker": ticker, "quarter": quarter,
+                             "section": SECTIONS[value >> SECTION_SHIFT & 1],
+                             "turn": value >> TURN_SHIFT & MAX_TURN,
+                             "speaker": speaker_of.get(value >> TURN_SHIFT, ""),
+                             "position": value & MAX_POSITION, "words": int(length)})
+        self._add_snippets(hits)
+        return {
+            "query": query,
+            "total_hits": len(hits_at),
+            "quarters": [{"ticker": docs[d][0], "quarter": docs[d][1], "date": docs[d][2], "hits": counts[d]}
+                         for d in newest_first],
+            "speakers": [{"speaker": s, "hits": n}
+                         for s, n in sorted(speaker_hits.items(), key=lambda kv: kv[1], reverse=True)],
+            "hits": hits,
+        }
+
+    def _add_snippets(self, hits: List[Dict[str, Any]]) -> None:
+        """
+        Replaces each hit's word position with the character `offset` and
+        `length` of the match in its turn, plus a `snippet` around it.
+        """
+        from .transcript_loader import _read_transcript
+
+        texts: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for hit in hits:
+            key = (hit["ticker"], hit["quarter"])
+            if key not in texts:
+                path = os.path.join(self.directory, f"{hit['ticker']}_{hit['quarter']}.txt")
+                try:
+                    texts[key] = _read_transcript(path)
+                except FileNotFoundError:
+                    texts[key] = {}
+            turns = texts[key].get(hit["section"]) or []
+            text = turns[hit["turn"]]["text"] if hit["turn"] < len(turns) else ""
+            position, words = hit.pop("position"), hit.pop("words")
+            spans = [(offset, len(word)) for word, offset in iter_words(text)][position:position + words]
+            if not spans:
+                hit.update(offset=None, length=0, snippet="")
+                continue
+            start = spans[0][0]
+            end = spans[-1][0] + spans[-1][1]
+            left, right = max(0, start - SNIPPET_CHARS), min(len(text), end + SNIPPET_CHARS)
+            hit.update(offset=start, length=end - start,
+                       snippet=("…" if left else "") + text[left:right] + ("…" if right < len(text) else ""))
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            docs = self._conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+            postings, occurrences = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(count), 0) FROM postings").fetchone()
+        size = sum(os.path.getsize(p) for p in (self.path, self.path + "-wal") if os.path.exists(p))
+        return {"transcripts": docs, "terms": len(self._term_ids), "postings": postings,
+                "occurrences": occurrences, "bytes": size}
+
+
+_index: Optional[SearchIndex] = None
+_index_lock = threading.Lock()
+
+
+def _open_index() -> SearchIndex:
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                from .transcript_loader import DATA_DIR
+                _index = SearchIndex(DATA_DIR)
+    return _index
+
+
+def get_search_index() -> SearchIndex:
+    """
+    The SearchIndex over DATA_DIR, opened on first use and synced with the
+    files there whenever the directory changed since the last call.
+    """
+    index = _open_index()
+    index.sync_if_changed()
+    return index
+
+
+def index_saved_file(path: str) -> None:
+    """
+    Called after a transcript file is written; indexing failures are
+    logged and never fail the fetch.
+    """
+    if not SEARCH_INDEX_ENABLED:
+        return
+    try:
+        _open_index().index_file(path)
+    except Exception:
+        logger.exception("could not index %s for search", path)
+
+
+if __name__ == "__main__":
+    from .transcript_loader import DATA_DIR
+
+    parser = argparse.ArgumentParser(description="Build or query the transcript search index.")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--query", help="run a query after syncing")
+    args = parser.parse_args()
+    index = SearchIndex(args.data_dir)
+    print(f"{index.sync()} transcript(s) indexed")
+    print(index.get_stats())
+    if args.query:
+        print(json.dumps(index.search(args.query), indent=2, ensure_ascii=False))
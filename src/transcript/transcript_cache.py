@@ -0,0 +1,177 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+# how long an empty / "not yet available" response is trusted before retrying
+NEGATIVE_TTL_SECONDS = float(os.getenv("TRANSCRIPT_NEGATIVE_TTL", str(6 * 3600)))
+# how long a transcript for the current (not yet finalized) quarter is trusted
+CURRENT_QUARTER_TTL_SECONDS = float(os.getenv("TRANSCRIPT_CURRENT_TTL", "3600"))
+
+STATUS_OK = "ok"
+STATUS_UNAVAILABLE = "unavailable"
+
+
+def is_finalized_quarter(year: int, quarter: int, today: datetime = None) -> bool:
+    """
+    A quarter is finalized once the calendar has moved past it; its
+    transcript no longer changes after publication.
+    """
+    today = today or datetime.today()
+    current = (today.year, (today.month - 1) // 3 + 1)
+    return (year, quarter) < current
+
+
+class TranscriptCache:
+    """
+    Manifest of fetched transcripts keyed by ticker/year/quarter.
+    Each record holds the raw payload hash, fetch time, parsed-output path
+    and payload size, and is persisted in SQLite next to the transcripts so
+    the API workers and backfill jobs share it without overwriting each
+    other's records.
+    """
+
+    def __init__(self, path: str, legacy_manifest: Optional[str] = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS transcripts (
+                key        TEXT PRIMARY KEY,
+                status     TEXT NOT NULL,
+                sha256     TEXT,
+                fetched_at REAL NOT NULL,
+                path       TEXT,
+                bytes      INTEGER
+            )
+            """
+        )
+        self._conn.commit()
+        if legacy_manifest:
+            self._import_manifest(legacy_manifest)
+        self.stats = {
+            "hits": 0,
+            "negative_hits": 0,
+            "misses": 0,
+            "unchanged_refetches": 0,
+            "bytes_saved": 0,
+        }
+
+    @staticmethod
+    def key(ticker: str, year: int, quarter: int) -> str:
+        return f"{ticker}_{year}Q{quarter}"
+
+    def _import_manifest(self, manifest_path: str) -> None:
+        """
+        One-off import of the JSON manifest used by earlier versions; the
+        file is renamed once its records are in the database.
+        """
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        with self._lock:
+            # INSERT OR IGNORE: a record written by another process wins
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO transcripts (key, status, sha256, fetched_at, path, bytes) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(key, e.get("status", STATUS_OK), e.get("sha256"), e.get("fetched_at", 0),
+                  e.get("path"), e.get("bytes")) for key, e in entries.items()],
+            )
+            self._conn.commit()
+        try:
+            os.replace(manifest_path, manifest_path + ".imported")
+        except FileNotFoundError:
+            pass
+
+    def get(self, ticker: str, year: int, quarter: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, sha256, fetched_at, path, bytes FROM transcripts WHERE key = ?",
+                (self.key(ticker, year, quarter),),
+            ).fetchone()
+        if row is None:
+            return None
+        status, sha256, fetched_at, path, size = row
+        if status == STATUS_UNAVAILABLE:
+            return {"status": status, "fetched_at": fetched_at}
+        return {"status": status, "sha256": sha256, "fetched_at": fetched_at, "path": path, "bytes": size}
+
+    def lookup(self, ticker: str, year: int, quarter: int) -> Optional[Dict[str, Any]]:
+        """
+        Returns the cached record if it can be served without touching the
+        network, updating hit/miss stats. Returns None on a miss.
+        """
+        entry = self.get(ticker, year, quarter)
+        fresh = entry is not None and self._is_fresh(entry, year, quarter)
+        with self._lock:
+            if not fresh:
+                self.stats["misses"] += 1
+                return None
+            if entry["status"] == STATUS_UNAVAILABLE:
+                self.stats["negative_hits"] += 1
+            else:
+                self.stats["hits"] += 1
+                self.stats["bytes_saved"] += entry.get("bytes", 0)
+        return entry
+
+    def _is_fresh(self, entry: Dict[str, Any], year: int, quarter: int) -> bool:
+        age = time.time() - entry.get("fetched_at", 0)
+        if entry.get("status") == STATUS_UNAVAILABLE:
+            return age < NEGATIVE_TTL_SECONDS
+        if not os.path.exists(entry.get("path", "")):
+            return False
+        if is_finalized_quarter(year, quarter):
+            return True
+        return age < CURRENT_QUARTER_TTL_SECONDS
+
+    def record(self, ticker: str, year: int, quarter: int, sha256: str, size: int, path: str) -> Dict[str, Any]:
+        """
+        Records a successful fetch of a `size`-byte payload with SHA-256
+        digest `sha256`. Returns the new record.
+        """
+        entry = {
+            "status": STATUS_OK,
+            "sha256": sha256,
+            "fetched_at": time.time(),
+            "path": path,
+            "bytes": size,
+        }
+        return self._put(ticker, year, quarter, entry)
+
+    def record_unavailable(self, ticker: str, year: int, quarter: int) -> Dict[str, Any]:
+        """
+        Records an empty / not-yet-available response so it is only
+        retried after NEGATIVE_TTL_SECONDS.
+        """
+        entry = {"status": STATUS_UNAVAILABLE, "fetched_at": time.time()}
+        return self._put(ticker, year, quarter, entry)
+
+    def note_unchanged(self) -> None:
+        with self._lock:
+            self.stats["unchanged_refetches"] += 1
+
+    def _put(self, ticker: str, year: int, quarter: int, entry: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO transcripts (key, status, sha256, fetched_at, path, bytes) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (self.key(ticker, year, quarter), entry["status"], entry.get("sha256"),
+                 entry["fetched_at"], entry.get("path"), entry.get("bytes")),
+            )
+            self._conn.commit()
+        return entry
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats["entries"] = self._conn.execute("SELECT COUNT(*) FROM transcripts").fetchone()[0]
+        lookups = stats["hits"] + stats["negative_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] + stats["negative_hits"]) / lookups if lookups else 0.0
+        return stats
@@ -1,20 +1,57 @@
 import os
+import io
 import requests
 import json
 import re
-from typing import List, Dict
+import time
+import hashlib
+import tempfile
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Iterable
 from datetime import datetime
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+from utils.rate_limit import TokenBucket
+from utils.metrics import span
+from .transcript_cache import TranscriptCache, STATUS_UNAVAILABLE
+from .transcript_stream import write_processed_transcript, decode_chunks
+from .transcript_loader import invalidate as invalidate_loaded
+from .search_index import index_saved_file
 
 # load your API‑Ninjas key
 load_dotenv()
 API_KEY = os.getenv("API_NINJAS_KEY")
-BASE_URL = "https://api.api-ninjas.com/v1/earningstranscript"
+# overridable so the client can be pointed at a local stub server
+BASE_URL = os.getenv("API_NINJAS_BASE_URL", "https://api.api-ninjas.com/v1/earningstranscript")
+
+# concurrency / quota settings for batch fetches
+MAX_PARALLEL_FETCHES = int(os.getenv("API_NINJAS_MAX_PARALLEL", "8"))
+RATE_LIMIT_PER_SEC = float(os.getenv("API_NINJAS_RATE_PER_SEC", "5"))
+RATE_LIMIT_BURST = float(os.getenv("API_NINJAS_RATE_BURST", "5"))
+MAX_RETRIES = int(os.getenv("API_NINJAS_MAX_RETRIES", "3"))
+BACKOFF_BASE = float(os.getenv("API_NINJAS_BACKOFF_BASE", "0.5"))
+# longest Retry-After honoured; default: the longest exponential backoff
+MAX_RETRY_AFTER = float(os.getenv("API_NINJAS_MAX_RETRY_AFTER", str(BACKOFF_BASE * 2 ** MAX_RETRIES)))
+REQUEST_TIMEOUT = 10
+STREAM_CHUNK_SIZE = 64 * 1024
+RETRY_STATUS = {429, 500, 502, 503, 504}
 
 # point at your existing data folder under src/data/
-DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data"))
+DATA_DIR = os.path.abspath(os.getenv("EARNINGS_DATA_DIR", os.path.join(os.path.dirname(__file__), "..", "data")))
 os.makedirs(DATA_DIR, exist_ok=True)
 
+# records what has been fetched so finalized quarters are never refetched
+transcript_cache = TranscriptCache(os.path.join(DATA_DIR, "transcript_cache.sqlite"),
+                                   legacy_manifest=os.path.join(DATA_DIR, "transcript_cache.json"))
+
+class TranscriptUnavailableError(Exception):
+    """
+    Raised when API‑Ninjas returns an empty / not yet available transcript.
+    """
+
 def get_last_n_quarters(n: int = 4):
     """
     Returns a list of (year, quarter) tuples for the last n quarters,
@@ -34,16 +71,79 @@ def get_last_n_quarters(n: int = 4):
 
     return quarters
 
+# Shared keep-alive session and rate limiter, created on first use
+_session = None
+_session_lock = threading.Lock()
+rate_limiter = TokenBucket(RATE_LIMIT_PER_SEC, RATE_LIMIT_BURST)
+
+def get_session() -> requests.Session:
+    """
+    Returns the process-wide requests.Session whose connection pool is
+    sized for MAX_PARALLEL_FETCHES concurrent requests.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=MAX_PARALLEL_FETCHES,
+                    pool_maxsize=MAX_PARALLEL_FETCHES,
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+def _retry_delay(attempt: int, resp: requests.Response = None) -> float:
+    """
+    Exponential backoff, honouring a numeric Retry-After header if present
+    (up to MAX_RETRY_AFTER).
+    """
+    if resp is not None:
+        retry_after = resp.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), MAX_RETRY_AFTER)
+    return BACKOFF_BASE * (2 ** attempt)
+
+def open_transcript_stream(ticker: str, year: int, quarter: int) -> requests.Response:
+    """
+    Calls API‑Ninjas and returns the streaming response once headers are in.
+    Goes through the shared session and rate limiter; 429/5xx responses
+    and connection errors are retried with backoff up to MAX_RETRIES times.
+    Raises TranscriptUnavailableError on a 404 and an HTTPError on other
+    failures.
+    """
+    params = {"ticker": ticker, "year": year, "quarter": quarter}
+    headers = {"X-Api-Key": API_KEY}
+    session = get_session()
+    for attempt in range(MAX_RETRIES + 1):
+        rate_limiter.acquire()
+        try:
+            resp = session.get(BASE_URL, params=params, headers=headers,
+                               timeout=REQUEST_TIMEOUT, stream=True)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == MAX_RETRIES:
+                raise
+            time.sleep(_retry_delay(attempt))
+            continue
+        if resp.status_code in RETRY_STATUS and attempt < MAX_RETRIES:
+            resp.close()
+            time.sleep(_retry_delay(attempt, resp))
+            continue
+        if resp.status_code == 404:
+            resp.close()
+            raise TranscriptUnavailableError(f"{ticker} {year}Q{quarter} not found")
+        resp.raise_for_status()
+        return resp
+
 def fetch_transcript(ticker: str, year: int, quarter: int) -> str:
     """
     Calls API‑Ninjas and RETURNS the raw transcript text.
     Raises an HTTPError on failure.
     """
-    params = {"ticker": ticker, "year": year, "quarter": quarter}
-    headers = {"X-Api-Key": API_KEY}
-    resp = requests.get(BASE_URL, params=params, headers=headers, timeout=10)
-    resp.raise_for_status()
-    return resp.text
+    with open_transcript_stream(ticker, year, quarter) as resp:
+        return resp.text
 
 def process_transcript(text: str) -> str:
     """
@@ -53,79 +153,103 @@ def process_transcript(text: str) -> str:
       "preparedRemarks": [ {speaker, text}, … ],
       "qanda":         [ {speaker, text}, … ]
     }
+    Thin wrapper over the streaming parser used by fetch_and_save_transcript.
     """
-    # 1. Load JSON
-    data = json.loads(text)
-    date = data.get("date", "")
-    transcript = data["transcript"]
-
-    # 2. Split into raw lines and extract Speaker/Text pairs
-    entries: List[Dict[str,str]] = []
-    for line in transcript.split("\n"):
-        for speaker, body in re.findall(r'([^:\n]+):\s*(.+)', line):
-            entries.append({
-                "speaker": speaker.strip(),
-                "text":    body.strip()
-            })
-
-    # 3. Partition into Prepared Remarks vs Q&A
-    prepared: List[Dict[str,str]] = []
-    qanda:    List[Dict[str,str]] = []
-
-    in_qa = False
-
-    for entry in entries:
-        spk = entry["speaker"]
-        txt = entry["text"]
-
-        # Detect start of Q&A
-        if not in_qa:
-            # Detect start of Q&A
-            if spk == "Operator" and (
-               "[operator instructions]" in txt.lower() and "your first question" in txt.lower()
-            ):
-                in_qa = True
-                # continue
-
-        if not in_qa:
-            prepared.append(entry)
-        else:
-            # Collect Q&A entries
-            qanda.append(entry)
-
-    # 4. Serialize to JSON with double‑quotes
-    output = {
-        "date": date,
-        "preparedRemarks": prepared,
-        "qanda": qanda
-    }
-    return json.dumps(output, ensure_ascii=False)
+    out = io.StringIO()
+    write_processed_transcript([text], out)
+    return out.getvalue()
 
 
-def fetch_and_save_transcript(ticker: str, year: int, quarter: int) -> str:
+def fetch_and_save_transcript(ticker: str, year: int, quarter: int, force: bool = False) -> str:
     """
     Fetches a single transcript and writes it to src/data/.
     Returns the absolute filepath.
+    Finalized quarters already on disk are served from `transcript_cache`
+    without touching the network; pass force=True to refetch anyway.
+    Raises TranscriptUnavailableError for empty responses and 404s (cached briefly).
     """
-    text = fetch_transcript(ticker, year, quarter)
-    processed_text = process_transcript(text)
+    if not force:
+        cached = transcript_cache.lookup(ticker, year, quarter)
+        if cached is not None:
+            if cached["status"] == STATUS_UNAVAILABLE:
+                raise TranscriptUnavailableError(f"{ticker} {year}Q{quarter} not yet available (cached)")
+            return cached["path"]
+
     filename = f"{ticker}_{year}Q{quarter}.txt"
     filepath = os.path.join(DATA_DIR, filename)
-    with open(filepath, "w", encoding="utf-8") as f:
-        f.write(processed_text)
+    digest = hashlib.sha256()
+    size = 0
+
+    def raw_chunks(resp):
+        nonlocal size
+        for chunk in resp.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+            digest.update(chunk)
+            size += len(chunk)
+            yield chunk
+
+    # Parse the response as it arrives and encode turns straight to a temp file
+    fd, tmp_path = tempfile.mkstemp(dir=DATA_DIR, prefix=".tmp-", suffix=filename)
+    try:
+        with span("fetch", items=1), open_transcript_stream(ticker, year, quarter) as resp, \
+                os.fdopen(fd, "w", encoding="utf-8") as out:
+            parser = write_processed_transcript(
+                decode_chunks(raw_chunks(resp), resp.encoding or "utf-8"), out)
+
+        if not parser.has_transcript:
+            raise TranscriptUnavailableError(f"{ticker} {year}Q{quarter} not yet available")
+
+        previous = transcript_cache.get(ticker, year, quarter)
+        if previous and previous.get("sha256") == digest.hexdigest() and os.path.exists(filepath):
+            # same payload as last time: keep the existing file untouched
+            transcript_cache.note_unchanged()
+        else:
+            os.replace(tmp_path, filepath)
+            invalidate_loaded(filepath)
+            index_saved_file(filepath)
+    except TranscriptUnavailableError:
+        # empty responses and 404s are only retried after NEGATIVE_TTL_SECONDS
+        transcript_cache.record_unavailable(ticker, year, quarter)
+        raise
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    transcript_cache.record(ticker, year, quarter, digest.hexdigest(), size, filepath)
     return filepath
 
+def _fetch_and_save_or_error(ticker: str, year: int, quarter: int) -> str:
+    try:
+        return fetch_and_save_transcript(ticker, year, quarter)
+    except Exception as e:
+        return f"Error: {e}"
+
+def fetch_and_save_transcripts_batch(
+    tickers: Iterable[str], n: int = 4, max_workers: int = None
+) -> Dict[str, Dict[str, str]]:
+    """
+    Fetches & saves the last n quarters’ transcripts for every ticker,
+    running up to `max_workers` (default MAX_PARALLEL_FETCHES) requests
+    concurrently over the shared session.
+    Returns {ticker: {"YYYYQ#": filepath or error string}}.
+    """
+    quarters = get_last_n_quarters(n)
+    tickers = list(dict.fromkeys(tickers))
+    workers = max_workers or MAX_PARALLEL_FETCHES
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # each fetch runs in a copy of the caller's context so its spans
+        # reach the caller's profile
+        futures = {
+            (ticker, year, q): pool.submit(contextvars.copy_context().run, _fetch_and_save_or_error, ticker, year, q)
+            for ticker in tickers
+            for year, q in quarters
+        }
+        results: Dict[str, Dict[str, str]] = {ticker: {} for ticker in tickers}
+        for (ticker, year, q), future in futures.items():
+            results[ticker][f"{year}Q{q}"] = future.result()
+    return results
+
 def fetch_and_save_last_n_transcripts(ticker: str , n: int = 4) -> dict:
     """
     Fetches & saves the last n quarters’ transcripts for `ticker`.
     Returns a dict mapping "YYYYQ#" → filepath or error string.
     """
-    results = {}
-    for year, q in get_last_n_quarters(n):
-        key = f"{year}Q{q}"
-        try:
-            path = fetch_and_save_transcript(ticker, year, q)
-            results[key] = path
-        except Exception as e:
-            results[key] = f"Error: {e}"
-    return results
+    return fetch_and_save_transcripts_batch([ticker], n)[ticker]
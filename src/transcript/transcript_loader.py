@@ -1,21 +1,148 @@
 import os
 import glob
 import json
-from typing import Dict, Any
+import hashlib
+import threading
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 
-# adjust this if your data folder lives elsewhere
-DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data"))
+from utils.lru import ByteLRU
+from utils.metrics import span
+from .transcript_store import TranscriptStore, SECTIONS
 
-def load_json_transcripts(ticker: str) -> Dict[str, Any]:
+# set EARNINGS_DATA_DIR if your data folder lives elsewhere
+DATA_DIR = os.path.abspath(os.getenv("EARNINGS_DATA_DIR", os.path.join(os.path.dirname(__file__), "..", "data")))
+
+# "files" parses every {ticker}_*.txt on each call; "columnar" serves reads
+# from the TranscriptStore index + string pool kept in sync with those files
+TRANSCRIPT_BACKEND = os.getenv("TRANSCRIPT_BACKEND", "files")
+
+# parsed transcripts kept in memory, keyed by path and revalidated by
+# size/mtime; bounded by the total size of the source files
+LOADED_CACHE_MAX_BYTES = int(os.getenv("TRANSCRIPT_LOADED_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+# serialized /getTranscripts bodies keyed by (ticker, filters)
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("TRANSCRIPT_RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+loaded_cache = ByteLRU(LOADED_CACHE_MAX_BYTES)
+response_cache = ByteLRU(RESPONSE_CACHE_MAX_BYTES)
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_transcript_store() -> TranscriptStore:
+    """
+    Returns the TranscriptStore over DATA_DIR, opened on first use.
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = TranscriptStore(DATA_DIR)
+    return _store
+
+def _read_transcript(path: str) -> Dict[str, Any]:
+    st = os.stat(path)
+    cached = loaded_cache.get(path)
+    if cached is not None and cached[0] == (st.st_size, st.st_mtime_ns):
+        return cached[1]
+    with open(path, "r", encoding="utf-8") as f:
+        transcript = json.load(f)
+    loaded_cache.put(path, ((st.st_size, st.st_mtime_ns), transcript), st.st_size)
+    return transcript
+
+def invalidate(path: str) -> None:
+    """
+    Drops cached data for a transcript file that was just (re)written.
+    """
+    path = os.path.abspath(path)
+    loaded_cache.pop(path)
+    ticker = os.path.basename(path).rsplit("_", 1)[0]
+    response_cache.discard_where(lambda key: key[0] == ticker)
+
+def _select(transcript: Dict[str, Any], section: str = None, speaker: str = None) -> Dict[str, Any]:
+    sections = SECTIONS if section is None else (section,)
+    if any(s not in SECTIONS for s in sections):
+        raise ValueError(f"unknown section {section!r}; expected one of {SECTIONS}")
+    selected = {"date": transcript.get("date")}
+    for key in sections:
+        turns = transcript.get(key) or []
+        selected[key] = [t for t in turns if t.get("speaker") == speaker] if speaker is not None else turns
+    return selected
+
+def load_json_transcripts(ticker: str, quarters: Iterable[str] = None,
+                          section: str = None, speaker: str = None) -> Dict[str, Any]:
     """
     Load all processed .json transcripts for `ticker` from DATA_DIR.
     Returns a dict mapping "YYYYQX" → parsed JSON object.
+    `quarters`, `section` ("preparedRemarks" / "qanda") and `speaker`
+    optionally restrict the result; with the columnar backend only the
+    selected turns are read.
+    Parsed files are served from `loaded_cache` while their size and mtime
+    are unchanged, so the returned objects are shared: do not mutate them.
     """
+    with span("load") as stage:
+        if TRANSCRIPT_BACKEND == "columnar":
+            store = get_transcript_store()
+            store.sync(ticker, DATA_DIR)
+            transcripts = store.load(ticker, quarters, section, speaker)
+        else:
+            transcripts = _load_files(ticker, quarters, section, speaker)
+        stage.items = len(transcripts)
+    return transcripts
+
+def _load_files(ticker: str, quarters: Iterable[str] = None,
+                section: str = None, speaker: str = None) -> Dict[str, Any]:
     pattern = os.path.join(DATA_DIR, f"{ticker}_*.txt")
+    wanted = set(quarters) if quarters is not None else None
     transcripts: Dict[str, Any] = {}
     for path in sorted(glob.glob(pattern), reverse=True):
         filename = os.path.basename(path)
         quarter = filename.replace(f"{ticker}_", "").replace(".txt", "")
-        with open(path, "r", encoding="utf-8") as f:
-            transcripts[quarter] = json.load(f)
-    return transcripts
\ No newline at end of file
+        if wanted is not None and quarter not in wanted:
+            continue
+        transcripts[quarter] = _read_transcript(path)
+        if section is not None or speaker is not None:
+            transcripts[quarter] = _select(transcripts[quarter], section, speaker)
+    return transcripts
+
+def transcripts_etag(ticker: str, quarters: Iterable[str] = None,
+                     section: str = None, speaker: str = None) -> Optional[str]:
+    """
+    Validator for a load_json_transcripts result, derived from the filters
+    and the size/mtime of `ticker`'s files without reading them.
+    None if the ticker has no transcripts.
+    """
+    stats: List[Tuple[str, int, int]] = []
+    for path in sorted(glob.glob(os.path.join(DATA_DIR, f"{ticker}_*.txt"))):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            continue
+        stats.append((os.path.basename(path), st.st_size, st.st_mtime_ns))
+    if not stats:
+        return None
+    key = json.dumps([TRANSCRIPT_BACKEND, stats, sorted(quarters) if quarters is not None else None,
+                      section, speaker])
+    return '"' + hashlib.sha1(key.encode("utf-8")).hexdigest() + '"'
+
+def load_transcripts_response(ticker: str, quarters: Iterable[str] = None,
+                              section: str = None, speaker: str = None) -> Tuple[Optional[str], Optional[bytes]]:
+    """
+    Returns (ETag, JSON body) for load_json_transcripts(...), reusing the
+    serialized body while the underlying files are unchanged.
+    (None, None) if there is nothing to return.
+    """
+    quarters = list(quarters) if quarters is not None else None
+    etag = transcripts_etag(ticker, quarters, section, speaker)
+    if etag is None:
+        return None, None
+    key = (ticker, tuple(quarters) if quarters is not None else None, section, speaker)
+    cached = response_cache.get(key)
+    if cached is not None and cached[0] == etag:
+        return cached
+    data = load_json_transcripts(ticker, quarters, section, speaker)
+    if not data:
+        return None, None
+    # same encoding as FastAPI's JSONResponse
+    body = json.dumps(data, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+    response_cache.put(key, (etag, body), len(body))
+    return etag, body
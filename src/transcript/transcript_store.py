@@ -0,0 +1,356 @@
+"""
+Columnar transcript store: speaker turns live as rows of a SQLite index
+(ticker, quarter, section, seq, speaker id, text offset, text length) and
+their text in an append-only UTF-8 string pool that is memory-mapped for
+reads. One section, quarter or speaker can be loaded without touching the
+rest.
+
+The processed `{ticker}_{YYYYQX}.txt` files written by transcript_client stay
+the source of truth: `sync` ingests files whose size or mtime changed since
+they were last stored. Several processes may share a store: appends and
+compaction hold an exclusive flock on transcripts.lock and reads a shared
+one. Compaction writes a new pool file and switches the index to it (new
+offsets and file name) in one transaction, so a crash leaves either the old
+or the new pool in use; other processes reopen the pool the index names.
+Migrate the existing data folder once with
+
+    cd src && python -m transcript.transcript_store [--data-dir DIR]
+"""
+import os
+import re
+import json
+import mmap
+import fcntl
+import logging
+import sqlite3
+import argparse
+import threading
+import contextlib
+from typing import Dict, Any, List, Optional, Iterable
+
+logger = logging.getLogger(__name__)
+
+SECTIONS = ("preparedRemarks", "qanda")
+# pool files: transcripts.pool, then transcripts.{generation}.pool after each compaction
+_POOL_FILE = re.compile(r"^transcripts(?:\.(\d+))?\.pool$")
+
+# processed transcript files; the ticker must start with a letter or digit, so
+# in-flight fetch temp files (".tmp-XXXX{ticker}_{quarter}.txt") never match
+_FILENAME = re.compile(r"^(?P<ticker>[A-Z0-9][A-Z0-9.\-]*)_(?P<quarter>\d{4}Q[1-4])\.txt$")
+
+
+class TranscriptStore:
+    """
+    SQLite index + memory-mapped string pool under `directory`
+    (transcripts.sqlite / the pool file named in its `meta` table).
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(directory, "transcripts.sqlite"), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS quarters (
+                ticker     TEXT NOT NULL,
+                quarter    TEXT NOT NULL,
+                date       TEXT,
+                source_size  INTEGER NOT NULL,
+                source_mtime INTEGER NOT NULL,
+                PRIMARY KEY (ticker, quarter)
+            );
+            CREATE TABLE IF NOT EXISTS speakers (
+                id   INTEGER PRIMARY KEY,
+                name TEXT NOT NULL UNIQUE
+            );
+            CREATE TABLE IF NOT EXISTS turns (
+                ticker     TEXT NOT NULL,
+                quarter    TEXT NOT NULL,
+                section    INTEGER NOT NULL,
+                seq        INTEGER NOT NULL,
+                speaker_id INTEGER NOT NULL,
+                offset     INTEGER NOT NULL,
+                length     INTEGER NOT NULL,
+                PRIMARY KEY (ticker, quarter, section, seq)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS turns_speaker ON turns (ticker, speaker_id);
+            CREATE TABLE IF NOT EXISTS meta (
+                key   TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+        self._speaker_ids: Dict[str, int] = {}
+        self._speaker_names: Dict[int, str] = {}
+        self._load_speakers()
+        self._lock_file = open(os.path.join(directory, "transcripts.lock"), "a")
+        self._map: Optional[mmap.mmap] = None
+        self._mapped_size = 0
+        fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        try:
+            self.pool_path = os.path.join(directory, self._pool_name())
+            open(self.pool_path, "ab").close()
+            self._pool = open(self.pool_path, "r+b")
+            self._remove_stale_pools()
+        finally:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def _pool_name(self) -> str:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'pool'").fetchone()
+        return row[0] if row else "transcripts.pool"
+
+    def _remove_stale_pools(self) -> None:
+        # pools left behind by a compaction that crashed before or after its
+        # switch; caller holds the exclusive file lock
+        current = os.path.basename(self.pool_path)
+        for name in os.listdir(self.directory):
+            if _POOL_FILE.match(name) and name != current:
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(os.path.join(self.directory, name))
+
+    def _load_speakers(self) -> None:
+        # other processes add speakers too; called when an id or name is not known here
+        self._speaker_ids = dict(self._conn.execute("SELECT name, id FROM speakers"))
+        self._speaker_names = {i: n for n, i in self._speaker_ids.items()}
+
+    @contextlib.contextmanager
+    def _file_lock(self, exclusive: bool):
+        # caller holds self._lock; the flock orders this process against others
+        fcntl.flock(self._lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            self._reopen_if_compacted()
+            yield
+        finally:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def _reopen_if_compacted(self) -> None:
+        # compaction in another process switches the index to a new pool file
+        path = os.path.join(self.directory, self._pool_name())
+        if path != self.pool_path:
+            self._close_map()
+            self._pool.close()
+            self.pool_path = path
+            self._pool = open(self.pool_path, "r+b")
+
+    def _close_map(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map, self._mapped_size = None, 0
+
+    # --- writes ---------------------------------------------------------
+
+    def _speaker_id(self, name: str) -> int:
+        speaker_id = self._speaker_ids.get(name)
+        if speaker_id is None:
+            self._conn.execute("INSERT OR IGNORE INTO speakers (name) VALUES (?)", (name,))
+            speaker_id = self._conn.execute("SELECT id FROM speakers WHERE name = ?", (name,)).fetchone()[0]
+            self._speaker_ids[name] = speaker_id
+            self._speaker_names[speaker_id] = name
+        return speaker_id
+
+    def put(self, ticker: str, quarter: str, transcript: Dict[str, Any],
+            source_size: int = 0, source_mtime: int = 0) -> None:
+        """
+        Stores (or replaces) one processed transcript. Text of a replaced
+        quarter stays in the pool as dead bytes until `compact`.
+        """
+        with self._lock, self._file_lock(exclusive=True):
+            self._pool.seek(0, os.SEEK_END)
+            offset = self._pool.tell()
+            rows = []
+            chunks = []
+            for section, key in enumerate(SECTIONS):
+                for seq, turn in enumerate(transcript.get(key) or []):
+                    data = turn.get("text", "").encode("utf-8")
+                    rows.append((ticker, quarter, section, seq,
+                                 self._speaker_id(turn.get("speaker", "")), offset, len(data)))
+                    chunks.append(data)
+                    offset += len(data)
+            self._pool.write(b"".join(chunks))
+            self._pool.flush()
+            self._conn.execute("DELETE FROM turns WHERE ticker = ? AND quarter = ?", (ticker, quarter))
+            self._conn.executemany("INSERT INTO turns VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO quarters VALUES (?, ?, ?, ?, ?)",
+                (ticker, quarter, transcript.get("date"), source_size, source_mtime),
+            )
+            self._conn.commit()
+
+    def sync(self, ticker: str, data_dir: str) -> int:
+        """
+        Ingests `{ticker}_*.txt` files from `data_dir` that are new or whose
+        size/mtime changed, and drops quarters whose file is gone.
+        Returns the number of files ingested.
+        """
+        on_disk = {}
+        with os.scandir(data_dir) as entries:
+            for entry in entries:
+                match = _FILENAME.match(entry.name)
+                if match and match["ticker"] == ticker:
+                    st = entry.stat()
+                    on_disk[match["quarter"]] = (entry.path, st.st_size, st.st_mtime_ns)
+        with self._lock:
+            stored = {q: (size, mtime) for q, size, mtime in self._conn.execute(
+                "SELECT quarter, source_size, source_mtime FROM quarters WHERE ticker = ?", (ticker,))}
+            for quarter in set(stored) - set(on_disk):
+                self._conn.execute("DELETE FROM turns WHERE ticker = ? AND quarter = ?", (ticker, quarter))
+                self._conn.execute("DELETE FROM quarters WHERE ticker = ? AND quarter = ?", (ticker, quarter))
+            self._conn.commit()
+        ingested = 0
+        for quarter, (path, size, mtime) in on_disk.items():
+            if stored.get(quarter) == (size, mtime):
+                continue
+            # a file deleted mid-sync, or one that does not parse, is skipped
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    transcript = json.load(f)
+            except (FileNotFoundError, ValueError) as e:
+                logger.warning("skipping %s in transcript store sync: %s", path, e)
+                continue
+            self.put(ticker, quarter, transcript, size, mtime)
+            ingested += 1
+        return ingested
+
+    # --- reads ----------------------------------------------------------
+
+    def _view(self) -> Optional[mmap.mmap]:
+        size = os.fstat(self._pool.fileno()).st_size
+        if size and size != self._mapped_size:
+            # the pool only grows; remap to cover appended text
+            self._close_map()
+            self._map = mmap.mmap(self._pool.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mapped_size = size
+        return self._map
+
+    def quarters(self, ticker: str) -> List[str]:
+        """
+        Stored quarters for `ticker`, newest first.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT quarter FROM quarters WHERE ticker = ? ORDER BY quarter DESC", (ticker,)).fetchall()
+        return [q for q, in rows]
+
+    def load(self, ticker: str, quarters: Iterable[str] = None, section: str = None,
+             speaker: str = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns {"YYYYQX": {"date", "preparedRemarks", "qanda"}} for `ticker`,
+        newest first, in the same shape as the processed files. `quarters`,
+        `section` and `speaker` restrict what is read; a restricted section is
+        left out of the result.
+        """
+        sections = SECTIONS if section is None else (section,)
+        if any(s not in SECTIONS for s in sections):
+            raise ValueError(f"unknown section {section!r}; expected one of {SECTIONS}")
+        where = ["ticker = ?"]
+        params: List[Any] = [ticker]
+        quarter_filter = ""
+        if quarters is not None:
+            quarters = list(quarters)
+            quarter_filter = f" AND quarter IN ({','.join('?' * len(quarters))})"
+        with self._lock, self._file_lock(exclusive=False):
+            header = self._conn.execute(
+                f"SELECT quarter, date FROM quarters WHERE ticker = ?{quarter_filter} ORDER BY quarter DESC",
+                [ticker, *(quarters or [])],
+            ).fetchall()
+            result = {q: {"date": date, **{s: [] for s in sections}} for q, date in header}
+            if not result:
+                return result
+            if quarters is not None:
+                where.append(f"quarter IN ({','.join('?' * len(quarters))})")
+                params.extend(quarters)
+            if section is not None:
+                where.append("section = ?")
+                params.append(SECTIONS.index(section))
+            if speaker is not None:
+                if speaker not in self._speaker_ids:
+                    self._load_speakers()
+                speaker_id = self._speaker_ids.get(speaker)
+                if speaker_id is None:
+                    return result
+                where.append("speaker_id = ?")
+                params.append(speaker_id)
+            rows = self._conn.execute(
+                "SELECT quarter, section, speaker_id, offset, length FROM turns "
+                f"WHERE {' AND '.join(where)} ORDER BY quarter, section, seq",
+                params,
+            ).fetchall()
+            view = self._view()
+            if any(row[2] not in self._speaker_names for row in rows):
+                self._load_speakers()
+            names = self._speaker_names
+            for quarter, sec, speaker_id, offset, length in rows:
+                text = view[offset:offset + length].decode("utf-8") if length else ""
+                result[quarter][SECTIONS[sec]].append({"speaker": names[speaker_id], "text": text})
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            quarters = self._conn.execute("SELECT COUNT(*) FROM quarters").fetchone()[0]
+            turns, live = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(length), 0) FROM turns").fetchone()
+        pool = os.path.getsize(self.pool_path)
+        return {"quarters": quarters, "turns": turns, "speakers": len(self._speaker_ids),
+                "pool_bytes": pool, "dead_bytes": pool - live}
+
+    def compact(self) -> None:
+        """
+        Rewrites the string pool without the text of replaced quarters.
+        """
+        with self._lock, self._file_lock(exclusive=True):
+            rows = self._conn.execute(
+                "SELECT ticker, quarter, section, seq, offset, length FROM turns ORDER BY offset").fetchall()
+            view = self._view()
+            generation = int(_POOL_FILE.match(os.path.basename(self.pool_path)).group(1) or 0) + 1
+            new_path = os.path.join(self.directory, f"transcripts.{generation}.pool")
+            updates = []
+            with open(new_path, "wb") as out:
+                for ticker, quarter, section, seq, offset, length in rows:
+                    updates.append((out.tell(), ticker, quarter, section, seq))
+                    out.write(view[offset:offset + length] if length else b"")
+                out.flush()
+                os.fsync(out.fileno())
+            # new offsets and the new file name become visible together
+            try:
+                self._conn.executemany(
+                    "UPDATE turns SET offset = ? WHERE ticker = ? AND quarter = ? AND section = ? AND seq = ?",
+                    updates,
+                )
+                self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('pool', ?)", (os.path.basename(new_path),))
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                os.remove(new_path)
+                raise
+            old_path = self.pool_path
+            self._close_map()
+            self._pool.close()
+            self.pool_path = new_path
+            self._pool = open(self.pool_path, "r+b")
+            os.remove(old_path)
+
+
+def migrate(data_dir: str) -> Dict[str, int]:
+    """
+    One-shot import of every processed transcript in `data_dir` into the
+    store there. Returns {ticker: files ingested}.
+    """
+    tickers = sorted({m["ticker"] for m in map(_FILENAME.match, os.listdir(data_dir)) if m})
+    store = TranscriptStore(data_dir)
+    return {ticker: store.sync(ticker, data_dir) for ticker in tickers}
+
+
+if __name__ == "__main__":
+    from .transcript_loader import DATA_DIR
+
+    parser = argparse.ArgumentParser(description="Import processed transcripts into the columnar store.")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--compact", action="store_true", help="drop replaced text from the pool afterwards")
+    args = parser.parse_args()
+    for ticker, count in migrate(args.data_dir).items():
+        print(f"{ticker}: {count} quarter(s) imported")
+    store = TranscriptStore(args.data_dir)
+    if args.compact:
+        store.compact()
+    print(store.get_stats())
@@ -0,0 +1,265 @@
+import re
+import json
+import codecs
+from json.decoder import scanstring
+from itertools import chain
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO
+
+# One "Speaker: text" turn per transcript line
+TURN_RE = re.compile(r'([^:\n]+):\s*(.+)')
+_STRING_SPECIAL = re.compile(r'["\\]')
+# longest run of string content made of plain characters and complete escapes
+_STRING_BODY = re.compile(r'(?:[^"\\]+|\\["\\/bfnrt]|\\u[0-9a-fA-F]{4})*')
+_TRAILING_HIGH_SURROGATE = re.compile(r'\\u[dD][89abAB][0-9a-fA-F]{2}$')
+_WHITESPACE = " \t\r\n"
+
+# states of the top-level object scanner
+_START, _KEY, _COLON, _VALUE, _STRING, _NESTED, _SCALAR, _AFTER, _DONE = range(9)
+
+
+def is_qanda_start(speaker: str, text: str) -> bool:
+    """
+    The Operator line that opens the Q&A session.
+    """
+    lowered = text.lower()
+    return speaker == "Operator" and "[operator instructions]" in lowered and "your first question" in lowered
+
+
+class TranscriptStreamParser:
+    """
+    Incremental parser for the API‑Ninjas payload {"date": ..., "transcript": ...}.
+    Text is fed in chunks; speaker turns are produced as soon as each
+    transcript line is complete, so the transcript string itself is never
+    held in memory as a whole. Other top-level fields are skipped.
+    """
+
+    def __init__(self):
+        self.date: Optional[str] = None
+        self.has_transcript = False
+        self.is_object = None
+        self._buf = ""
+        self._state = _START
+        self._key: Optional[str] = None
+        self._string_target: Optional[str] = None   # "key", "date", "transcript" or None (skip)
+        self._pieces: List[str] = []                # current key/date string
+        self._line: List[str] = []                  # current transcript line
+        self._depth = 0
+        self._nested_in_string = False
+        self._turns: List[Dict[str, str]] = []
+
+    def feed(self, chunk: str) -> List[Dict[str, str]]:
+        """
+        Consumes `chunk` and returns the speaker turns completed by it.
+        """
+        self._buf += chunk
+        self._scan()
+        turns, self._turns = self._turns, []
+        return turns
+
+    def close(self) -> List[Dict[str, str]]:
+        """
+        Flushes the last transcript line.
+        """
+        if self._line:
+            self._emit_line("".join(self._line))
+            self._line = []
+        turns, self._turns = self._turns, []
+        return turns
+
+    def _emit_line(self, line: str) -> None:
+        match = TURN_RE.search(line)
+        if match:
+            self._turns.append({"speaker": match.group(1).strip(), "text": match.group(2).strip()})
+
+    def _transcript_text(self, text: str) -> None:
+        if not text:
+            return
+        self.has_transcript = True
+        lines = text.split("\n")
+        if len(lines) == 1:
+            self._line.append(text)
+            return
+        self._line.append(lines[0])
+        self._emit_line("".join(self._line))
+        for line in lines[1:-1]:
+            self._emit_line(line)
+        self._line = [lines[-1]]
+
+    def _string_text(self, text: str) -> None:
+        if self._string_target == "transcript":
+            self._transcript_text(text)
+        elif self._string_target is not None:
+            self._pieces.append(text)
+
+    def _read_string(self, pos: int) -> Optional[int]:
+        """
+        Decodes string content from `pos`; returns the position after the
+        closing quote, or None if more input is needed (an escape sequence
+        cut by the chunk boundary is kept in the buffer).
+        """
+        buf = self._buf
+        end = _STRING_BODY.match(buf, pos).end()
+        complete = end < len(buf) and buf[end] == '"'
+        if not complete and _TRAILING_HIGH_SURROGATE.search(buf, pos, end):
+            # keep a high surrogate until its low half arrives
+            end -= 6
+        if end > pos:
+            self._string_text(scanstring('"' + buf[pos:end] + '"', 1, False)[0])
+        if complete:
+            return end + 1
+        self._buf = buf[end:]
+        return None
+
+    def _scan(self) -> None:
+        buf = self._buf
+        pos = 0
+        n = len(buf)
+        while pos < n and self._state != _DONE:
+            state = self._state
+            ch = buf[pos]
+            if state == _STRING:
+                result = self._read_string(pos)
+                if result is None:
+                    return      # self._buf holds any partial escape
+                pos = result
+                self._end_string()
+                continue
+            if state == _NESTED:
+                if self._nested_in_string:
+                    match = _STRING_SPECIAL.search(buf, pos)
+                    if match is None:
+                        pos = n
+                        continue
+                    pos = match.end()
+                    if match.group() == "\\":
+                        if pos >= n:
+                            self._buf = "\\"
+                            return
+                        pos += 1
+                    else:
+                        self._nested_in_string = False
+                    continue
+                if ch == '"':
+                    self._nested_in_string = True
+                elif ch in "{[":
+                    self._depth += 1
+                elif ch in "}]":
+                    self._depth -= 1
+                    if self._depth == 0:
+                        self._state = _AFTER
+                pos += 1
+                continue
+            if ch in _WHITESPACE:
+                pos += 1
+                continue
+            if state == _START:
+                self.is_object = ch == "{"
+                self._state = _KEY if self.is_object else _DONE
+            elif state == _KEY:
+                if ch == '"':
+                    self._begin_string("key")
+                elif ch == "}":
+                    self._state = _DONE
+            elif state == _COLON:
+                if ch == ":":
+                    self._state = _VALUE
+            elif state == _VALUE:
+                if ch == '"':
+                    self._begin_string(self._key if self._key in ("date", "transcript") else None)
+                elif ch in "{[":
+                    self._state, self._depth, self._nested_in_string = _NESTED, 1, False
+                else:
+                    self._state = _SCALAR
+                    continue
+            elif state == _SCALAR:
+                if ch in ",}":
+                    self._state = _AFTER
+                    continue
+            elif state == _AFTER:
+                if ch == ",":
+                    self._state = _KEY
+                elif ch == "}":
+                    self._state = _DONE
+            pos += 1
+        self._buf = "" if self._state == _DONE else buf[pos:]
+
+    def _begin_string(self, target: Optional[str]) -> None:
+        self._state = _STRING
+        self._string_target = target
+        self._pieces = []
+
+    def _end_string(self) -> None:
+        target = self._string_target
+        if target == "key":
+            self._key = "".join(self._pieces)
+            self._state = _COLON
+            return
+        if target == "date":
+            self.date = "".join(self._pieces)
+        self._state = _AFTER
+
+
+def iter_speaker_turns(chunks: Iterable[str], parser: TranscriptStreamParser = None) -> Iterator[Dict[str, str]]:
+    """
+    Yields {"speaker", "text"} turns from a chunked API‑Ninjas payload.
+    """
+    parser = parser or TranscriptStreamParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+def decode_chunks(byte_chunks: Iterable[bytes], encoding: str = "utf-8") -> Iterator[str]:
+    """
+    Incrementally decodes a byte stream, handling characters split across chunks.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    for chunk in byte_chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def write_processed_transcript(chunks: Iterable[str], out: TextIO) -> TranscriptStreamParser:
+    """
+    Streams a raw payload into `out` as
+      {"date": ..., "preparedRemarks": [...], "qanda": [...]}
+    encoding each turn as it is parsed. The Q&A boundary is detected on the
+    fly. If the payload's "date" only arrives after the transcript, the key
+    is written last. Returns the parser (date, has_transcript, is_object).
+    """
+    parser = TranscriptStreamParser()
+    dumps = json.JSONEncoder(ensure_ascii=False).encode
+    date_written = False
+    in_qa = False
+    first_in_section = True
+
+    turns = iter_speaker_turns(chunks, parser)
+    first_turn = next(turns, None)
+    if parser.date is not None:
+        out.write('{"date": ' + dumps(parser.date) + ', "preparedRemarks": [')
+        date_written = True
+    else:
+        out.write('{"preparedRemarks": [')
+
+    if first_turn is not None:
+        for turn in chain((first_turn,), turns):
+            if not in_qa and is_qanda_start(turn["speaker"], turn["text"]):
+                in_qa = True
+                out.write('], "qanda": [')
+                first_in_section = True
+            if not first_in_section:
+                out.write(", ")
+            out.write(dumps(turn))
+            first_in_section = False
+
+    if not in_qa:
+        out.write('], "qanda": [')
+    out.write("]")
+    if not date_written:
+        out.write(', "date": ' + dumps(parser.date or ""))
+    out.write("}")
+    return parser
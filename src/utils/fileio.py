@@ -0,0 +1,19 @@
+import os
+import tempfile
+
+
+def atomic_write_text(path: str, text: str, encoding: str = "utf-8") -> None:
+    """
+    Writes `text` to a temp file in the same directory and renames it over
+    `path`, so readers never observe a partially written file.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, "w", encoding=encoding) as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
@@ -0,0 +1,247 @@
+import math
+import functools
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# latency buckets in seconds, from cache lookups up to full-model passes
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+# (name, type, help, [(labels, value), ...]) produced at scrape time
+Sample = Tuple[str, str, str, List[Tuple[Dict[str, Any], float]]]
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Iterable[Tuple[str, str]]) -> str:
+    pairs = [f'{k}="{_escape(v)}"' for k, v in labels]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class Counter:
+    """
+    Monotonic counter with labels.
+    """
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = _labels(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram with labels, rendered the way Prometheus
+    expects (_bucket{le=...}, _sum, _count).
+    """
+
+    def __init__(self, name: str, help: str, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Labels, List[float]] = {}   # bucket counts..., sum, count
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = _labels(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                for bound, count in zip(self.buckets + (math.inf,), series[:len(self.buckets)] + [series[-1]]):
+                    le = _format_labels(key + (("le", _format_value(bound)),))
+                    lines.append(f"{self.name}_bucket{le} {_format_value(count)}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(series[-2])}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {_format_value(series[-1])}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Counters and histograms updated as work happens, plus collectors that
+    read existing stats (caches, pools, models) when /metrics is scraped.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+        self._collectors: List[Callable[[], Iterable[Sample]]] = []
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help: str) -> Counter:
+        with self._lock:
+            return self._metrics.setdefault(name, Counter(name, help))
+
+    def histogram(self, name: str, help: str, buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        with self._lock:
+            return self._metrics.setdefault(name, Histogram(name, help, buckets))
+
+    def register_collector(self, collector: Callable[[], Iterable[Sample]]) -> None:
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        """
+        All metrics in the Prometheus text exposition format.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        for collector in collectors:
+            for name, kind, help, samples in collector():
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(_labels(labels))} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+# process-wide registry behind /metrics
+metrics = MetricsRegistry()
+
+stage_seconds = metrics.histogram("earnings_stage_seconds", "Time spent per pipeline stage")
+stage_items = metrics.counter("earnings_stage_items_total", "Items processed per pipeline stage")
+stage_errors = metrics.counter("earnings_stage_errors_total", "Pipeline stages that raised")
+
+
+class Profile:
+    """
+    Stage timings collected for one request while profiling is on.
+    Concurrent or nested stages are all recorded, so per-stage totals can
+    add up to more than the request's wall time.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float, items: Optional[int]) -> None:
+        with self._lock:
+            self.spans.append({"stage": stage, "seconds": seconds, "items": items})
+
+    def breakdown(self) -> Dict[str, Any]:
+        """
+        {"wall_seconds", "stages": {stage: {"seconds", "calls", "items"}}},
+        stages ordered by total time.
+        """
+        stages: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            spans = list(self.spans)
+        for span in spans:
+            entry = stages.setdefault(span["stage"], {"seconds": 0.0, "calls": 0, "items": 0})
+            entry["seconds"] += span["seconds"]
+            entry["calls"] += 1
+            entry["items"] += span["items"] or 0
+        return {
+            "wall_seconds": time.perf_counter() - self.started,
+            "stages": dict(sorted(stages.items(), key=lambda kv: kv[1]["seconds"], reverse=True)),
+        }
+
+
+_profile: contextvars.ContextVar = contextvars.ContextVar("profile", default=None)
+
+
+@contextmanager
+def profiling() -> Iterator[Profile]:
+    """
+    Records every span run in this context (including worker threads and
+    tasks started from it) into a fresh Profile.
+    """
+    profile = Profile()
+    token = _profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _profile.reset(token)
+
+
+class Span:
+    """
+    Handle yielded by `span`; set `items` to count what the stage processed.
+    """
+
+    __slots__ = ("stage", "items")
+
+    def __init__(self, stage: str, items: Optional[int]):
+        self.stage = stage
+        self.items = items
+
+
+@contextmanager
+def span(stage: str, items: Optional[int] = None) -> Iterator[Span]:
+    """
+    Times a pipeline stage into `earnings_stage_seconds{stage=...}` and,
+    when profiling, into the current request's Profile. Exceptions raised
+    by the stage count toward `earnings_stage_errors_total`.
+    """
+    handle = Span(stage, items)
+    start = time.perf_counter()
+    try:
+        yield handle
+    except Exception:
+        # GeneratorExit, CancelledError and KeyboardInterrupt end a stage
+        # early (a closed stream, a cancelled request) without it failing
+        stage_errors.inc(stage=stage)
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        stage_seconds.observe(elapsed, stage=stage)
+        if handle.items:
+            stage_items.inc(handle.items, stage=stage)
+        profile = _profile.get()
+        if profile is not None:
+            profile.record(stage, elapsed, handle.items)
+
+
+def timed(stage: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Decorator form of `span` for functions that are one stage end to end.
+    """
+    def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
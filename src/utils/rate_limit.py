@@ -0,0 +1,43 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+    `rate` tokens are added per second up to `capacity`; each request
+    consumes one token. `reserve()` books a token and returns how long the
+    caller must wait before using it, so the same bucket can be shared by
+    blocking callers (`acquire`) and asyncio callers (`await asyncio.sleep`).
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """
+        Takes `tokens` from the bucket (possibly going negative) and returns
+        the number of seconds to wait before the reservation is honoured.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        """
+        Blocks until `tokens` are available.
+        """
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
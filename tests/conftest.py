@@ -0,0 +1,101 @@
+"""
+Shared test setup: modules read EARNINGS_DATA_DIR when imported, so it is
+pointed at a temporary folder before anything under src/ is imported.
+
+    python -m pytest tests
+"""
+import os
+import sys
+import json
+import shutil
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+DATA_DIR = tempfile.mkdtemp(prefix="earnings-tests-")
+os.environ["EARNINGS_DATA_DIR"] = DATA_DIR
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(DATA_DIR, ignore_errors=True)
+
+
+class StubResponse:
+    """
+    One scripted reply: status, headers and a body sent as the given chunks
+    (chunked transfer encoding when there is more than one).
+    """
+
+    def __init__(self, status=200, body=b"", headers=None, chunks=None):
+        self.status = status
+        self.headers = headers or {}
+        self.chunks = chunks if chunks is not None else [body]
+
+
+class StubServer:
+    """
+    Local HTTP server standing in for API-Ninjas. Replies are scripted per
+    ticker (in order; the last one repeats) and every request's query is
+    recorded.
+    """
+
+    def __init__(self):
+        self.replies = {}
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                from urllib.parse import urlparse, parse_qs
+
+                query = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+                stub.requests.append(query)
+                script = stub.replies.get(query.get("ticker"), [StubResponse(404)])
+                reply = script.pop(0) if len(script) > 1 else script[0]
+                self.send_response(reply.status)
+                for name, value in reply.headers.items():
+                    self.send_header(name, value)
+                if len(reply.chunks) == 1:
+                    self.send_header("Content-Length", str(len(reply.chunks[0])))
+                    self.end_headers()
+                    self.wfile.write(reply.chunks[0])
+                    return
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for chunk in reply.chunks:
+                    self.wfile.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+                    self.wfile.flush()
+                self.wfile.write(b"0\r\n\r\n")
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/v1/earningstranscript"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def reply(self, ticker, *replies):
+        self.replies[ticker] = list(replies)
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub_server():
+    server = StubServer()
+    yield server
+    server.close()
+
+
+def payload(date, lines):
+    """
+    API-Ninjas response body for a transcript of "Speaker: text" lines.
+    """
+    return json.dumps({"date": date, "transcript": "\n".join(lines)}).encode("utf-8")
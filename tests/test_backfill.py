@@ -0,0 +1,22 @@
+import io
+
+from jobs import backfill
+
+
+def test_load_failure_is_an_analysis_error(tmp_path, monkeypatch):
+    analyzed = []
+
+    def load(ticker):
+        if ticker == "BAD":
+            raise ValueError("corrupt transcript")
+        return [{"ticker": ticker}]
+
+    monkeypatch.setattr(backfill, "fetch_and_save_transcript", lambda ticker, year, quarter: None)
+    monkeypatch.setattr(backfill, "load_json_transcripts", load)
+    monkeypatch.setattr(backfill, "extract_all_signals", lambda ticker, transcripts: analyzed.append(ticker))
+    out = io.StringIO()
+    counts = backfill.run_backfill(["BAD", "GOOD"], [(2023, 1), (2023, 2)], str(tmp_path / "manifest.json"),
+                                   fetch_workers=2, report_every=60, out=out)
+    assert analyzed == ["GOOD"]
+    assert counts["analysis_errors"] == 1 and counts["analyzed"] == 1
+    assert "BAD: loading transcripts failed: corrupt transcript" in out.getvalue()
@@ -0,0 +1,24 @@
+from analysis.sentiment_cache import SentimentCache
+from analysis.llm_cache import LLMCache
+
+
+def test_sentiment_cache_evicts_every_n_writes(tmp_path):
+    cache = SentimentCache(str(tmp_path / "sentiment.sqlite"), max_entries=1000)
+    assert cache.evict_every == 10
+    for i in range(1200):
+        cache.put_many("m", "r", {f"text {i}": {"label": "neutral", "score": 0.5}})
+    stats = cache.get_stats()
+    assert stats["entries"] <= 1000 + cache.evict_every
+    assert stats["evictions"] == stats["writes"] - stats["entries"]
+    # the oldest rows went first
+    assert not cache.get_many("m", "r", ["text 0"]) and cache.get_many("m", "r", ["text 1199"])
+
+
+def test_llm_cache_evicts_unpinned_rows_first(tmp_path):
+    cache = LLMCache(str(tmp_path / "llm.sqlite"), max_entries=200)
+    cache.put("m", "t", "pinned", "{}", 10, 1.0, pinned=True)
+    for i in range(300):
+        cache.put("m", "t", f"text {i}", "{}", 10, 1.0)
+    assert cache.get_stats()["entries"] <= 200 + cache.evict_every
+    assert cache.get("m", "t", "pinned") == "{}"
+    assert cache.get("m", "t", "text 0") is None
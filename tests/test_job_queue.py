@@ -0,0 +1,58 @@
+import time
+
+from jobs import job_queue
+from jobs.job_queue import JobQueue, MemoryJobStore, SqliteJobStore, DONE, FAILED, RUNNING
+
+
+def _wait(queue, job_id, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = queue.get(job_id)
+        if job["status"] in (DONE, FAILED):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def _runner(ticker, transcripts, progress):
+    for quarter in transcripts:
+        progress(quarter, "prepared_remarks")
+    return {"ticker": ticker}
+
+
+def test_recovered_job_starts_with_fresh_progress(tmp_path, monkeypatch):
+    monkeypatch.setattr(job_queue, "load_json_transcripts", lambda ticker: {"2024Q1": {}})
+    store = SqliteJobStore(str(tmp_path / "jobs.sqlite"))
+    # left running by a process that died halfway through
+    store.save({
+        "id": "stale", "key": "signals:AAA", "kind": "signals", "tickers": ["AAA"], "status": RUNNING,
+        "submitted_at": 1.0, "started_at": 2.0, "finished_at": None, "result": None, "error": None,
+        "progress": {"AAA": {"status": RUNNING, "total_sections": 2,
+                             "quarters": {"2024Q1": ["prepared_remarks"]}}},
+    })
+    queue = JobQueue(store, runner=_runner)
+    assert queue.recover() == 1
+    job = _wait(queue, "stale")
+    assert job["status"] == DONE
+    assert job["progress"]["AAA"]["quarters"] == {"2024Q1": ["prepared_remarks"]}
+    assert queue.status("stale")["completed_sections"] == 1
+
+
+class FlakyStore(MemoryJobStore):
+    # the first save of a running job fails, outside any per-ticker handling
+    def save(self, job):
+        if job["status"] == RUNNING and "failed_once" not in job:
+            job["failed_once"] = True
+            raise OSError("disk full")
+        super().save(job)
+
+
+def test_unexpected_error_marks_job_failed(monkeypatch):
+    monkeypatch.setattr(job_queue, "load_json_transcripts", lambda ticker: {"2024Q1": {}})
+    queue = JobQueue(FlakyStore(), runner=_runner)
+    job = queue.submit(["AAA"])
+    finished = _wait(queue, job["id"])
+    assert finished["status"] == FAILED
+    assert finished["error"] == {"job": "disk full"}
+    assert job["id"] not in queue._owned
+    queue.stop()
@@ -0,0 +1,60 @@
+import types
+
+import huggingface_hub
+import pytest
+
+from analysis import model_registry, signal_extractor
+from analysis.model_registry import resolve_revision, resolve_revisions, is_resolved
+
+COMMIT = "0123456789abcdef0123456789abcdef01234567"
+
+
+@pytest.fixture
+def hub(monkeypatch):
+    """
+    Hub stand-in: nothing in the local cache, model_info fails while
+    `online` is False.
+    """
+    state = types.SimpleNamespace(online=False, calls=0)
+
+    def model_info(model_name, revision):
+        state.calls += 1
+        if not state.online:
+            raise OSError("offline")
+        return types.SimpleNamespace(sha=COMMIT)
+
+    monkeypatch.setattr(huggingface_hub, "model_info", model_info)
+    monkeypatch.setattr(huggingface_hub, "try_to_load_from_cache", lambda *args, **kwargs: None)
+    monkeypatch.setattr(model_registry, "_resolved", {})
+    monkeypatch.setattr(model_registry, "_failed", {})
+    return state
+
+
+def test_unresolved_revision_is_retried_not_pinned(hub, monkeypatch):
+    assert resolve_revision("org/model", "main") == "main"
+    assert not is_resolved("org/model", "main")
+    # within the retry interval the Hub is not asked again
+    assert resolve_revision("org/model", "main") == "main"
+    assert hub.calls == 1
+
+    hub.online = True
+    monkeypatch.setattr(model_registry, "REVISION_RETRY_SECONDS", 0)
+    assert resolve_revision("org/model", "main") == COMMIT
+    assert is_resolved("org/model", "main")
+    assert resolve_revision("org/model", "main") == COMMIT
+    assert hub.calls == 2
+
+
+def test_startup_resolution_and_sentiment_cache_revision(hub, monkeypatch):
+    monkeypatch.setattr(model_registry, "REVISION_RETRY_SECONDS", 0)
+    monkeypatch.setattr(signal_extractor, "CACHE_REVISION", None)
+    key = f"{signal_extractor.SENTIMENT_MODEL}@{signal_extractor.SENTIMENT_REVISION}"
+    assert key in resolve_revisions()
+    # results are keyed by the revision as given, but that is not kept
+    assert signal_extractor._cache_revision() == signal_extractor.cache_revision("main")
+    assert signal_extractor.CACHE_REVISION is None
+
+    hub.online = True
+    assert resolve_revisions() == []
+    assert signal_extractor._cache_revision() == signal_extractor.cache_revision(COMMIT)
+    assert signal_extractor.CACHE_REVISION == signal_extractor.cache_revision(COMMIT)
@@ -0,0 +1,29 @@
+import os
+import json
+
+from transcript.transcript_cache import TranscriptCache, STATUS_UNAVAILABLE
+
+
+def test_instances_share_records(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    transcript = tmp_path / "AAA_2023Q1.txt"
+    transcript.write_text("{}")
+    # two handles stand in for the API and backfill processes
+    api, backfill = TranscriptCache(path), TranscriptCache(path)
+    api.record("AAA", 2023, 1, "ab" * 32, 10, str(transcript))
+    backfill.record_unavailable("BBB", 2023, 1)
+    for cache in (api, backfill):
+        assert cache.lookup("AAA", 2023, 1)["sha256"] == "ab" * 32
+        assert cache.lookup("BBB", 2023, 1)["status"] == STATUS_UNAVAILABLE
+        assert cache.get_stats()["entries"] == 2
+
+
+def test_imports_legacy_manifest(tmp_path):
+    manifest = tmp_path / "cache.json"
+    manifest.write_text(json.dumps({
+        "AAA_2023Q1": {"status": "ok", "sha256": "cd" * 32, "fetched_at": 1.0, "path": "x", "bytes": 5},
+    }))
+    cache = TranscriptCache(str(tmp_path / "cache.sqlite"), legacy_manifest=str(manifest))
+    assert cache.get("AAA", 2023, 1) == {"status": "ok", "sha256": "cd" * 32, "fetched_at": 1.0,
+                                         "path": "x", "bytes": 5}
+    assert not manifest.exists() and os.path.exists(str(manifest) + ".imported")
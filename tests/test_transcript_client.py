@@ -0,0 +1,86 @@
+import os
+import json
+import time
+
+import pytest
+
+from conftest import StubResponse, payload
+from transcript import transcript_client
+from transcript.transcript_client import (
+    TranscriptUnavailableError,
+    fetch_and_save_transcript,
+    fetch_and_save_transcripts_batch,
+    process_transcript,
+)
+
+LINES = [
+    "Operator: Good day and welcome to the call.",
+    "Jane Doe: Revenue grew 20% — driven by data center demand.",
+    "Operator: [Operator instructions] Your first question comes from John Roe.",
+    "John Roe: How do you see margins evolving?",
+    "Jane Doe: We expect them to stay in the low 70s.",
+]
+
+
+@pytest.fixture(autouse=True)
+def fast_client(stub_server, monkeypatch):
+    monkeypatch.setattr(transcript_client, "BASE_URL", stub_server.url)
+    monkeypatch.setattr(transcript_client, "BACKOFF_BASE", 0.01)
+    monkeypatch.setattr(transcript_client, "MAX_RETRY_AFTER", 0.05)
+
+
+def test_retries_then_saves(stub_server):
+    stub_server.reply("RTRY",
+                      StubResponse(503),
+                      StubResponse(429, headers={"Retry-After": "86400"}),
+                      StubResponse(200, payload("2024-05-22", LINES)))
+    start = time.perf_counter()
+    path = fetch_and_save_transcript("RTRY", 2024, 1, force=True)
+    # a day-long Retry-After is capped at MAX_RETRY_AFTER
+    assert time.perf_counter() - start < 2
+    assert len(stub_server.requests) == 3
+    assert stub_server.requests[0] == {"ticker": "RTRY", "year": "2024", "quarter": "1"}
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f)["date"] == "2024-05-22"
+
+
+def test_gives_up_after_max_retries(stub_server):
+    stub_server.reply("DOWN", StubResponse(503))
+    with pytest.raises(Exception) as excinfo:
+        fetch_and_save_transcript("DOWN", 2024, 1, force=True)
+    assert "503" in str(excinfo.value)
+    assert len(stub_server.requests) == transcript_client.MAX_RETRIES + 1
+    assert not os.path.exists(os.path.join(transcript_client.DATA_DIR, "DOWN_2024Q1.txt"))
+
+
+def test_404_is_unavailable_and_cached(stub_server):
+    stub_server.reply("GONE", StubResponse(404, b'{"error": "not found"}'))
+    with pytest.raises(TranscriptUnavailableError):
+        fetch_and_save_transcript("GONE", 2024, 2)
+    # the negative result is served from the transcript cache
+    with pytest.raises(TranscriptUnavailableError, match="cached"):
+        fetch_and_save_transcript("GONE", 2024, 2)
+    assert len(stub_server.requests) == 1
+
+
+def test_streamed_payload_matches_process_transcript(stub_server):
+    body = payload("2024-08-28", LINES)
+    # tiny chunks split escapes and the multi-byte dash across reads
+    chunks = [body[i:i + 7] for i in range(0, len(body), 7)]
+    stub_server.reply("STRM", StubResponse(200, chunks=chunks))
+    path = fetch_and_save_transcript("STRM", 2024, 2, force=True)
+    with open(path, encoding="utf-8") as f:
+        saved = json.load(f)
+    assert saved == json.loads(process_transcript(body.decode("utf-8")))
+    assert [t["speaker"] for t in saved["qanda"]] == ["Operator", "John Roe", "Jane Doe"]
+    assert not [name for name in os.listdir(transcript_client.DATA_DIR) if name.startswith(".tmp-")]
+
+
+def test_batch_reports_per_quarter(stub_server):
+    stub_server.reply("BOK", StubResponse(200, payload("2024-01-01", LINES)))
+    stub_server.reply("BNO", StubResponse(404))
+    results = fetch_and_save_transcripts_batch(["BOK", "BNO"], n=2)
+    assert set(results) == {"BOK", "BNO"}
+    assert all(os.path.exists(path) for path in results["BOK"].values())
+    assert all(value.startswith("Error: ") for value in results["BNO"].values())
+    assert len(results["BOK"]) == len(results["BNO"]) == 2
@@ -0,0 +1,45 @@
+import threading
+
+import anyio
+
+from api.workers import WorkerPool
+
+
+def _items(closed_on):
+    try:
+        while True:
+            yield 1
+    finally:
+        closed_on.append(threading.get_ident())
+
+
+def test_stream_closes_blocking_iterator_on_a_worker_thread():
+    pool = WorkerPool("test", 1, 1)
+    closed_on = []
+
+    async def main():
+        stream = pool.stream(_items(closed_on))
+        assert await stream.__anext__() == 1
+        await stream.aclose()
+        return threading.get_ident()
+
+    loop_thread = anyio.run(main)
+    assert len(closed_on) == 1 and closed_on[0] != loop_thread
+    assert pool.pending == 0
+
+
+def test_stream_is_closed_when_the_consumer_is_cancelled():
+    pool = WorkerPool("test", 1, 1)
+    closed_on = []
+
+    async def consume():
+        async for _ in pool.stream(_items(closed_on)):
+            await anyio.sleep(0)
+
+    async def main():
+        with anyio.move_on_after(0.05):
+            await consume()
+
+    anyio.run(main)
+    assert len(closed_on) == 1
+    assert pool.pending == 0